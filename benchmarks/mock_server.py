@@ -0,0 +1,318 @@
+import json
+import time
+import zlib
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs, urlencode, unquote
+
+from typing import Any, Dict, List, Optional, Tuple
+
+COUNTRIES = [("US", "New York"), ("DE", "Berlin"), ("FR", "Paris"), ("GB", "London"), ("NL", "Amsterdam"), ("JP", "Tokyo")]
+
+
+def make_proxies(count: int) -> List[Dict[str, Any]]:
+    """
+    Generate a deterministic proxy list in the shape ``proxy/list/`` returns.
+
+    Parameters:
+        count (int): The number of proxies.
+
+    Returns:
+        list: The proxy dicts.
+    """
+    proxies = []
+    for i in range(count):
+        country_code, city_name = COUNTRIES[i % len(COUNTRIES)]
+        proxies.append({
+            "id": f"d-{i}",
+            "username": "benchuser",
+            "password": "benchpass",
+            "proxy_address": f"10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}",
+            "port": 10000 + i % 50000,
+            "valid": i % 17 != 0,
+            "last_verification": "2024-01-01T00:00:00.000000-08:00",
+            "country_code": country_code,
+            "city_name": city_name,
+            "created_at": f"2024-01-{1 + i % 28:02d}T00:00:00.000000-08:00",
+        })
+    return proxies
+
+
+class MockWebshareServer:
+    """
+    An in-process HTTP server that mimics the ``proxy.webshare.io/api/v2`` endpoints the client uses.
+
+    The proxy list is paginated with ``page``/``page_size`` and ``next`` links like the real API,
+    and supports the ``country_code__in``, ``search`` and ``ordering`` filters. ``proxy/config/``
+    and ``profile/`` send an ``ETag`` and answer conditional requests with 304, and the token-based
+    download endpoint returns the plain-text list. Every request is counted per endpoint, and
+    ``inject`` makes the next requests fail, e.g. with a 429 and a ``Retry-After``. ``replace_proxy``
+    swaps a proxy and records the swap in the replaced-proxies history, newest first.
+
+    Parameters:
+        proxy_count (int, optional): The number of proxies in the simulated account.
+        latency (float, optional): Seconds added to every response, to simulate the network.
+        max_page_size (int, optional): The largest page the server returns, whatever was requested.
+        default_page_size (int, optional): The page size used when the request does not set one.
+    """
+
+    def __init__(self, proxy_count: int = 1000, latency: float = 0.0, max_page_size: int = 1000, default_page_size: int = 25) -> None:
+        self.proxies = make_proxies(proxy_count)
+        self.latency = latency
+        self.max_page_size = max_page_size
+        self.default_page_size = default_page_size
+        self.config = {"id": 1, "username": "benchuser", "password": "benchpass", "proxy_list_download_token": "benchtoken", "request_timeout": 30}
+        self.profile = {"id": 1, "email": "bench@example.com", "first_name": "Bench", "last_name": "User", "timezone": "UTC"}
+        self.ip_authorizations: Dict[int, Dict[str, Any]] = {}
+        self.replacements: List[Dict[str, Any]] = []
+        self._swaps: Dict[int, Tuple[int, Dict[str, Any]]] = {}
+        self.counts: Dict[Tuple[str, str], int] = {}
+        self._injected: List[Tuple[int, Dict[str, str]]] = []
+        self._next_id = 1
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        """The value to assign to a client's ``API_BASE_URL``."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/api/v2/"
+
+    def start(self) -> "MockWebshareServer":
+        handler = type("Handler", (_Handler,), {"mock": self})
+        self._server = _Server(("127.0.0.1", 0), handler)
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> "MockWebshareServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def count(self, endpoint: Optional[str] = None) -> int:
+        """
+        The number of requests received, for one endpoint or in total.
+
+        Parameters:
+            endpoint (str, optional): An endpoint such as ``proxy/list/``.
+        """
+        with self._lock:
+            return sum(value for (path, _), value in self.counts.items() if endpoint is None or path == endpoint)
+
+    def reset_counts(self) -> None:
+        with self._lock:
+            self.counts.clear()
+
+    def inject(self, status: int, headers: Optional[Dict[str, str]] = None, times: int = 1) -> None:
+        """
+        Answer the next ``times`` authenticated requests with an error instead of handling them.
+
+        Parameters:
+            status (int): The status code, e.g. 429 or 503.
+            headers (dict, optional): Extra response headers, e.g. ``{"Retry-After": "1"}``.
+            times (int, optional): The number of requests to answer this way.
+        """
+        with self._lock:
+            self._injected.extend([(status, dict(headers or {}))] * times)
+
+    def _take_injected(self) -> Optional[Tuple[int, Dict[str, str]]]:
+        with self._lock:
+            return self._injected.pop(0) if self._injected else None
+
+    def _record(self, method: str, endpoint: str) -> None:
+        with self._lock:
+            self.counts[(endpoint, method)] = self.counts.get((endpoint, method), 0) + 1
+
+    def filter_proxies(self, query: Dict[str, str]) -> List[Dict[str, Any]]:
+        proxies = self.proxies
+        if query.get("country_code__in"):
+            countries = set(query["country_code__in"].split(","))
+            proxies = [proxy for proxy in proxies if proxy["country_code"] in countries]
+        if query.get("search"):
+            search = query["search"]
+            proxies = [proxy for proxy in proxies if search in proxy["proxy_address"] or search in proxy["city_name"]]
+        if query.get("ordering"):
+            field = query["ordering"].lstrip("-")
+            proxies = sorted(proxies, key=lambda proxy: (proxy.get(field) is None, proxy.get(field)), reverse=query["ordering"].startswith("-"))
+        return proxies
+
+    def next_id(self) -> int:
+        with self._lock:
+            self._next_id += 1
+            return self._next_id
+
+    def replace_proxy(self, index: int, state: str = "completed") -> Dict[str, Any]:
+        """
+        Swap one proxy for a new one and record it in the replaced-proxies history.
+
+        Parameters:
+            index (int): The position of the proxy to replace.
+            state (str, optional): The entry's state; any state but ``completed`` leaves the list
+                unchanged until ``complete_replacement`` is called.
+
+        Returns:
+            dict: The history entry.
+        """
+        number = self.next_id()
+        with self._lock:
+            old = self.proxies[index]
+            new = dict(old, id=f"r-{number}", proxy_address=f"11.{number >> 16 & 255}.{number >> 8 & 255}.{number & 255}")
+            replacement = {
+                "id": number,
+                "state": state,
+                "proxies_removed": [old["proxy_address"]],
+                "proxies_added": [new["proxy_address"]],
+                "created_at": f"2024-02-01T00:00:{len(self.replacements):02d}.000000Z",
+            }
+            self.replacements.append(replacement)
+            self._swaps[number] = (index, new)
+        if state == "completed":
+            self.complete_replacement(number)
+        return replacement
+
+    def complete_replacement(self, replacement_id: int) -> None:
+        """
+        Finish a replacement recorded by ``replace_proxy``, swapping the proxy in the list.
+
+        Parameters:
+            replacement_id (int): The history entry's ID.
+        """
+        with self._lock:
+            index, new = self._swaps.pop(replacement_id)
+            self.proxies[index] = new
+            for replacement in self.replacements:
+                if replacement["id"] == replacement_id:
+                    replacement["state"] = "completed"
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request: Any, client_address: Any) -> None:
+        # Clients that time out or close early are expected in benchmarks; don't print tracebacks.
+        pass
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately; without this, delayed ACKs add ~40ms per response.
+    disable_nagle_algorithm = True
+    mock: MockWebshareServer
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+    def _reply(self, status: int, payload: Any = None, headers: Optional[Dict[str, str]] = None, content_type: str = "application/json") -> None:
+        if payload is None:
+            body = b""
+        elif isinstance(payload, bytes):
+            body = payload
+        else:
+            body = json.dumps(payload, separators=(",", ":")).encode()
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _reply_cached(self, payload: Dict[str, Any]) -> None:
+        etag = '"%08x"' % zlib.crc32(json.dumps(payload, sort_keys=True).encode())
+        if self.headers.get("If-None-Match") == etag:
+            return self._reply(304, headers={"ETag": etag})
+        self._reply(200, payload, {"ETag": etag})
+
+    def _reply_page(self, endpoint: str, items: List[Any], query: Dict[str, str]) -> None:
+        page_size = min(int(query.get("page_size") or self.mock.default_page_size), self.mock.max_page_size)
+        page = int(query.get("page") or 1)
+        start = (page - 1) * page_size
+        if page < 1 or (start >= len(items) and page > 1):
+            return self._reply(404, {"detail": "Invalid page."})
+
+        def link(number: int) -> str:
+            return f"http://{self.headers['Host']}/api/v2/{endpoint}?" + urlencode(dict(query, page=number))
+
+        self._reply(200, {
+            "count": len(items),
+            "next": link(page + 1) if start + page_size < len(items) else None,
+            "previous": link(page - 1) if page > 1 else None,
+            "results": items[start:start + page_size],
+        })
+
+    def _route(self, method: str) -> None:
+        url = urlparse(self.path)
+        endpoint = url.path.split("/api/v2/", 1)[-1]
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+        length = int(self.headers.get("Content-Length") or 0)
+        data = json.loads(self.rfile.read(length) or b"{}") if length else {}
+
+        mock = self.mock
+        mock._record(method, endpoint)
+        if mock.latency:
+            time.sleep(mock.latency)
+
+        # The download endpoint is authenticated by the token in its path, like the real one.
+        if method == "GET" and endpoint.startswith("proxy/list/download/"):
+            parts = endpoint.split("/")
+            if parts[3] != mock.config["proxy_list_download_token"]:
+                return self._reply(404, {"detail": "Not found."})
+            filters = {"country_code__in": parts[4].replace("-", ",") if parts[4] != "-" else "", "search": unquote(parts[8]) if parts[8] != "-" else ""}
+            lines = "".join(f"{p['proxy_address']}:{p['port']}:{p['username']}:{p['password']}\r\n" for p in mock.filter_proxies(filters))
+            return self._reply(200, lines.encode(), content_type="text/plain")
+
+        if self.headers.get("Authorization", "").split(" ")[0] != "Token":
+            return self._reply(401, {"detail": "Authentication credentials were not provided."})
+        injected = mock._take_injected()
+        if injected is not None:
+            return self._reply(injected[0], {"detail": "Injected error."}, injected[1])
+
+        if method == "GET" and endpoint == "proxy/list/":
+            return self._reply_page(endpoint, mock.filter_proxies(query), query)
+        if method == "GET" and endpoint == "proxy/list/replaced/":
+            return self._reply_page(endpoint, mock.replacements[::-1], query)
+        if endpoint == "proxy/config/":
+            if method == "PATCH":
+                mock.config.update(data)
+            return self._reply_cached(mock.config)
+        if endpoint == "profile/":
+            if method == "PATCH":
+                mock.profile.update({key: value for key, value in data.items() if value is not None})
+            return self._reply_cached(mock.profile)
+        if endpoint == "proxy/ipauthorization/whatsmyip/":
+            return self._reply(200, {"ip_address": self.client_address[0]})
+        if endpoint == "proxy/ipauthorization/":
+            if method == "POST":
+                ip_authorization = {"id": mock.next_id(), "ip_address": data.get("ip_address"), "created_at": "2024-01-01T00:00:00Z", "last_used_at": None}
+                mock.ip_authorizations[ip_authorization["id"]] = ip_authorization
+                return self._reply(201, ip_authorization)
+            return self._reply_page(endpoint, list(mock.ip_authorizations.values()), query)
+        if endpoint.startswith("proxy/ipauthorization/") and method == "DELETE":
+            removed = mock.ip_authorizations.pop(int(endpoint.split("/")[2]), None)
+            return self._reply(204) if removed else self._reply(404, {"detail": "Not found."})
+        if endpoint in ("notification/", "apikey/"):
+            return self._reply_page(endpoint, [], query)
+        if endpoint == "activation/":
+            return self._reply(200, {"is_activated": True})
+        return self._reply(404, {"detail": "Not found."})
+
+    def do_GET(self) -> None:
+        self._route("GET")
+
+    def do_POST(self) -> None:
+        self._route("POST")
+
+    def do_PATCH(self) -> None:
+        self._route("PATCH")
+
+    def do_DELETE(self) -> None:
+        self._route("DELETE")
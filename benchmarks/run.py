@@ -0,0 +1,256 @@
+"""
+Benchmarks for the Webshare client against a local mock of the API.
+
+Run from the repository root:
+
+    python -m benchmarks.run
+    python -m benchmarks.run --proxies 50000 --latency 0.02 --save baseline.json
+    python -m benchmarks.run --compare baseline.json --tolerance 0.25
+
+With ``--compare`` the exit status is 1 when any benchmark is slower than the baseline by more
+than the tolerance, so the suite can gate a CI job.
+"""
+import sys
+import json
+import time
+import argparse
+import http.client
+import statistics
+from concurrent.futures import ThreadPoolExecutor
+
+from typing import Callable, Dict, List, Optional
+
+from webshare import ApiClient, ResponseCache, ProxyTable
+from webshare.server import RotatingProxyServer
+from webshare.util.objects import ProxiesList, Proxy
+from benchmarks.mock_server import MockWebshareServer, make_proxies
+from benchmarks.upstream_proxy import BackgroundLoop, StubUpstreamProxy
+
+BENCHMARKS: Dict[str, Callable[["BenchmarkContext"], Callable[[], int]]] = {}
+
+
+def benchmark(name: str) -> Callable:
+    """Register a benchmark. The decorated function sets up state and returns the timed callable, which returns the number of operations it performed."""
+    def register(setup: Callable[["BenchmarkContext"], Callable[[], int]]) -> Callable:
+        BENCHMARKS[name] = setup
+        return setup
+    return register
+
+
+class BenchmarkContext:
+    def __init__(self, server: MockWebshareServer, args: argparse.Namespace) -> None:
+        self.server = server
+        self.args = args
+        self._proxy_server: Optional[RotatingProxyServer] = None
+
+    def client(self, **kwargs) -> ApiClient:
+        client = ApiClient("benchmark-key", **kwargs)
+        client.API_BASE_URL = self.server.base_url
+        return client
+
+    def proxy_server(self) -> RotatingProxyServer:
+        """A ``RotatingProxyServer`` in front of four stub upstream proxies, started on first use."""
+        if self._proxy_server is None:
+            self.loop = BackgroundLoop()
+            upstreams = [self.loop.run(StubUpstreamProxy("benchuser", "benchpass").start()) for _ in range(4)]
+            proxies = [Proxy({"id": str(upstream.port), "proxy_address": "127.0.0.1", "port": upstream.port, "username": "benchuser", "password": "benchpass"}) for upstream in upstreams]
+            self._proxy_server = self.loop.run(RotatingProxyServer(proxies, port=0).start())
+        return self._proxy_server
+
+
+@benchmark("list.iter_proxies")
+def bench_iter_proxies(context: BenchmarkContext) -> Callable[[], int]:
+    client = context.client()
+    return lambda: sum(1 for _ in client.iter_proxies(page_size=context.args.page_size))
+
+
+@benchmark("list.fetch_all_proxies")
+def bench_fetch_all_proxies(context: BenchmarkContext) -> Callable[[], int]:
+    client = context.client()
+    return lambda: sum(1 for _ in client.fetch_all_proxies(page_size=context.args.page_size, concurrency=context.args.concurrency))
+
+
+@benchmark("list.stream_proxies")
+def bench_stream_proxies(context: BenchmarkContext) -> Callable[[], int]:
+    client = context.client()
+    return lambda: sum(1 for _ in client.stream_proxies(page_size=context.server.max_page_size, backend="json"))
+
+
+@benchmark("list.download_proxy_list")
+def bench_download_proxy_list(context: BenchmarkContext) -> Callable[[], int]:
+    client = context.client()
+    token = client.get_proxy_config().proxy_list_download_token
+    return lambda: sum(1 for _ in client.download_proxy_list(token=token))
+
+
+@benchmark("objects.proxies_list")
+def bench_proxies_list(context: BenchmarkContext) -> Callable[[], int]:
+    data = {"count": context.args.proxies, "next": None, "previous": None, "results": make_proxies(context.args.proxies)}
+
+    def run() -> int:
+        proxies = ProxiesList(data).get_results()
+        for proxy in proxies:
+            proxy.proxy_address, proxy.port, proxy.username, proxy.password
+        return len(proxies)
+    return run
+
+
+@benchmark("objects.proxy_table")
+def bench_proxy_table(context: BenchmarkContext) -> Callable[[], int]:
+    results = make_proxies(context.args.proxies)
+    return lambda: len(ProxyTable(results))
+
+
+@benchmark("cache.fresh_hit")
+def bench_cache_fresh_hit(context: BenchmarkContext) -> Callable[[], int]:
+    client = context.client(cache=ResponseCache())
+    client.get_proxy_config()
+    calls = context.args.calls
+
+    def run() -> int:
+        for _ in range(calls):
+            client.get_proxy_config()
+        return calls
+    return run
+
+
+@benchmark("cache.revalidate_304")
+def bench_cache_revalidate(context: BenchmarkContext) -> Callable[[], int]:
+    client = context.client(cache=ResponseCache(ttls={"proxy/config/": 0}))
+    client.get_proxy_config()
+    calls = context.args.calls // 10 or 1
+
+    def run() -> int:
+        for _ in range(calls):
+            client.get_proxy_config()
+        return calls
+    return run
+
+
+@benchmark("concurrent.get_profile")
+def bench_concurrent_calls(context: BenchmarkContext) -> Callable[[], int]:
+    client = context.client()
+    calls, threads = context.args.calls // 10 or 1, context.args.concurrency
+
+    def run() -> int:
+        with ThreadPoolExecutor(threads) as executor:
+            for _ in executor.map(lambda _: client.get_profile(), range(calls)):
+                pass
+        return calls
+    return run
+
+
+@benchmark("concurrent.async_get_profile")
+def bench_async_calls(context: BenchmarkContext) -> Optional[Callable[[], int]]:
+    try:
+        import asyncio
+        from webshare.aio import AsyncApiClient
+    except ImportError:
+        return None
+
+    calls = context.args.calls // 10 or 1
+
+    async def gather() -> int:
+        async with AsyncApiClient("benchmark-key", limit=context.args.concurrency) as client:
+            client.API_BASE_URL = context.server.base_url
+            await asyncio.gather(*(client.get_profile() for _ in range(calls)))
+        return calls
+    return lambda: asyncio.run(gather())
+
+
+@benchmark("server.http_forward")
+def bench_server_http_forward(context: BenchmarkContext) -> Callable[[], int]:
+    import requests
+
+    session = requests.Session()
+    session.proxies = {"http": f"http://127.0.0.1:{context.proxy_server().port}"}
+    url, calls = context.server.base_url + "profile/", context.args.calls // 10 or 1
+
+    def run() -> int:
+        for _ in range(calls):
+            session.get(url, headers={"Authorization": "Token benchmark-key"}).raise_for_status()
+        return calls
+    return run
+
+
+@benchmark("server.connect_tunnel")
+def bench_server_connect_tunnel(context: BenchmarkContext) -> Callable[[], int]:
+    port = context.proxy_server().port
+    origin_port = int(context.server.base_url.split(":")[2].split("/")[0])
+    calls = context.args.calls // 10 or 1
+
+    def run() -> int:
+        for _ in range(calls):
+            connection = http.client.HTTPConnection("127.0.0.1", port)
+            connection.set_tunnel("127.0.0.1", origin_port)
+            connection.request("GET", "/api/v2/profile/", headers={"Authorization": "Token benchmark-key"})
+            connection.getresponse().read()
+            connection.close()
+        return calls
+    return run
+
+
+def measure(run: Callable[[], int], repeat: int) -> Dict[str, float]:
+    run()
+    timings, operations = [], 0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        operations = run()
+        timings.append(time.perf_counter() - started)
+    median = statistics.median(timings)
+    return {"median": median, "min": min(timings), "operations": operations, "ops_per_second": operations / median if median else float("inf")}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the Webshare client against a local mock API.")
+    parser.add_argument("--proxies", type=int, default=10000, help="proxies in the simulated account")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds of simulated latency per response")
+    parser.add_argument("--page-size", type=int, default=100, help="page size requested by the paginated benchmarks")
+    parser.add_argument("--max-page-size", type=int, default=1000, help="largest page the mock server returns")
+    parser.add_argument("--concurrency", type=int, default=8, help="threads or connections for the concurrent benchmarks")
+    parser.add_argument("--calls", type=int, default=1000, help="calls per run for the per-call benchmarks")
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per benchmark")
+    parser.add_argument("--only", action="append", default=[], help="run benchmarks whose name starts with this prefix")
+    parser.add_argument("--save", help="write the results to this JSON file")
+    parser.add_argument("--compare", help="compare against results saved with --save")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed slowdown against --compare, as a fraction")
+    args = parser.parse_args(argv)
+
+    names = [name for name in BENCHMARKS if not args.only or any(name.startswith(prefix) for prefix in args.only)]
+    baseline = {}
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)["results"]
+
+    results: Dict[str, Dict[str, float]] = {}
+    regressions = []
+    with MockWebshareServer(proxy_count=args.proxies, latency=args.latency, max_page_size=args.max_page_size) as server:
+        context = BenchmarkContext(server, args)
+        print(f"{'benchmark':<32} {'median':>10} {'min':>10} {'ops/s':>12}  {'vs baseline':>11}")
+        for name in names:
+            run = BENCHMARKS[name](context)
+            if run is None:
+                print(f"{name:<32} {'skipped (missing optional dependency)':>46}")
+                continue
+            result = results[name] = measure(run, args.repeat)
+            change = ""
+            if name in baseline:
+                ratio = result["median"] / baseline[name]["median"]
+                change = f"{ratio - 1:+.1%}"
+                if ratio > 1 + args.tolerance:
+                    regressions.append(name)
+                    change += " !"
+            print(f"{name:<32} {result['median'] * 1000:>8.2f}ms {result['min'] * 1000:>8.2f}ms {result['ops_per_second']:>12,.0f}  {change:>11}")
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump({"config": vars(args), "results": results}, f, indent=2)
+
+    if regressions:
+        print(f"Regressions beyond {args.tolerance:.0%}: {', '.join(regressions)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,131 @@
+import base64
+import asyncio
+import threading
+from urllib.parse import urlsplit
+
+from typing import Any, Awaitable, Optional
+
+from webshare.server import _read_head, _relay_body, _header, _encode_head
+
+
+class BackgroundLoop:
+    """An asyncio event loop running in a daemon thread, for driving async servers from sync code."""
+
+    def __init__(self) -> None:
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self._thread.start()
+
+    def run(self, coroutine: Awaitable[Any]) -> Any:
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop).result()
+
+    def stop(self) -> None:
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join()
+
+
+class StubUpstreamProxy:
+    """
+    A minimal HTTP forward proxy standing in for a Webshare proxy.
+
+    It supports ``CONNECT`` tunnels and absolute-form HTTP requests over keep-alive connections,
+    and answers 407 when ``username``/``password`` are set and the client sends other credentials.
+
+    Parameters:
+        username (str, optional): The required proxy username.
+        password (str, optional): The required proxy password.
+        max_requests (int, optional): Requests answered per connection; the next one closes it
+            unanswered, like an upstream whose keep-alive timer fired while the request was sent.
+    """
+
+    def __init__(self, username: Optional[str] = None, password: Optional[str] = None, max_requests: Optional[int] = None) -> None:
+        self.username = username
+        self.password = password
+        self.max_requests = max_requests
+        self.connections = 0
+        self.requests = 0
+        self.tunnels = 0
+        self.port = 0
+        self._server: Optional[asyncio.AbstractServer] = None
+        # asyncio keeps only weak references to connection handlers.
+        self._handlers = set()
+
+    async def start(self) -> "StubUpstreamProxy":
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def close(self) -> None:
+        self._server.close()
+        for handler in list(self._handlers):
+            handler.cancel()
+        await self._server.wait_closed()
+
+    def _authorized(self, headers: list) -> bool:
+        if self.username is None:
+            return True
+        expected = base64.b64encode(f"{self.username}:{self.password}".encode()).decode()
+        return _header(headers, "proxy-authorization") == f"Basic {expected}"
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        handler = asyncio.current_task()
+        self._handlers.add(handler)
+        origins = {}
+        answered = 0
+        try:
+            while True:
+                head = await _read_head(reader)
+                if head is None or answered == self.max_requests:
+                    break
+                answered += 1
+                method, target, _ = head[0].split(" ")
+                if not self._authorized(head[1]):
+                    writer.write(b"HTTP/1.1 407 Proxy Authentication Required\r\nContent-Length: 0\r\n\r\n")
+                    await writer.drain()
+                    continue
+
+                if method == "CONNECT":
+                    host, _, port = target.rpartition(":")
+                    origin_reader, origin_writer = await asyncio.open_connection(host, int(port))
+                    self.tunnels += 1
+                    writer.write(b"HTTP/1.1 200 Connection Established\r\n\r\n")
+                    await asyncio.gather(_pipe(reader, origin_writer), _pipe(origin_reader, writer))
+                    origin_writer.close()
+                    break
+
+                self.requests += 1
+                url = urlsplit(target)
+                if url.netloc not in origins:
+                    origins[url.netloc] = await asyncio.open_connection(url.hostname, url.port or 80)
+                origin_reader, origin_writer = origins[url.netloc]
+                path = url.path + ("?" + url.query if url.query else "")
+                headers = [(name, value) for name, value in head[1] if name.lower() != "proxy-authorization"]
+                origin_writer.write(_encode_head(f"{method} {path} HTTP/1.1", headers))
+                await _relay_body(reader, origin_writer, head[1], False, 65536)
+                await origin_writer.drain()
+                response = await _read_head(origin_reader)
+                writer.write(_encode_head(response[0], response[1]))
+                await _relay_body(origin_reader, writer, response[1], True, 65536)
+                await writer.drain()
+        except (OSError, ValueError, asyncio.IncompleteReadError):
+            writer.write(b"HTTP/1.1 502 Bad Gateway\r\nContent-Length: 0\r\nConnection: close\r\n\r\n")
+        finally:
+            for _, origin_writer in origins.values():
+                origin_writer.close()
+            writer.close()
+            self._handlers.discard(handler)
+
+
+async def _pipe(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    try:
+        while True:
+            data = await reader.read(65536)
+            if not data:
+                break
+            writer.write(data)
+            await writer.drain()
+        if writer.can_write_eof():
+            writer.write_eof()
+    except OSError:
+        writer.close()
@@ -18,6 +18,13 @@ setup(
     license="MIT",
     packages=find_packages(),
     install_requires=[],
+    extras_require={
+        "async": ["aiohttp>=3.10"],
+        "stream": ["ijson>=3.1"],
+    },
+    entry_points={
+        "console_scripts": ["webshare-proxy=webshare.server:main"],
+    },
     keywords=["python", "webshare.io", "webshare proxy", "free proxy", "premium proxy", "webshareproxy"],
     classifiers=[
         "Development Status :: 5 - Production/Stable",
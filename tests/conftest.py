@@ -0,0 +1,47 @@
+import pytest
+
+from webshare import ApiClient
+from webshare.util import RetryPolicy
+from benchmarks.mock_server import MockWebshareServer
+from benchmarks.upstream_proxy import BackgroundLoop, StubUpstreamProxy
+
+
+@pytest.fixture
+def api():
+    with MockWebshareServer(proxy_count=50) as server:
+        yield server
+
+
+@pytest.fixture
+def make_client(api):
+    clients = []
+
+    def make(**kwargs):
+        kwargs.setdefault("retry", RetryPolicy(max_retries=2, backoff_factor=0.0))
+        client = ApiClient("test-token", **kwargs)
+        client.API_BASE_URL = api.base_url
+        clients.append(client)
+        return client
+
+    yield make
+    for client in clients:
+        client.close()
+
+
+@pytest.fixture
+def client(make_client):
+    return make_client()
+
+
+@pytest.fixture(scope="session")
+def loop():
+    # The loop's daemon thread ends with the test run; stopping it earlier would strand handler tasks.
+    return BackgroundLoop()
+
+
+@pytest.fixture
+def upstreams(loop):
+    proxies = [loop.run(StubUpstreamProxy().start()) for _ in range(3)]
+    yield proxies
+    for proxy in proxies:
+        loop.run(proxy.close())
@@ -0,0 +1,93 @@
+import asyncio
+
+import pytest
+
+from webshare.aio import AsyncApiClient
+from webshare.exceptions import NotFoundError
+from webshare.util import ResponseCache, RetryPolicy
+
+
+@pytest.fixture
+def run(api):
+    def run(body, **kwargs):
+        async def main():
+            kwargs.setdefault("retry", RetryPolicy(max_retries=2, backoff_factor=0.0))
+            async with AsyncApiClient("test-token", **kwargs) as client:
+                client.API_BASE_URL = api.base_url
+                return await body(client)
+
+        return asyncio.run(main())
+
+    return run
+
+
+def test_requests_share_one_session(run, api):
+    async def body(client):
+        created = await client.create_ip("1.2.3.4")
+        profile, ips = await asyncio.gather(client.get_profile(), client.get_ip())
+        assert [entry.id for entry in ips.get_results()] == [created.id]
+        assert await client.delete_ip(created.id) == 204
+        with pytest.raises(NotFoundError):
+            await client.delete_ip(created.id)
+        return profile
+
+    assert run(body).email == api.profile["email"]
+
+
+def test_iter_proxies_follows_every_page(run, api):
+    async def body(client):
+        return [proxy.id async for proxy in client.iter_proxies(page_size=7)]
+
+    assert run(body) == [proxy["id"] for proxy in api.proxies]
+    assert api.count("proxy/list/") == 8
+
+
+@pytest.mark.parametrize("backend", ["json", "ijson"])
+def test_stream_proxies(run, api, backend):
+    async def body(client):
+        return [proxy.id async for proxy in client.stream_proxies(page_size=20, backend=backend)]
+
+    assert run(body) == [proxy["id"] for proxy in api.proxies]
+    assert api.count("proxy/list/") == 3
+
+
+def test_stream_replaced_proxies(run, api):
+    replacements = [api.replace_proxy(index) for index in range(3)]
+
+    async def body(client):
+        return [replacement.id async for replacement in client.stream_replaced_proxies(page_size=2)]
+
+    assert run(body) == [replacement["id"] for replacement in reversed(replacements)]
+
+
+def test_download_proxy_list(run, api):
+    async def body(client):
+        return [proxy async for proxy in client.download_proxy_list(chunk_size=100)]
+
+    proxies = run(body)
+    assert [(proxy.proxy_address, proxy.port) for proxy in proxies] == [(p["proxy_address"], p["port"]) for p in api.proxies]
+    assert len({proxy.id for proxy in proxies}) == len(proxies)
+
+
+def test_cache_serves_and_revalidates(run, api):
+    async def body(client):
+        await client.get_profile()
+        await client.get_profile()
+        await client.get_proxy_config()
+        await client.get_proxy_config()
+        return client.cache
+
+    cache = run(body, cache=ResponseCache(ttls={"profile/": 60, "proxy/config/": 0}))
+    assert api.count("profile/") == 1
+    assert api.count("proxy/config/") == 2
+    assert cache.hits == 1
+
+
+def test_writes_invalidate_cached_listings(run, api):
+    async def body(client):
+        await client.get_ip()
+        created = await client.create_ip("1.2.3.4")
+        return created.id, [entry.id for entry in (await client.get_ip()).get_results()]
+
+    created, listed = run(body, cache=ResponseCache())
+    assert listed == [created]
@@ -0,0 +1,165 @@
+import pytest
+
+from webshare.util import CircuitBreaker, CircuitBreakerStrategy, BreakerRegistry, ProxyRotator, StickyStrategy
+from webshare.util.breaker import CLOSED, OPEN, HALF_OPEN
+from webshare.util.objects import Proxy
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr("webshare.util.breaker.time.monotonic", clock)
+    return clock
+
+
+def trip(breaker: CircuitBreaker) -> None:
+    for _ in range(breaker.min_requests):
+        breaker.record(False)
+
+
+def test_stays_closed_below_min_requests(clock):
+    breaker = CircuitBreaker(min_requests=10)
+    for _ in range(9):
+        breaker.record(False)
+    assert breaker.state == CLOSED
+    assert breaker.allow()
+
+
+def test_opens_when_failure_rate_reaches_threshold(clock):
+    breaker = CircuitBreaker(failure_threshold=0.5, min_requests=4)
+    breaker.record(True)
+    breaker.record(True)
+    breaker.record(False)
+    assert breaker.state == CLOSED
+    breaker.record(False)
+    assert breaker.state == OPEN
+    assert not breaker.allow()
+
+
+def test_old_outcomes_leave_the_window(clock):
+    breaker = CircuitBreaker(min_requests=4, window=10, buckets=10)
+    for _ in range(3):
+        breaker.record(False)
+    clock.now += 11
+    breaker.record(False)
+    assert breaker.counts() == (0, 1)
+    assert breaker.state == CLOSED
+
+
+def test_half_open_lets_one_probe_through(clock):
+    breaker = CircuitBreaker(min_requests=2, quarantine=30, half_open_probes=1)
+    trip(breaker)
+
+    clock.now += 29
+    assert not breaker.allow()
+    clock.now += 1
+    assert breaker.allow()
+    assert breaker.state == HALF_OPEN
+    assert not breaker.allow()
+
+
+def test_successful_probes_close_the_breaker(clock):
+    breaker = CircuitBreaker(min_requests=2, quarantine=30, success_to_close=2)
+    trip(breaker)
+    clock.now += 30
+
+    assert breaker.allow()
+    breaker.record(True)
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow()
+    breaker.record(True)
+    assert breaker.state == CLOSED
+    assert breaker.counts() == (0, 0)
+
+
+def test_failed_probe_doubles_the_quarantine(clock):
+    breaker = CircuitBreaker(min_requests=2, quarantine=30, max_quarantine=50)
+    trip(breaker)
+    clock.now += 30
+
+    assert breaker.allow()
+    breaker.record(False)
+    assert breaker.state == OPEN
+    assert breaker.current_quarantine == 50
+
+    clock.now += 49
+    assert not breaker.allow()
+    clock.now += 1
+    assert breaker.allow()
+
+
+def test_unreported_probe_is_released_after_a_quarantine(clock):
+    breaker = CircuitBreaker(min_requests=2, quarantine=30)
+    trip(breaker)
+    clock.now += 30
+    assert breaker.allow()
+
+    clock.now += 30
+    assert breaker.allow()
+
+
+def test_strategy_skips_quarantined_proxies(clock):
+    proxies = [Proxy({"id": str(index), "proxy_address": "127.0.0.1", "port": 8000 + index}) for index in range(3)]
+    registry = BreakerRegistry(min_requests=2)
+    rotator = ProxyRotator(proxies, strategy=CircuitBreakerStrategy(registry=registry))
+    for _ in range(2):
+        rotator.record(proxies[0], ok=False)
+
+    assert registry.quarantined() == ["0"]
+    assert all(rotator.get().id != "0" for _ in range(10))
+
+
+def test_invalid_settings_are_rejected():
+    with pytest.raises(ValueError):
+        BreakerRegistry(failure_threshold=0)
+
+
+def test_registry_counts_successes_before_the_first_failure(clock):
+    registry = BreakerRegistry(min_requests=4)
+    proxy = Proxy({"id": "0", "proxy_address": "127.0.0.1", "port": 8000})
+    for _ in range(3):
+        registry.record(proxy, True)
+    registry.record(proxy, False)
+
+    assert registry.get("0").counts() == (3, 1)
+    assert registry.state("0") == CLOSED
+
+
+def test_probe_slot_is_claimed_only_for_the_proxy_handed_out(clock):
+    proxies = [Proxy({"id": str(index), "proxy_address": "127.0.0.1", "port": 8000 + index}) for index in range(2)]
+    registry = BreakerRegistry(min_requests=2, quarantine=30)
+    rotator = ProxyRotator(proxies, strategy=CircuitBreakerStrategy(registry=registry))
+    for _ in range(2):
+        rotator.record(proxies[0], ok=False)
+    clock.now += 30
+
+    # Proxy 0 is ready for a probe but excluded, so its slot must stay free.
+    for _ in range(4):
+        assert rotator.get(exclude={proxies[0]}).id == "1"
+    assert registry.get("0").ready()
+
+    assert any(rotator.get().id == "0" for _ in range(4))
+    assert registry.state("0") == HALF_OPEN
+    assert not registry.get("0").ready()
+
+
+def test_fallback_is_spread_over_allowed_proxies(clock):
+    proxies = [Proxy({"id": str(index), "proxy_address": "127.0.0.1", "port": 8000 + index}) for index in range(4)]
+    registry = BreakerRegistry(min_requests=2)
+    rotator = ProxyRotator(proxies, strategy=CircuitBreakerStrategy(StickyStrategy(), registry=registry))
+    pinned = rotator.get("account-1")
+    for _ in range(2):
+        rotator.record(pinned, ok=False)
+
+    chosen = {rotator.get("account-1").id for _ in range(100)}
+
+    assert pinned.id not in chosen
+    assert len(chosen) == 3
@@ -0,0 +1,132 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from webshare.util import ResponseCache, RetryPolicy
+from webshare.exceptions import NotFoundError, RateLimitError
+
+
+def test_delete_ip_returns_status_code(client, api):
+    created = client.create_ip("1.2.3.4")
+
+    assert client.delete_ip(created.id) == 204
+    assert api.ip_authorizations == {}
+    with pytest.raises(NotFoundError):
+        client.delete_ip(created.id)
+
+
+def test_delete_ip_invalidates_cached_listing(make_client):
+    client = make_client(cache=ResponseCache())
+    created = client.create_ip("1.2.3.4")
+    assert [entry.id for entry in client.get_ip().get_results()] == [created.id]
+
+    client.delete_ip(created.id)
+    assert client.get_ip().get_results() == []
+
+
+def test_cache_revalidates_with_etag(make_client, api):
+    client = make_client(cache=ResponseCache(ttls={"profile/": 0}))
+
+    first = client.get_profile()
+    second = client.get_profile()
+
+    assert second.email == first.email
+    assert api.count("profile/") == 2
+    assert client.cache.misses == 2
+
+
+def test_cache_serves_fresh_entries_without_requests(make_client, api):
+    client = make_client(cache=ResponseCache())
+
+    client.get_profile()
+    client.get_profile()
+
+    assert api.count("profile/") == 1
+    assert client.cache.hits == 1
+
+
+def test_retry_after_is_waited_in_full(make_client, api):
+    client = make_client(retry=RetryPolicy(max_retries=1, max_backoff=5.0))
+    api.inject(429, {"Retry-After": "0.2"})
+
+    started = time.monotonic()
+    client.get_profile()
+
+    assert time.monotonic() - started >= 0.2
+    assert api.count("profile/") == 2
+
+
+def test_retry_after_beyond_max_backoff_raises(make_client, api):
+    client = make_client(retry=RetryPolicy(max_retries=3, max_backoff=1.0))
+    api.inject(429, {"Retry-After": "120"})
+
+    with pytest.raises(RateLimitError) as error:
+        client.get_profile()
+
+    assert error.value.retry_after == 120.0
+    assert api.count("profile/") == 1
+
+
+def test_rate_limit_retries_then_raises(make_client, api):
+    client = make_client(retry=RetryPolicy(max_retries=2, backoff_factor=0.0))
+    api.inject(429, times=3)
+
+    with pytest.raises(RateLimitError):
+        client.get_profile()
+    assert api.count("profile/") == 3
+
+
+def run_concurrently(function, times=4):
+    with ThreadPoolExecutor(times) as pool:
+        return [future.exception() for future in [pool.submit(function) for _ in range(times)]]
+
+
+def test_concurrent_reads_are_coalesced(make_client, api):
+    client = make_client(thread_safe=True)
+    api.latency = 0.2
+
+    assert run_concurrently(client.get_profile) == [None] * 4
+    assert api.count("profile/") == 1
+
+
+def test_gets_with_side_effects_are_not_coalesced(make_client, api):
+    client = make_client(thread_safe=True, retry=RetryPolicy(max_retries=0))
+    api.latency = 0.2
+
+    run_concurrently(lambda: client.dismiss_notification("1"))
+    assert api.count("notification/1/dismiss/") == 4
+
+
+def test_create_ips_skips_authorized_addresses(client, api):
+    existing = client.create_ip("10.0.0.1")
+
+    report = client.create_ips(["10.0.0.1", "10.0.0.2", "10.0.0.2", "10.0.0.3"])
+
+    assert report.ok
+    assert [result.item for result in report] == ["10.0.0.1", "10.0.0.2", "10.0.0.3"]
+    assert report.get("10.0.0.1").skipped and report.get("10.0.0.1").value.id == existing.id
+    assert [result.value.ip_address for result in report.succeeded()] == ["10.0.0.2", "10.0.0.3"]
+    assert len(api.ip_authorizations) == 3
+
+
+def test_create_ips_isolates_failures(client, api):
+    api.inject(400)
+
+    report = client.create_ips(["10.0.0.1", "10.0.0.2"], concurrency=1, skip_existing=False)
+
+    assert not report.ok
+    assert [result.item for result in report.failed()] == ["10.0.0.1"]
+    assert [entry["ip_address"] for entry in api.ip_authorizations.values()] == ["10.0.0.2"]
+
+
+def test_delete_ips_resolves_ids_objects_and_addresses(client, api):
+    first, second, third = [client.create_ip("10.0.0.%d" % index) for index in (1, 2, 3)]
+
+    report = client.delete_ips([first.id, second, "10.0.0.3", "10.0.0.3", "10.9.9.9"])
+
+    assert report.ok
+    assert [result.item for result in report] == [first.id, second.id, "10.0.0.3", "10.9.9.9"]
+    assert [result.value for result in report.succeeded()] == [204, 204, 204]
+    assert [result.item for result in report.skipped()] == ["10.9.9.9"]
+    assert api.ip_authorizations == {}
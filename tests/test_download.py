@@ -0,0 +1,32 @@
+from webshare.util import ProxyPool
+from webshare.util.stream import parse_proxy_line
+
+
+def test_download_proxy_list_streams_every_proxy(client, api):
+    proxies = list(client.download_proxy_list())
+
+    assert [(proxy.proxy_address, proxy.port) for proxy in proxies] == [(p["proxy_address"], p["port"]) for p in api.proxies]
+    assert proxies[0].username == "benchuser"
+    assert api.count("proxy/config/") == 1
+
+
+def test_downloaded_proxies_have_distinct_ids(client, api):
+    proxies = list(client.download_proxy_list(token="benchtoken"))
+    pool = ProxyPool(proxies)
+
+    assert len({proxy.id for proxy in proxies}) == len(proxies)
+    assert len(pool) == len(proxies)
+    assert api.count("proxy/config/") == 0
+
+
+def test_download_search_is_quoted(client, api):
+    proxies = list(client.download_proxy_list(search="New York", token="benchtoken"))
+
+    assert len(proxies) == len([p for p in api.proxies if p["city_name"] == "New York"])
+
+
+def test_parse_proxy_line():
+    assert parse_proxy_line("  \r\n") is None
+    proxy = parse_proxy_line("10.0.0.1:8080:user:pa:ss\r\n")
+    assert (proxy.id, proxy.port, proxy.username, proxy.password) == ("10.0.0.1:8080:user", 8080, "user", "pa:ss")
+    assert parse_proxy_line("10.0.0.1:8080").id == "10.0.0.1:8080"
@@ -0,0 +1,94 @@
+import pytest
+
+from webshare.util import ConsistentHashStrategy, HashRing, ProxyRotator
+from webshare.util.objects import Proxy
+
+
+def make_proxies(count):
+    return [Proxy({"id": str(index), "proxy_address": "127.0.0.1", "port": 8000 + index}) for index in range(count)]
+
+
+KEYS = [f"session-{index}" for index in range(2000)]
+
+
+def mapping(ring):
+    return {key: ring.get(key).id for key in KEYS}
+
+
+def test_mapping_is_independent_of_insertion_order():
+    proxies = make_proxies(10)
+    bulk = HashRing(proxies)
+    incremental = HashRing()
+    for proxy in reversed(proxies):
+        incremental.add(proxy)
+
+    assert mapping(bulk) == mapping(incremental)
+
+
+def test_only_keys_of_changed_proxies_move():
+    proxies = make_proxies(10)
+    ring = HashRing(proxies)
+    before = mapping(ring)
+
+    ring.remove("3")
+    after_removal = mapping(ring)
+    assert [key for key in KEYS if before[key] != after_removal[key]] == [key for key in KEYS if before[key] == "3"]
+
+    added, removed = ring.update(proxies + make_proxies(11)[10:])
+    assert (added, removed) == (["3", "10"], [])
+    moved = [key for key in KEYS if before[key] != ring.get(key).id]
+    assert all(ring.get(key).id == "10" for key in moved)
+    assert 0 < len(moved) < len(KEYS) / 5
+
+
+def test_walk_yields_every_proxy_once_starting_with_the_owner():
+    ring = HashRing(make_proxies(5), vnodes=20)
+
+    walked = [proxy.id for proxy in ring.walk("session-1")]
+
+    assert walked[0] == ring.get("session-1").id
+    assert sorted(walked) == ["0", "1", "2", "3", "4"]
+
+
+def test_invalid_rings_raise():
+    with pytest.raises(ValueError):
+        HashRing(vnodes=0)
+    with pytest.raises(ValueError):
+        HashRing().get("session-1")
+
+
+def test_strategy_without_load_factor_follows_the_ring():
+    proxies = make_proxies(8)
+    rotator = ProxyRotator(proxies, strategy=ConsistentHashStrategy())
+    ring = HashRing(proxies)
+
+    assert all(rotator.get(key).id == ring.get(key).id for key in KEYS[:200])
+
+
+def test_bounded_loads_cap_every_proxy():
+    strategy = ConsistentHashStrategy(load_factor=1.25)
+    rotator = ProxyRotator(make_proxies(8), strategy=strategy)
+    first = {key: rotator.get(key).id for key in KEYS[:800]}
+
+    assert max(strategy.load().values()) <= 125
+    assert sum(strategy.load().values()) == 800
+    assert all(rotator.get(key).id == proxy_id for key, proxy_id in first.items())
+
+
+def test_assignments_are_pinned_until_their_proxy_leaves():
+    proxies = make_proxies(4)
+    strategy = ConsistentHashStrategy()
+    rotator = ProxyRotator(proxies, strategy=strategy)
+    other = next(proxy for proxy in proxies if proxy.id != rotator.get("session-1").id)
+
+    strategy.assign("session-1", other)
+    assert rotator.get("session-1").id == other.id
+
+    rotator.update([proxy for proxy in proxies if proxy.id != other.id])
+    assert rotator.get("session-1").id != other.id
+    assert strategy.load() == {}
+
+
+def test_load_factor_below_one_is_rejected():
+    with pytest.raises(ValueError):
+        ConsistentHashStrategy(load_factor=0.5)
@@ -0,0 +1,44 @@
+import socket
+
+from webshare.util import HealthChecker
+from webshare.util.objects import Proxy
+from benchmarks.upstream_proxy import StubUpstreamProxy
+
+
+def make_proxy(port, proxy_id=None, username=None, password=None):
+    return Proxy({"id": proxy_id or str(port), "proxy_address": "127.0.0.1", "port": port, "username": username, "password": password})
+
+
+def closed_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def test_check_reports_each_proxy_in_order(upstreams):
+    proxies = [make_proxy(upstream.port) for upstream in upstreams] + [make_proxy(closed_port(), "dead")]
+
+    report = HealthChecker(concurrency=2, timeout=2.0).check(proxies)
+
+    assert [result.proxy.id for result in report] == [proxy.id for proxy in proxies]
+    assert [result.proxy.id for result in report.failed()] == ["dead"]
+    assert report.get("dead").error
+    assert all(result.latency >= 0 for result in report.healthy())
+    assert set(proxy.id for proxy in report.fastest(2)) <= set(proxy.id for proxy in proxies[:3])
+
+
+def test_check_tunnels_with_the_proxy_credentials(loop, upstreams):
+    guarded = loop.run(StubUpstreamProxy(username="user", password="secret").start())
+    try:
+        checker = HealthChecker(timeout=2.0, target=("127.0.0.1", upstreams[0].port))
+        report = checker.check([
+            make_proxy(guarded.port, "good", "user", "secret"),
+            make_proxy(guarded.port, "bad", "user", "wrong"),
+        ])
+    finally:
+        loop.run(guarded.close())
+
+    assert report.get("good").ok
+    assert not report.get("bad").ok
+    assert "407" in report.get("bad").error
+    assert guarded.tunnels == 1
@@ -0,0 +1,61 @@
+import socket
+
+import pytest
+
+from webshare.exceptions import NotFoundError, TransportError
+from webshare.util import Metrics, RetryPolicy, endpoint_template
+
+
+def test_endpoint_template_bounds_labels():
+    assert endpoint_template("notification/42/dismiss/") == "notification/{id}/dismiss/"
+    assert endpoint_template("proxy/list/download/secrettoken/-/any/username/direct/-/") == "proxy/list/download/"
+    assert endpoint_template("proxy/config/") == "proxy/config/"
+
+
+def test_hooks_see_every_attempt(make_client, api):
+    client = make_client(retry=RetryPolicy(max_retries=1, backoff_factor=0.0))
+    seen = []
+    client.add_hook("pre_request", lambda event: seen.append(("pre", event.attempt, event.status_code)))
+    client.add_hook("post_request", lambda event: seen.append(("post", event.attempt, event.status_code)))
+    api.inject(503)
+
+    client.get_profile()
+
+    assert seen == [("pre", 0, None), ("post", 0, 503), ("pre", 1, None), ("post", 1, 200)]
+
+
+def test_unknown_hook_event_is_rejected(client):
+    with pytest.raises(ValueError):
+        client.add_hook("on_response", print)
+
+
+def test_metrics_record_responses(make_client, api):
+    metrics = Metrics()
+    client = make_client(metrics=metrics)
+    client.get_profile()
+    client.get_profile()
+    with pytest.raises(NotFoundError):
+        client.dismiss_notification("7")
+
+    assert metrics.requests[("profile/", "GET", "200")] == 2
+    assert metrics.requests[("notification/{id}/dismiss/", "GET", "404")] == 1
+    assert metrics.latency[("profile/", "GET")].count == 2
+    assert metrics.bytes_received[("profile/", "GET")] > 0
+
+    exported = metrics.export_prometheus()
+    assert 'webshare_requests_total{endpoint="profile/",method="GET",status="200"} 2' in exported
+    assert 'webshare_request_duration_seconds_count{endpoint="profile/",method="GET"} 2' in exported
+
+
+def test_metrics_record_transport_errors(make_client):
+    metrics = Metrics()
+    client = make_client(metrics=metrics, retry=RetryPolicy(max_retries=0))
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        client.API_BASE_URL = "http://127.0.0.1:%d/api/v2/" % sock.getsockname()[1]
+
+    with pytest.raises(TransportError):
+        client.get_profile()
+
+    assert metrics.errors == {("profile/", "GET", "ConnectionError"): 1}
+    assert metrics.requests == {}
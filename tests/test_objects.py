@@ -0,0 +1,26 @@
+import pytest
+
+from webshare.util.objects import ProxiesList, Proxy
+
+
+def test_get_results_returns_a_new_list_each_call():
+    page = ProxiesList({"count": 2, "results": [{"id": "a"}, {"id": "b"}]})
+
+    first = page.get_results()
+    first.pop()
+
+    assert [proxy.id for proxy in page.get_results()] == ["a", "b"]
+    assert page.get_results()[0] is page.get_results()[0]
+
+
+def test_wrappers_reject_new_attributes():
+    proxy = Proxy({"id": "a"})
+    with pytest.raises(AttributeError):
+        proxy.tag = "fast"
+
+    class TaggedProxy(Proxy):
+        pass
+
+    tagged = TaggedProxy({"id": "a"})
+    tagged.tag = "fast"
+    assert tagged.tag == "fast"
@@ -0,0 +1,57 @@
+from itertools import islice
+
+
+def test_iter_proxies_walks_every_page(client, api):
+    proxies = list(client.iter_proxies(page_size=20))
+
+    assert [proxy.id for proxy in proxies] == [proxy["id"] for proxy in api.proxies]
+    assert api.count("proxy/list/") == 3
+
+
+def test_iter_proxies_fetches_pages_lazily(client, api):
+    first = list(islice(client.iter_proxies(page_size=20), 5))
+
+    assert len(first) == 5
+    assert api.count("proxy/list/") == 1
+
+
+def test_iter_proxies_follows_a_capped_page_size(make_client, api):
+    api.max_page_size = 15
+
+    assert len(list(make_client().iter_proxies(page_size=100))) == 50
+    assert api.count("proxy/list/") == 4
+
+
+def test_iter_ip_authorizations_walks_every_page(client):
+    created = [client.create_ip("10.0.0.%d" % index).id for index in range(5)]
+
+    assert [entry.id for entry in client.iter_ip_authorizations(page_size=2)] == created
+
+
+def test_empty_listings_yield_nothing(client):
+    assert list(client.iter_notifications()) == []
+    assert list(client.iter_api_keys()) == []
+    assert list(client.iter_replaced_proxies()) == []
+
+
+def test_fetch_all_proxies_keeps_page_order(client, api):
+    proxies = list(client.fetch_all_proxies(page_size=10, concurrency=3))
+
+    assert [proxy.id for proxy in proxies] == [proxy["id"] for proxy in api.proxies]
+    assert api.count("proxy/list/") == 5
+
+
+def test_fetch_all_proxies_unordered_yields_every_proxy_once(client, api):
+    proxies = list(client.fetch_all_proxies(page_size=10, concurrency=3, ordered=False))
+
+    assert sorted(proxy.id for proxy in proxies) == sorted(proxy["id"] for proxy in api.proxies)
+    assert len(proxies) == 50
+
+
+def test_fetch_all_proxies_derives_pages_from_a_capped_page_size(make_client, api):
+    api.max_page_size = 15
+
+    proxies = list(make_client().fetch_all_proxies(page_size=100))
+
+    assert [proxy.id for proxy in proxies] == [proxy["id"] for proxy in api.proxies]
+    assert api.count("proxy/list/") == 4
@@ -0,0 +1,61 @@
+from webshare.util import ProxyPool
+from webshare.util.objects import Proxy, ProxiesList
+from benchmarks.mock_server import make_proxies
+
+
+def make_pool(count=12):
+    return ProxyPool(Proxy(proxy) for proxy in make_proxies(count))
+
+
+def ids(proxies):
+    return sorted(proxy.id for proxy in proxies)
+
+
+def test_from_lists_loads_every_page():
+    proxies = make_proxies(4)
+    pool = ProxyPool.from_lists(ProxiesList({"count": 4, "results": proxies[:2]}), ProxiesList({"count": 4, "results": proxies[2:]}))
+
+    assert len(pool) == 4
+    assert "d-3" in pool
+
+
+def test_get_by_address():
+    pool = make_pool()
+
+    assert ids(pool.get_by_address("10.0.0.5")) == ["d-5"]
+    assert ids(pool.get_by_address("10.0.0.5", port=10005)) == ["d-5"]
+    assert pool.get_by_address("10.0.0.5", port=1) == []
+    assert pool.get_by_address("10.9.9.9") == []
+
+
+def test_filter_intersects_indexes():
+    pool = make_pool(40)
+
+    assert ids(pool.filter(country_code="US")) == ["d-0", "d-12", "d-18", "d-24", "d-30", "d-36", "d-6"]
+    assert ids(pool.filter(country_code="US", valid=False)) == ["d-0"]
+    assert ids(pool.filter(country_code=["DE", "FR"], city_name="Paris")) == ids(pool.filter(country_code="FR"))
+    assert pool.count(valid=False) == 3
+    assert pool.filter(country_code="XX") == []
+    assert len(pool.filter()) == 40
+
+
+def test_replace_updates_every_index():
+    pool = make_pool()
+    added = Proxy(dict(make_proxies(1)[0], id="new", proxy_address="192.0.2.1", country_code="JP", valid=True))
+
+    pool.replace(["d-0", "d-6"], [added])
+
+    assert pool.get("d-0") is None
+    assert pool.get_by_address("10.0.0.0") == []
+    assert ids(pool.filter(country_code="US")) == []
+    assert ids(pool.filter(country_code="JP")) == ["d-11", "d-5", "new"]
+    assert pool.count(valid=False) == 0
+
+
+def test_adding_a_known_id_reindexes_it():
+    pool = make_pool()
+    pool.add(Proxy(dict(make_proxies(1)[0], country_code="DE")))
+
+    assert len(pool) == 12
+    assert "d-0" not in ids(pool.filter(country_code="US"))
+    assert "d-0" in ids(pool.filter(country_code="DE"))
@@ -0,0 +1,18 @@
+from webshare.util import ProxyQuery, ProxyTable
+from benchmarks.mock_server import make_proxies
+
+
+def test_in_accepts_a_comma_separated_string():
+    query = ProxyQuery().where(country_code__in="US, DE")
+
+    assert query.plan().server_params["country_code__in"] == "DE,US"
+    assert query.plan().client_filters == []
+
+
+def test_in_string_filters_like_a_list():
+    table = ProxyTable(make_proxies(12))
+    by_string = ProxyQuery().where(city_name__in="Berlin,Tokyo").apply(table)
+    by_list = ProxyQuery().where(city_name__in=["Berlin", "Tokyo"]).apply(table)
+
+    assert len(by_string) == len(by_list) == 4
+    assert [row.id for row in by_string] == [row.id for row in by_list]
@@ -0,0 +1,105 @@
+import collections
+import time
+
+import pytest
+
+from webshare.util import ProxyRotator, LatencyAwareStrategy, LeastRecentlyUsedStrategy, StickyStrategy
+from webshare.util.objects import Proxy
+
+
+def make_proxies(count):
+    return [Proxy({"id": str(index), "proxy_address": "127.0.0.1", "port": 8000 + index}) for index in range(count)]
+
+
+def test_excluded_choice_is_replaced_at_random():
+    proxies = make_proxies(4)
+    rotator = ProxyRotator(proxies, strategy=StickyStrategy())
+    pinned = rotator.get("account-1")
+
+    chosen = collections.Counter(rotator.get("account-1", exclude={pinned}).id for _ in range(400))
+
+    assert pinned.id not in chosen
+    assert len(chosen) == 3
+
+
+def test_everything_excluded_raises():
+    proxies = make_proxies(2)
+    rotator = ProxyRotator(proxies)
+    with pytest.raises(ValueError):
+        rotator.get(exclude=set(proxies))
+
+
+def test_least_recently_used_counts_reported_outcomes():
+    proxies = make_proxies(3)
+    rotator = ProxyRotator(proxies, strategy=LeastRecentlyUsedStrategy())
+    assert [rotator.get().id for _ in range(3)] == ["0", "1", "2"]
+
+    # Proxy 0 was handed out first but its request ended last.
+    rotator.record(proxies[1])
+    rotator.record(proxies[2])
+    rotator.record(proxies[0])
+
+    assert [rotator.get().id for _ in range(3)] == ["1", "2", "0"]
+
+
+def test_least_recently_used_keeps_history_across_update():
+    proxies = make_proxies(3)
+    rotator = ProxyRotator(proxies, strategy=LeastRecentlyUsedStrategy())
+    rotator.get()
+    rotator.get()
+
+    rotator.update(make_proxies(4))
+
+    assert [rotator.get().id for _ in range(2)] == ["2", "3"]
+
+
+def test_latency_aware_prefers_fast_proxies():
+    proxies = make_proxies(4)
+    strategy = LatencyAwareStrategy(decay=0)
+    rotator = ProxyRotator(proxies, strategy=strategy)
+    for proxy, latency in zip(proxies, [0.05, 0.1, 2.0, 3.0]):
+        rotator.record(proxy, latency)
+
+    chosen = collections.Counter(rotator.get().id for _ in range(600))
+
+    # The slowest proxy only wins when it is compared with itself, which never happens.
+    assert "3" not in chosen
+    assert chosen["0"] > chosen["1"] > chosen["2"]
+
+
+def test_latency_aware_counts_failures():
+    proxies = make_proxies(2)
+    strategy = LatencyAwareStrategy(alpha=0.5, failure_cost=5.0, decay=0)
+    strategy.record(proxies[0], 0.1)
+    strategy.record(proxies[0], ok=False)
+
+    assert strategy.stats(proxies[0]) == (0.1, 0.5)
+    assert strategy.cost(proxies[0]) == pytest.approx(2.6)
+    assert strategy.stats(proxies[1]) is None
+    assert strategy.cost(proxies[1]) == 0.0
+
+
+def test_latency_aware_costs_fade_back():
+    proxy = make_proxies(1)[0]
+    strategy = LatencyAwareStrategy(decay=10.0, initial_latency=0.2)
+    strategy.record(proxy, 5.0)
+
+    later = time.monotonic() + 100.0
+
+    assert strategy.cost(proxy, later) == pytest.approx(0.2, abs=1e-3)
+
+
+def test_latency_aware_forgets_removed_proxies():
+    proxies = make_proxies(3)
+    strategy = LatencyAwareStrategy()
+    rotator = ProxyRotator(proxies, strategy=strategy)
+    rotator.record(proxies[2], 1.0)
+
+    rotator.update(proxies[:2])
+
+    assert strategy.stats(proxies[2]) is None
+
+
+def test_latency_aware_rejects_bad_alpha():
+    with pytest.raises(ValueError):
+        LatencyAwareStrategy(alpha=0)
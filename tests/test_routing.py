@@ -0,0 +1,101 @@
+import asyncio
+
+import aiohttp
+import pytest
+import requests
+
+from webshare.aio import AsyncProxyRouter
+from webshare.util import LatencyAwareStrategy, ProxyRoutingAdapter, StickyStrategy, is_success
+from webshare.util.objects import Proxy
+from benchmarks.upstream_proxy import StubUpstreamProxy
+
+HEADERS = {"Authorization": "Token test-token"}
+
+
+def make_proxies(upstreams):
+    # A fresh list each time, like a refreshed get_proxy_list: equal IDs, new Proxy objects.
+    return [Proxy({"id": str(index), "proxy_address": "127.0.0.1", "port": upstream.port}) for index, upstream in enumerate(upstreams)]
+
+
+def test_sticky_key_keeps_its_proxy_across_update(api, upstreams):
+    adapter = ProxyRoutingAdapter(make_proxies(upstreams))
+    session = adapter.session()
+    assert session.get(api.base_url + "profile/", headers=dict(HEADERS, **{"X-Proxy-Session": "account-1"})).status_code == 200
+    before = [upstream.requests for upstream in upstreams]
+
+    adapter.update(make_proxies(upstreams))
+    for _ in range(3):
+        assert session.get(api.base_url + "profile/", headers=dict(HEADERS, **{"X-Proxy-Session": "account-1"})).status_code == 200
+
+    served = [upstream.requests - count for upstream, count in zip(upstreams, before)]
+    assert sorted(served) == [0, 0, 3]
+
+
+def test_sticky_assignment_dropped_with_its_proxy(upstreams):
+    strategy = StickyStrategy()
+    adapter = ProxyRoutingAdapter(make_proxies(upstreams), strategy=strategy)
+    first = adapter.rotator.get("account-1")
+
+    adapter.update([proxy for proxy in make_proxies(upstreams) if proxy.id != first.id])
+
+    assert adapter.rotator.get("account-1").id != first.id
+
+
+def test_failover_pins_key_to_working_proxy(api, upstreams):
+    dead = Proxy({"id": "dead", "proxy_address": "127.0.0.1", "port": 1})
+    adapter = ProxyRoutingAdapter([dead] + make_proxies(upstreams)[:1])
+    session = adapter.session()
+
+    assert session.get(api.base_url + "profile/", headers=dict(HEADERS, **{"X-Proxy-Session": "a"})).status_code == 200
+    assert session.get(api.base_url + "profile/", headers=dict(HEADERS, **{"X-Proxy-Session": "b"})).status_code == 200
+    assert adapter.failovers == 1
+    assert adapter.rotator.get("a").id == adapter.rotator.get("b").id == "0"
+
+
+def test_async_router_sticky_across_update(api, upstreams):
+    async def main():
+        router = AsyncProxyRouter(make_proxies(upstreams))
+        async with aiohttp.ClientSession() as session:
+            async with await router.request(session, "GET", api.base_url + "profile/", key="account-1", headers=HEADERS) as response:
+                assert response.status == 200
+            chosen = router.rotator.get("account-1").id
+            router.update(make_proxies(upstreams))
+            async with await router.request(session, "GET", api.base_url + "profile/", key="account-1", headers=HEADERS) as response:
+                assert response.status == 200
+            return chosen, router.rotator.get("account-1").id
+
+    before, after = asyncio.run(main())
+    assert before == after
+
+
+@pytest.mark.parametrize("status, expected", [(200, True), (304, True), (404, True), (403, False), (429, False), (503, False)])
+def test_is_success(status, expected):
+    assert is_success(status) is expected
+
+
+def test_async_router_records_dropped_requests(api, loop):
+    upstream = loop.run(StubUpstreamProxy(max_requests=0).start())
+    strategy = LatencyAwareStrategy()
+    proxy = Proxy({"id": "0", "proxy_address": "127.0.0.1", "port": upstream.port})
+
+    async def main():
+        router = AsyncProxyRouter([proxy], strategy=strategy)
+        async with aiohttp.ClientSession() as session:
+            with pytest.raises(aiohttp.ClientError):
+                await router.request(session, "GET", api.base_url + "profile/", headers=HEADERS)
+
+    asyncio.run(main())
+    loop.run(upstream.close())
+    assert strategy.stats(proxy)[1] > 0
+
+
+def test_adapter_records_read_timeouts(api, upstreams):
+    strategy = LatencyAwareStrategy()
+    proxies = make_proxies(upstreams)[:1]
+    adapter = ProxyRoutingAdapter(proxies, strategy=strategy)
+    api.latency = 0.5
+
+    with pytest.raises(requests.ReadTimeout):
+        adapter.session().get(api.base_url + "profile/", headers=HEADERS, timeout=(5, 0.1))
+
+    assert strategy.stats(proxies[0])[1] > 0
@@ -0,0 +1,83 @@
+import collections
+import time
+
+import pytest
+
+from webshare.util import BanditStrategy, DomainScorer, ProxyRotator, target_domain
+from webshare.util.objects import Proxy
+
+
+def make_proxies(count):
+    return [Proxy({"id": str(index), "proxy_address": "127.0.0.1", "port": 8000 + index}) for index in range(count)]
+
+
+def test_target_domain():
+    assert target_domain("https://Example.COM:8443/path?q=1") == "example.com"
+    assert target_domain("not a url") == ""
+
+
+def test_scorer_posterior_and_leader():
+    proxies = make_proxies(2)
+    scorer = DomainScorer(half_life=0)
+    for _ in range(3):
+        scorer.record(proxies[0], "example.com", True)
+    scorer.record(proxies[1], "example.com", False)
+
+    assert scorer.success_rate("0", "example.com") == pytest.approx(0.8)
+    assert scorer.success_rate("1", "example.com") == pytest.approx(1 / 3)
+    assert scorer.success_rate("0", "other.com") == 0.5
+    assert scorer.leader("example.com") == "0"
+
+    scorer.record(proxies[0], "example.com", False)
+    assert scorer.leader("example.com") is None
+
+
+def test_scorer_counts_decay():
+    proxy = make_proxies(1)[0]
+    scorer = DomainScorer(half_life=10.0)
+    for _ in range(8):
+        scorer.record(proxy, "example.com", False)
+
+    assert scorer.success_rate("0", "example.com", time.monotonic() + 1000.0) == pytest.approx(0.5, abs=1e-3)
+
+
+def test_scorer_evicts_the_oldest_pairs():
+    proxies = make_proxies(3)
+    scorer = DomainScorer(max_entries=2)
+    for proxy in proxies:
+        scorer.record(proxy, "example.com", False)
+
+    assert len(scorer) == 2
+    assert scorer.success_rate("0", "example.com") == 0.5
+
+
+def test_scorer_rejects_empty_prior():
+    with pytest.raises(ValueError):
+        DomainScorer(prior=(0.0, 1.0))
+
+
+def test_bandit_avoids_proxies_blocked_on_a_domain():
+    proxies = make_proxies(3)
+    strategy = BanditStrategy(DomainScorer(half_life=0))
+    rotator = ProxyRotator(proxies, strategy=strategy)
+    for _ in range(30):
+        for proxy in proxies:
+            rotator.record(proxy, ok=proxy.id != "0", key="blocked.com")
+
+    blocked = collections.Counter(rotator.get("blocked.com").id for _ in range(300))
+    elsewhere = collections.Counter(rotator.get("open.com").id for _ in range(300))
+
+    assert blocked["0"] < 5
+    assert len(elsewhere) == 3
+
+
+def test_bandit_keeps_the_leader_among_sampled_candidates():
+    proxies = make_proxies(50)
+    scorer = DomainScorer(half_life=0)
+    for _ in range(50):
+        scorer.record(proxies[7], "example.com", True)
+    rotator = ProxyRotator(proxies, strategy=BanditStrategy(scorer, candidates=2))
+
+    chosen = collections.Counter(rotator.get("example.com").id for _ in range(200))
+
+    assert chosen["7"] > 150
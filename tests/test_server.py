@@ -0,0 +1,190 @@
+import argparse
+import asyncio
+import http.client
+from urllib.parse import urlsplit
+
+import pytest
+import requests
+
+from webshare.server import RotatingProxyServer, _parse_upstream
+from webshare.util import LatencyAwareStrategy
+from webshare.util.objects import Proxy
+from benchmarks.upstream_proxy import StubUpstreamProxy
+
+HEADERS = {"Authorization": "Token test-token"}
+
+
+def upstream_proxy(upstream, id="0"):
+    return Proxy({"id": id, "proxy_address": "127.0.0.1", "port": upstream.port})
+
+
+@pytest.fixture
+def serve(loop):
+    servers = []
+
+    def serve(proxies, **kwargs):
+        server = loop.run(RotatingProxyServer(proxies, port=0, **kwargs).start())
+        servers.append(server)
+        return server
+
+    yield serve
+    for server in servers:
+        loop.run(server.close())
+
+
+def test_connect_tunnel(api, upstreams, serve):
+    server = serve([upstream_proxy(upstreams[0])])
+    origin = urlsplit(api.base_url)
+
+    connection = http.client.HTTPConnection("127.0.0.1", server.port, timeout=5)
+    connection.set_tunnel(origin.hostname, origin.port)
+    for _ in range(2):
+        connection.request("GET", origin.path + "profile/", headers=HEADERS)
+        response = connection.getresponse()
+        assert response.status == 200
+        response.read()
+    connection.close()
+
+    assert upstreams[0].tunnels == 1
+    assert server.stats["tunnels"] == 1
+
+
+def test_connect_fails_over_to_a_reachable_upstream(api, upstreams, serve):
+    dead = Proxy({"id": "dead", "proxy_address": "127.0.0.1", "port": 1})
+    server = serve([dead, upstream_proxy(upstreams[0])])
+    origin = urlsplit(api.base_url)
+
+    connection = http.client.HTTPConnection("127.0.0.1", server.port, timeout=5)
+    connection.set_tunnel(origin.hostname, origin.port)
+    connection.request("GET", origin.path + "profile/", headers=HEADERS)
+    assert connection.getresponse().status == 200
+    connection.close()
+
+    assert upstreams[0].tunnels == 1
+
+
+def test_connect_without_upstreams_answers_502(serve):
+    dead = Proxy({"id": "dead", "proxy_address": "127.0.0.1", "port": 1})
+    server = serve([dead], max_failover=0)
+
+    connection = http.client.HTTPConnection("127.0.0.1", server.port, timeout=5)
+    connection.set_tunnel("127.0.0.1", 9)
+    with pytest.raises(OSError, match="502"):
+        connection.request("GET", "/")
+    connection.close()
+
+
+def test_tunnel_stays_open_while_one_direction_is_busy(loop, upstreams, serve):
+    server = serve([upstream_proxy(upstreams[0])], idle_timeout=0.3)
+
+    async def trickle(reader, writer):
+        # Send for longer than the idle timeout while the client stays silent.
+        for _ in range(8):
+            writer.write(b"x" * 10)
+            await writer.drain()
+            await asyncio.sleep(0.1)
+        writer.close()
+
+    async def download():
+        origin = await asyncio.start_server(trickle, "127.0.0.1", 0)
+        reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+        writer.write(f"CONNECT 127.0.0.1:{origin.sockets[0].getsockname()[1]} HTTP/1.1\r\n\r\n".encode())
+        await reader.readuntil(b"\r\n\r\n")
+        data = await reader.read()
+        writer.close()
+        origin.close()
+        return data
+
+    assert loop.run(download()) == b"x" * 80
+
+
+def test_idle_tunnel_is_closed(loop, upstreams, serve):
+    server = serve([upstream_proxy(upstreams[0])], idle_timeout=0.2)
+
+    async def idle(reader, writer):
+        await reader.read()
+
+    async def wait_for_close():
+        origin = await asyncio.start_server(idle, "127.0.0.1", 0)
+        reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+        writer.write(f"CONNECT 127.0.0.1:{origin.sockets[0].getsockname()[1]} HTTP/1.1\r\n\r\n".encode())
+        await reader.readuntil(b"\r\n\r\n")
+        data = await asyncio.wait_for(reader.read(), 5)
+        writer.close()
+        origin.close()
+        return data
+
+    assert loop.run(wait_for_close()) == b""
+
+
+def test_stale_pooled_connection_is_retried_on_the_same_upstream(api, loop, serve):
+    upstream = loop.run(StubUpstreamProxy(max_requests=1).start())
+    strategy = LatencyAwareStrategy()
+    proxy = upstream_proxy(upstream)
+    server = serve([proxy], strategy=strategy)
+    session = requests.Session()
+    session.proxies = {"http": f"http://127.0.0.1:{server.port}"}
+
+    for address in ("1.2.3.4", "5.6.7.8"):
+        response = session.post(api.base_url + "proxy/ipauthorization/", json={"ip_address": address}, headers=HEADERS)
+        assert response.status_code == 201
+
+    assert server.stats["upstream_reused"] == 1
+    assert server.stats["failovers"] == 0
+    assert strategy.stats(proxy)[1] == 0.0
+    loop.run(upstream.close())
+
+
+def raw_exchange(loop, server, request, body=b""):
+    async def exchange():
+        reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+        writer.write(request)
+        first = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), 5)
+        if body:
+            writer.write(body)
+        rest = await asyncio.wait_for(reader.read(), 5)
+        writer.close()
+        return first, rest
+
+    return loop.run(exchange())
+
+
+def test_invalid_content_length_answers_400(loop, upstreams, serve):
+    server = serve([upstream_proxy(upstreams[0])])
+
+    first, _ = raw_exchange(loop, server, b"POST http://127.0.0.1:9/ HTTP/1.1\r\nHost: 127.0.0.1:9\r\nContent-Length: abc\r\n\r\n")
+
+    assert first.startswith(b"HTTP/1.1 400")
+    assert upstreams[0].requests == 0
+
+
+def test_expect_continue_is_answered(api, loop, upstreams, serve):
+    server = serve([upstream_proxy(upstreams[0])])
+    origin = urlsplit(api.base_url)
+    body = b'{"ip_address": "1.2.3.4"}'
+    request = (
+        f"POST {api.base_url}proxy/ipauthorization/ HTTP/1.1\r\nHost: {origin.netloc}\r\nAuthorization: Token test-token\r\n"
+        f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\nExpect: 100-continue\r\nConnection: close\r\n\r\n"
+    ).encode()
+
+    first, rest = raw_exchange(loop, server, request, body)
+
+    assert first == b"HTTP/1.1 100 Continue\r\n\r\n"
+    assert rest.startswith(b"HTTP/1.1 201")
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("10.0.0.1:8080", ("10.0.0.1", 8080, None, None)),
+    ("10.0.0.1:8080:user:pa:ss", ("10.0.0.1", 8080, "user", "pa:ss")),
+    ("[2001:db8::1]:8080", ("2001:db8::1", 8080, None, None)),
+    ("[::1]:3128:user:pass", ("::1", 3128, "user", "pass")),
+])
+def test_parse_upstream(value, expected):
+    proxy = _parse_upstream(value)
+    assert (proxy.proxy_address, proxy.port, proxy.username, proxy.password) == expected
+
+
+@pytest.mark.parametrize("value", ["10.0.0.1", "2001:db8::1:8080", "[::1]", "10.0.0.1:http"])
+def test_parse_upstream_rejects_malformed_values(value):
+    with pytest.raises(argparse.ArgumentTypeError):
+        _parse_upstream(value)
@@ -0,0 +1,80 @@
+import logging
+import struct
+import sys
+
+import pytest
+
+from webshare.util import ProxySnapshot, SnapshotStore, save_snapshot
+from webshare.util.objects import Proxy
+from webshare.util.snapshot import _HEADER
+
+
+def make_proxies(count):
+    return [Proxy({"id": str(index), "proxy_address": "127.0.0.1", "port": 8000 + index}) for index in range(count)]
+
+
+def test_snapshot_round_trip(tmp_path):
+    path = str(tmp_path / "proxies.snapshot")
+    save_snapshot(path, make_proxies(3), {"mode": "direct"})
+
+    with ProxySnapshot(path) as snapshot:
+        assert len(snapshot) == 3
+        assert [proxy.port for proxy in snapshot] == [8000, 8001, 8002]
+        assert snapshot[-1].id == "2"
+        assert snapshot.params == {"mode": "direct"}
+
+
+def test_offsets_are_decoded_on_big_endian_hosts(tmp_path, monkeypatch):
+    path = str(tmp_path / "proxies.snapshot")
+    save_snapshot(path, make_proxies(3))
+    # Store the table big-endian and pretend to be the other kind of host: the decoder then sees
+    # bytes in the opposite of its native order, exactly as a real big-endian host does.
+    with open(path, "r+b") as f:
+        data = bytearray(f.read())
+        start = _HEADER.size + _HEADER.unpack_from(data)[3]
+        offsets = struct.unpack_from("<4Q", data, start)
+        struct.pack_into(">4Q", data, start, *offsets)
+        f.seek(0)
+        f.write(data)
+
+    monkeypatch.setattr("webshare.util.snapshot.sys.byteorder", "little" if sys.byteorder == "big" else "big")
+    with ProxySnapshot(path) as snapshot:
+        assert [proxy.port for proxy in snapshot] == [8000, 8001, 8002]
+
+
+def test_failed_background_refresh_is_logged(tmp_path, caplog):
+    class BrokenClient:
+        def fetch_all_proxies(self, **filters):
+            raise ValueError("boom")
+
+    store = SnapshotStore(BrokenClient(), str(tmp_path / "proxies.snapshot"))
+    with caplog.at_level(logging.ERROR, logger="webshare.util.snapshot"):
+        store.refresh_in_background().join()
+
+    assert "Background snapshot refresh" in caplog.text
+    assert store.snapshot is None
+
+
+@pytest.mark.parametrize("size", [0, 10, 40, 200, 205])
+def test_truncated_snapshot_is_rejected(tmp_path, size):
+    path = str(tmp_path / "proxies.snapshot")
+    save_snapshot(path, make_proxies(20))
+    with open(path, "r+b") as f:
+        f.truncate(size)
+
+    with pytest.raises(ValueError):
+        ProxySnapshot(path)
+
+
+def test_load_falls_back_to_a_download_when_the_snapshot_is_corrupt(tmp_path):
+    class Client:
+        def fetch_all_proxies(self, **filters):
+            return make_proxies(2)
+
+    path = str(tmp_path / "proxies.snapshot")
+    save_snapshot(path, make_proxies(20))
+    with open(path, "r+b") as f:
+        f.truncate(205)
+
+    with SnapshotStore(Client(), path).load(refresh=False) as snapshot:
+        assert len(snapshot) == 2
@@ -0,0 +1,58 @@
+import asyncio
+import json
+
+import pytest
+
+from webshare.util import AsyncStreamedPage, StreamedPage
+from benchmarks.mock_server import make_proxies
+
+def chunked(document, size):
+    body = json.dumps(document).encode()
+    return [body[start:start + size] for start in range(0, len(body), size)]
+
+
+@pytest.fixture(params=["json", "ijson"])
+def backend(request):
+    if request.param == "ijson":
+        pytest.importorskip("ijson")
+    return request.param
+
+
+@pytest.mark.parametrize("size", [7, 65536])
+def test_fields_before_results(backend, size):
+    proxies = make_proxies(300)
+    page = StreamedPage(chunked({"count": 300, "next": "http://api/?page=2", "previous": None, "results": proxies}, size), backend)
+
+    assert list(page) == proxies
+    assert (page.count, page.next, page.previous) == (300, "http://api/?page=2", None)
+
+
+@pytest.mark.parametrize("size", [7, 65536])
+def test_fields_after_results(backend, size):
+    proxies = make_proxies(300)
+    page = StreamedPage(chunked({"results": proxies, "next": "http://api/?page=2&tags=a,b]", "count": 300, "previous": None}, size), backend)
+
+    assert list(page) == proxies
+    assert (page.count, page.next, page.previous) == (300, "http://api/?page=2&tags=a,b]", None)
+
+
+def test_empty_page(backend):
+    page = StreamedPage(chunked({"results": [], "count": 0, "next": None}, 4), backend)
+
+    assert list(page) == []
+    assert page.count == 0
+
+
+@pytest.mark.parametrize("size", [1, 7, 65536])
+def test_async_page_matches_the_sync_one(backend, size):
+    document = {"count": 300, "next": "http://api/?page=2", "results": make_proxies(300), "previous": None}
+
+    async def chunks():
+        for chunk in chunked(document, size):
+            yield chunk
+
+    async def read():
+        page = AsyncStreamedPage(chunks(), backend)
+        return [item async for item in page], page.meta
+
+    assert asyncio.run(read()) == (document["results"], {key: value for key, value in document.items() if key != "results"})
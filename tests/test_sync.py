@@ -0,0 +1,71 @@
+import logging
+
+from webshare import ProxySync
+
+
+def pool_ids(sync):
+    return {proxy.id for proxy in sync.pool}
+
+
+def api_ids(api):
+    return {proxy["id"] for proxy in api.proxies}
+
+
+def test_sync_without_new_replacements_only_reads_the_history(client, api):
+    sync = ProxySync(client)
+    sync.sync()
+    api.reset_counts()
+
+    result = sync.sync()
+
+    assert not result.full
+    assert api.count() == api.count("proxy/list/replaced/") == 1
+
+
+def test_sync_looks_up_only_the_added_addresses(client, api):
+    sync = ProxySync(client, page_size=100)
+    sync.sync()
+    for index in (3, 7, 11):
+        api.replace_proxy(index)
+    api.reset_counts()
+
+    result = sync.sync()
+
+    assert (result.full, result.removed, result.added) == (False, 3, 3)
+    # One search per added address and one count request; no full download.
+    assert api.count("proxy/list/") == 4
+    assert pool_ids(sync) == api_ids(api)
+
+
+def test_pending_replacement_is_applied_once_it_completes(client, api):
+    sync = ProxySync(client, page_size=100)
+    sync.sync()
+    pending = api.replace_proxy(5, state="processing")
+    api.replace_proxy(9)
+
+    assert sync.sync().added == 1
+    assert pool_ids(sync) == api_ids(api)
+
+    api.complete_replacement(pending["id"])
+    result = sync.sync()
+
+    assert (result.full, result.removed, result.added) == (False, 1, 1)
+    assert pool_ids(sync) == api_ids(api)
+
+
+def test_background_sync_logs_errors_and_keeps_running(client, caplog):
+    sync = ProxySync(client)
+    calls = []
+
+    def fail():
+        calls.append(None)
+        if len(calls) == 1:
+            raise RuntimeError("down")
+        sync.stop()
+
+    sync.sync = fail
+    with caplog.at_level(logging.ERROR, logger="webshare.util.sync"):
+        sync.run_in_background(interval=0.01).join(5)
+
+    assert len(calls) == 2
+    assert "Background proxy sync failed" in caplog.text
@@ -1 +1,14 @@
 from .webshare import ApiClient
+from .util.pool import ProxyPool
+from .util.rotation import ProxyRotator
+from .util.health import HealthChecker
+from .util.cache import ResponseCache
+from .util.snapshot import SnapshotStore
+from .util.sync import ProxySync
+from .util.table import ProxyTable
+from .util.query import ProxyQuery
+from .util.retry import RetryPolicy, TokenBucket
+from .util.metrics import Metrics
+from .util.routing import ProxyRoutingAdapter
+from .server import RotatingProxyServer
+from .exceptions import WebshareError, TransportError, RequestTimeoutError, ResponseParseError, ApiError, ClientError, AuthenticationError, NotFoundError, RateLimitError, ServerError
@@ -0,0 +1,1159 @@
+import json
+import math
+import time
+import asyncio
+import aiohttp
+from yarl import URL
+from collections import deque
+from itertools import islice
+from urllib.parse import quote
+
+from .util.objects import *
+from .util.retry import RetryPolicy, TokenBucket
+from .util.rotation import ProxyRotator, RotationStrategy, StickyStrategy, is_success
+from .util.metrics import Metrics, RequestEvent
+from .util.cache import ResponseCache, CacheEntry
+from .util.stream import AsyncStreamedPage, parse_proxy_line
+from .util.singleflight import AsyncSingleFlight, coalescable
+from .util.batch import BatchResult, BatchReport, run_batch_async, plan_ip_creation, plan_ip_deletion
+from .exceptions import TransportError, RequestTimeoutError, ResponseParseError, error_for_status
+from typing import Optional, Dict, Union, List, Any, Iterable, AsyncIterator, Type, Tuple, Callable, Hashable
+
+class AsyncApiClient:
+    API_BASE_URL = "https://proxy.webshare.io/api/v2/"
+
+    def __init__(self,
+                 api_key: str,
+                 limit: int = 100,
+                 limit_per_host: int = 0,
+                 session: Optional[aiohttp.ClientSession] = None,
+                 timeout: Union[float, Tuple[float, float], None] = (5.0, 30.0),
+                 retry: Optional[RetryPolicy] = None,
+                 rate_limiter: Optional[TokenBucket] = None,
+                 metrics: Optional[Metrics] = None,
+                 coalesce: bool = True,
+                 cache: Optional[ResponseCache] = None) -> None:
+        """
+        Initialize the asyncio Webshare Proxy API client.
+
+        The underlying ``aiohttp.ClientSession`` is created lazily on first use so the client
+        can be constructed outside of a running event loop. Every call made through one client
+        shares a single connection pool.
+
+        Parameters:
+            api_key (str): The API key used for authentication.
+            limit (int, optional): The total number of simultaneous connections in the pool.
+            limit_per_host (int, optional): The number of simultaneous connections per host (0 means no limit).
+            session (aiohttp.ClientSession, optional): An existing session to use instead of creating one.
+            timeout (float or tuple, optional): The request timeout in seconds, or a ``(connect, read)`` pair.
+            retry (RetryPolicy, optional): When and how to retry failed requests; ``RetryPolicy()`` by default.
+            rate_limiter (TokenBucket, optional): A limiter every request waits on; it can be shared with other clients.
+            metrics (Metrics, optional): Collects per-endpoint request metrics; installed as a ``post_request`` hook.
+            coalesce (bool, optional): Share one request between tasks making the same read-only GET at the same time.
+            cache (ResponseCache, optional): A cache for read-only GET responses; nothing is cached by default.
+        """
+        self.headers: Dict[str, str] = {"Authorization": f"Token {api_key}"}
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.session = session
+        self._owns_session = session is None
+        self.cache = cache
+        self.retry = retry if retry is not None else RetryPolicy()
+        self.rate_limiter = rate_limiter
+        self.metrics = metrics
+        self._flights = AsyncSingleFlight() if coalesce else None
+        self._generation = 0
+        self.hooks: Dict[str, List[Callable[[RequestEvent], None]]] = {"pre_request": [], "post_request": []}
+        if metrics is not None:
+            self.add_hook("post_request", metrics)
+        if isinstance(timeout, tuple):
+            self.timeout = aiohttp.ClientTimeout(sock_connect=timeout[0], sock_read=timeout[1])
+        else:
+            self.timeout = aiohttp.ClientTimeout(total=timeout)
+
+    def add_hook(self, event: str, hook: Callable[[RequestEvent], None]) -> None:
+        """
+        Register a function called around every HTTP attempt.
+
+        Hooks are plain (non-async) callables and run inline on the event loop, so keep them short.
+
+        Parameters:
+            event (str): 'pre_request' (before sending) or 'post_request' (after a response or error).
+            hook (callable): Called with the ``RequestEvent`` for the attempt.
+        """
+        if event not in self.hooks:
+            raise ValueError(f"Unknown hook event: {event}")
+        self.hooks[event].append(hook)
+
+    async def __aenter__(self) -> "AsyncApiClient":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self.session is None or self.session.closed:
+            connector = aiohttp.TCPConnector(limit=self.limit, limit_per_host=self.limit_per_host)
+            self.session = aiohttp.ClientSession(connector=connector)
+            self._owns_session = True
+        return self.session
+
+    async def close(self) -> None:
+        """Close the underlying HTTP session if it was created by this client."""
+        if self.session is not None and self._owns_session and not self.session.closed:
+            await self.session.close()
+
+    async def _request(self, method: str, endpoint: str, data: Optional[Dict[str, Any]] = None, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Make an HTTP request to the Webshare Proxy API.
+
+        Parameters:
+            method (str): The HTTP method ('GET', 'POST', 'PATCH', 'DELETE').
+            endpoint (str): The API endpoint to call, or an absolute URL such as a list page's ``next`` link.
+            data (dict, optional): The JSON data to send with the request (for 'POST' and 'PATCH' methods).
+            params (dict, optional): Query parameters for the request.
+
+        Returns:
+            dict: The parsed JSON response from the API.
+
+        Raises:
+            ApiError: If the response status is not in the 2xx range after all retries.
+            TransportError: If no response was received after all retries.
+            ResponseParseError: If the JSON parsing fails.
+        """
+        url = endpoint if endpoint.startswith(("http://", "https://")) else self.API_BASE_URL + endpoint
+        if url.startswith(self.API_BASE_URL):
+            endpoint = url[len(self.API_BASE_URL):].split("?", 1)[0]
+
+        headers = self.headers
+        cache_key = entry = None
+        if self.cache is not None and method == "GET" and self.cache.ttl_for(endpoint) is not None:
+            cache_key = self.cache.key(url, params)
+            entry = self.cache.get(cache_key)
+            if entry is not None and entry.fresh:
+                return entry.data
+            if entry is not None and entry.revalidatable:
+                headers = dict(headers)
+                if entry.etag:
+                    headers["If-None-Match"] = entry.etag
+                if entry.last_modified:
+                    headers["If-Modified-Since"] = entry.last_modified
+
+        if method == "GET" and self._flights is not None and coalescable(endpoint):
+            key = (self._generation, ResponseCache.key(url, params))
+            return await self._flights.do(key, lambda: self._fetch(method, url, endpoint, headers, data, params, cache_key, entry))
+        return await self._fetch(method, url, endpoint, headers, data, params, cache_key, entry)
+
+    async def _fetch(self, method: str, url: str, endpoint: str, headers: Dict[str, str], data: Optional[Dict[str, Any]], params: Optional[Dict[str, Any]], cache_key: Optional[Hashable], entry: Optional[CacheEntry]) -> Dict[str, Any]:
+        try:
+            response, body = await self._send(method, url, headers, data=data, params=params)
+        finally:
+            if method != "GET":
+                # Reads that start after a write must not join a flight that started before it.
+                self._generation += 1
+        if self.cache is not None and method != "GET":
+            self.cache.invalidate_for(endpoint)
+        if entry is not None and response.status == 304:
+            self.cache.touch(cache_key)
+            return entry.data
+
+        if not body:
+            # 204 No Content and other empty bodies (e.g. DELETE, logout).
+            return {}
+        try:
+            result = json.loads(body)
+        except ValueError as e:
+            raise ResponseParseError(f"Failed to parse JSON response: {e}")
+        if cache_key is not None:
+            self.cache.set(cache_key, endpoint, result, response.headers.get("ETag"), response.headers.get("Last-Modified"))
+        return result
+
+    async def _send(self, method: str, url: str, headers: Dict[str, str], data: Optional[Dict[str, Any]] = None, params: Optional[Dict[str, Any]] = None, stream: bool = False) -> Tuple[aiohttp.ClientResponse, Optional[bytes]]:
+        """
+        Send a request, applying the rate limiter, timeout and retry policy.
+
+        Parameters:
+            method (str): The HTTP method.
+            url (str): The absolute URL.
+            headers (dict): The request headers.
+            data (dict, optional): The JSON body.
+            params (dict, optional): Query parameters.
+            stream (bool, optional): Leave the response body unread; the caller must release the response.
+
+        Returns:
+            tuple: A response with a status code below 400 and its body. With ``stream`` the body is
+                None and still to be read; otherwise the response has already been released.
+
+        Raises:
+            TransportError: If no response was received after all retries.
+            ApiError: If the final response has an error status.
+        """
+        if params:
+            params = {key: str(value) for key, value in params.items() if value is not None}
+
+        endpoint = url[len(self.API_BASE_URL):].split("?", 1)[0] if url.startswith(self.API_BASE_URL) else url
+        attempt = 0
+        while True:
+            if self.rate_limiter is not None:
+                await asyncio.sleep(self.rate_limiter.reserve())
+
+            event = None
+            if self.hooks["pre_request"] or self.hooks["post_request"]:
+                event = RequestEvent(method, url, endpoint, attempt)
+                for hook in self.hooks["pre_request"]:
+                    hook(event)
+                started = time.perf_counter()
+
+            try:
+                response = await self._get_session().request(method, url, headers=headers, json=data, params=params, timeout=self.timeout)
+                status = response.status
+                try:
+                    body = None if stream and status < 400 else await response.read()
+                except BaseException:
+                    response.release()
+                    raise
+                if body is not None:
+                    response.release()
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                if event is not None:
+                    event.elapsed, event.error = time.perf_counter() - started, e
+                    for hook in self.hooks["post_request"]:
+                        hook(event)
+                connected = not isinstance(e, (aiohttp.ClientConnectorError, aiohttp.ConnectionTimeoutError))
+                if self.retry.should_retry_error(method, connected, attempt):
+                    await asyncio.sleep(self.retry.delay(attempt))
+                    attempt += 1
+                    continue
+                error_class = RequestTimeoutError if isinstance(e, asyncio.TimeoutError) else TransportError
+                raise error_class(f"An error occurred while making the request: {e!r}") from e
+
+            if event is not None:
+                event.elapsed, event.status_code = time.perf_counter() - started, status
+                if body is not None:
+                    event.size = len(body)
+                elif response.content_length is not None:
+                    event.size = response.content_length
+                for hook in self.hooks["post_request"]:
+                    hook(event)
+
+            if status < 400:
+                return response, body
+
+            retry_after = self.retry.parse_retry_after(response.headers.get("Retry-After"))
+            retrying = self.retry.should_retry_status(method, status, attempt, retry_after)
+            deferred = retrying and status == 429 and bool(retry_after) and self.rate_limiter is not None
+            if deferred:
+                # Hold back every task sharing the limiter, not just this one.
+                self.rate_limiter.defer(retry_after)
+
+            if retrying:
+                if not deferred:
+                    await asyncio.sleep(self.retry.delay(attempt, retry_after))
+                attempt += 1
+                continue
+
+            raise error_for_status(
+                status,
+                f"An error occurred while making the request: {status} {response.reason} for url: {url}",
+                body=body.decode(errors="replace"),
+                retry_after=retry_after,
+            )
+
+    async def _paginate(self, endpoint: str, list_class: Type, params: Optional[Dict[str, Any]] = None) -> AsyncIterator[Any]:
+        """
+        Lazily follow the ``next`` links of a paginated list endpoint.
+
+        Parameters:
+            endpoint (str): The list endpoint to start from.
+            list_class (type): The list wrapper used for each page (e.g. ``ProxiesList``).
+            params (dict, optional): Query parameters for the first page.
+
+        Yields:
+            Each page wrapped in ``list_class``.
+        """
+        page = list_class(await self._request("GET", endpoint, params=params))
+        yield page
+        while page.next:
+            page = list_class(await self._request("GET", page.next))
+            yield page
+
+    async def _stream(self, endpoint: str, params: Optional[Dict[str, Any]] = None, backend: str = "auto", chunk_size: int = 65536) -> AsyncIterator[dict]:
+        """
+        Stream the ``results`` of a paginated list endpoint, decoding each page incrementally.
+
+        Parameters:
+            endpoint (str): The list endpoint to start from.
+            params (dict, optional): Query parameters for the first page.
+            backend (str, optional): The JSON backend passed to ``AsyncStreamedPage``.
+            chunk_size (int, optional): The number of bytes read from the socket at a time.
+
+        Yields:
+            dict: Each raw result as soon as it has been decoded.
+        """
+        url: Optional[str] = self.API_BASE_URL + endpoint
+        while url:
+            response, _ = await self._send("GET", url, self.headers, params=params, stream=True)
+            try:
+                page = AsyncStreamedPage(response.content.iter_chunked(chunk_size), backend=backend)
+                try:
+                    async for item in page:
+                        yield item
+                except ValueError as e:
+                    raise ResponseParseError(f"Failed to parse JSON response: {e}")
+            finally:
+                response.release()
+            url, params = page.next, None
+
+    async def create_ip(self, ip_address: str) -> IpAuthorization:
+        """
+        Create a new IP authorization entry.
+
+        Parameters:
+            ip_address (str): The IP address to authorize.
+
+        Returns:
+            IpAuthorization: The created IP authorization object.
+        """
+        data = {"ip_address": ip_address}
+        return IpAuthorization(await self._request("POST", "proxy/ipauthorization/", data=data))
+
+    async def get_ip(self) -> IpAuthorizationList:
+        """
+        Get a list of IP authorization entries.
+
+        Returns:
+            IpAuthorizationList: A list of IP authorization objects.
+        """
+        return IpAuthorizationList(await self._request("GET", "proxy/ipauthorization/"))
+
+    async def iter_ip_authorizations(self, page_size: Optional[int] = 100) -> AsyncIterator[IpAuthorization]:
+        """
+        Iterate over every IP authorization entry, fetching pages lazily.
+
+        Parameters:
+            page_size (int, optional): The number of entries fetched per request.
+
+        Yields:
+            IpAuthorization: One IP authorization object at a time.
+        """
+        async for page in self._paginate("proxy/ipauthorization/", IpAuthorizationList, params={"page_size": page_size}):
+            for ip_authorization in page.get_results():
+                yield ip_authorization
+
+    async def delete_ip(self, id: str) -> int:
+        """
+        Delete an IP authorization entry.
+
+        Parameters:
+            id (str): The ID of the IP authorization entry to delete.
+
+        Returns:
+            int: The HTTP status code (204 if successful).
+        """
+        try:
+            response, _ = await self._send("DELETE", self.API_BASE_URL + f"proxy/ipauthorization/{id}/", self.headers)
+        finally:
+            self._generation += 1
+        if self.cache is not None:
+            self.cache.invalidate_for("proxy/ipauthorization/")
+        return response.status
+
+    async def create_ips(self, ip_addresses: Iterable[str], concurrency: int = 8, skip_existing: bool = True) -> BatchReport:
+        """
+        Authorize many IP addresses concurrently.
+
+        A failure only affects its own address; the report holds one result per unique address,
+        with the created ``IpAuthorization`` as ``value`` or the exception as ``error``.
+
+        Parameters:
+            ip_addresses (iterable of str): The IP addresses to authorize.
+            concurrency (int, optional): The maximum number of requests in flight.
+            skip_existing (bool, optional): List the current entries first and skip addresses that
+                are already authorized; their result has ``skipped`` set and the existing entry as ``value``.
+
+        Returns:
+            BatchReport: The per-address results, in input order.
+        """
+        existing = [entry async for entry in self.iter_ip_authorizations()] if skip_existing else ()
+        addresses, results = plan_ip_creation(ip_addresses, existing)
+        pending = [address for address in addresses if address not in results]
+        results.update((result.item, result) for result in await run_batch_async(self.create_ip, pending, concurrency))
+        return BatchReport([results[address] for address in addresses])
+
+    async def delete_ips(self, targets: Iterable[Union[str, int, IpAuthorization]], concurrency: int = 8) -> BatchReport:
+        """
+        Remove many IP authorization entries concurrently.
+
+        Targets may be entry IDs, ``IpAuthorization`` objects or IP addresses. The current entries
+        are listed once to resolve addresses; targets that are not on the account are skipped
+        instead of sent. A failure only affects its own target.
+
+        Parameters:
+            targets (iterable): The entries to delete.
+            concurrency (int, optional): The maximum number of requests in flight.
+
+        Returns:
+            BatchReport: The per-target results, in input order; ``value`` is the HTTP status code.
+        """
+        order, ids, results = plan_ip_deletion(targets, [entry async for entry in self.iter_ip_authorizations()])
+        deleted = {result.item: result for result in await run_batch_async(self.delete_ip, list(dict.fromkeys(ids.values())), concurrency)}
+        for target, entry_id in ids.items():
+            result = deleted[entry_id]
+            results[target] = BatchResult(target, result.ok, result.value, result.error)
+        return BatchReport([results[target] for target in order])
+
+    async def get_proxy_list(self,
+                             mode: Optional[str] = "direct",
+                             country_code_in: Optional[str] = None,
+                             search: Optional[str] = None,
+                             ordering: Optional[str] = None,
+                             page: Optional[int] = None,
+                             page_size: Optional[int] = None) -> ProxiesList:
+        """
+        Get a list of proxies with optional filters.
+
+        Parameters:
+            mode (str, optional): The proxy mode ('direct', 'residential', 'datacenter').
+            country_code_in (str, optional): The country code to filter proxies by.
+            search (str, optional): The search query to filter proxies by.
+            ordering (str, optional): The ordering criteria for the proxy list.
+            page (int, optional): The page number to fetch.
+            page_size (int, optional): The number of proxies per page.
+
+        Returns:
+            ProxiesList: A list of proxy objects.
+        """
+        params: Dict[str, Union[str, int, None]] = {
+            "mode": mode,
+            "country_code__in": country_code_in,
+            "search": search,
+            "ordering": ordering,
+            "page": page,
+            "page_size": page_size,
+        }
+        return ProxiesList(await self._request("GET", "proxy/list/", params=params))
+
+    async def iter_proxies(self,
+                           mode: Optional[str] = "direct",
+                           country_code_in: Optional[str] = None,
+                           search: Optional[str] = None,
+                           ordering: Optional[str] = None,
+                           page_size: Optional[int] = 100) -> AsyncIterator[Proxy]:
+        """
+        Iterate over every proxy in the list, fetching pages lazily as they are consumed.
+
+        Parameters:
+            mode (str, optional): The proxy mode ('direct', 'residential', 'datacenter').
+            country_code_in (str, optional): The country code to filter proxies by.
+            search (str, optional): The search query to filter proxies by.
+            ordering (str, optional): The ordering criteria for the proxy list.
+            page_size (int, optional): The number of proxies fetched per request.
+
+        Yields:
+            Proxy: One proxy object at a time.
+        """
+        params: Dict[str, Union[str, int, None]] = {
+            "mode": mode,
+            "country_code__in": country_code_in,
+            "search": search,
+            "ordering": ordering,
+            "page_size": page_size,
+        }
+        async for page in self._paginate("proxy/list/", ProxiesList, params=params):
+            for proxy in page.get_results():
+                yield proxy
+
+    async def fetch_all_proxies(self,
+                                mode: Optional[str] = "direct",
+                                country_code_in: Optional[str] = None,
+                                search: Optional[str] = None,
+                                ordering: Optional[str] = None,
+                                page_size: int = 100,
+                                concurrency: int = 8,
+                                ordered: bool = True) -> AsyncIterator[Proxy]:
+        """
+        Download the full proxy list, fetching pages concurrently.
+
+        The first page is fetched on its own to learn ``count``; the remaining pages are then
+        requested in parallel with at most ``concurrency`` requests in flight.
+
+        Parameters:
+            mode (str, optional): The proxy mode ('direct', 'residential', 'datacenter').
+            country_code_in (str, optional): The country code to filter proxies by.
+            search (str, optional): The search query to filter proxies by.
+            ordering (str, optional): The ordering criteria for the proxy list.
+            page_size (int, optional): The number of proxies fetched per request.
+            concurrency (int, optional): The maximum number of pages fetched at the same time.
+            ordered (bool, optional): Yield pages in page order; when False pages are yielded as soon as they arrive.
+
+        Yields:
+            Proxy: One proxy object at a time.
+        """
+        filters = {
+            "mode": mode,
+            "country_code_in": country_code_in,
+            "search": search,
+            "ordering": ordering,
+        }
+        first = await self.get_proxy_list(page=1, page_size=page_size, **filters)
+        results = first.get_results()
+        for proxy in results:
+            yield proxy
+        if not first.next or not results:
+            return
+
+        # The server may cap page_size, so derive the page count from what it actually returned.
+        pages = iter(range(2, math.ceil(first.count / len(results)) + 1))
+
+        def fetch(page: int) -> asyncio.Task:
+            return asyncio.ensure_future(self.get_proxy_list(page=page, page_size=page_size, **filters))
+
+        pending = deque(fetch(page) for page in islice(pages, concurrency))
+        try:
+            while pending:
+                if ordered:
+                    done = [pending.popleft()]
+                else:
+                    finished, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    done = [task for task in pending if task in finished]
+                    for task in done:
+                        pending.remove(task)
+
+                for task in done:
+                    page_list = await task
+                    for page in pages:
+                        pending.append(fetch(page))
+                        break
+                    for proxy in page_list.get_results():
+                        yield proxy
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def stream_proxies(self,
+                             mode: Optional[str] = "direct",
+                             country_code_in: Optional[str] = None,
+                             search: Optional[str] = None,
+                             ordering: Optional[str] = None,
+                             page_size: Optional[int] = 1000,
+                             backend: str = "auto") -> AsyncIterator[Proxy]:
+        """
+        Iterate over every proxy, decoding each page as its bytes arrive.
+
+        Unlike ``iter_proxies`` a page is never parsed into one large dict first, so the first proxy
+        is available before the page has finished downloading. Responses are not cached.
+
+        Parameters:
+            mode (str, optional): The proxy mode ('direct', 'residential', 'datacenter').
+            country_code_in (str, optional): The country code to filter proxies by.
+            search (str, optional): The search query to filter proxies by.
+            ordering (str, optional): The ordering criteria for the proxy list.
+            page_size (int, optional): The number of proxies fetched per request.
+            backend (str, optional): ``"ijson"``, ``"json"`` or ``"auto"`` to use ijson when it is installed.
+
+        Yields:
+            Proxy: One proxy object at a time.
+        """
+        params: Dict[str, Union[str, int, None]] = {
+            "mode": mode,
+            "country_code__in": country_code_in,
+            "search": search,
+            "ordering": ordering,
+            "page_size": page_size,
+        }
+        async for item in self._stream("proxy/list/", params=params, backend=backend):
+            yield Proxy(item)
+
+    async def download_proxy_list(self,
+                                  mode: str = "direct",
+                                  country_code_in: Optional[str] = None,
+                                  search: Optional[str] = None,
+                                  authentication: str = "username",
+                                  token: Optional[str] = None,
+                                  chunk_size: int = 65536) -> AsyncIterator[Proxy]:
+        """
+        Download the proxy list as a plain-text export and stream it line by line.
+
+        The records only carry the connection fields and an ID derived from ``address:port:username``;
+        use ``get_proxy_list`` when the API's IDs, validity or locations are needed.
+
+        Parameters:
+            mode (str, optional): The endpoint mode ('direct' or 'backbone').
+            country_code_in (str, optional): Comma-separated country codes to filter proxies by.
+            search (str, optional): The search query to filter proxies by.
+            authentication (str, optional): 'username' to include credentials, or 'sourceip' for IP authorization.
+            token (str, optional): The download token; fetched from ``get_proxy_config`` when omitted.
+            chunk_size (int, optional): The number of bytes read from the socket at a time.
+
+        Yields:
+            Proxy: One proxy object per line.
+        """
+        if token is None:
+            token = (await self.get_proxy_config()).proxy_list_download_token
+        countries = "-".join(code.strip() for code in country_code_in.split(",")) if country_code_in else "-"
+        url = f"{self.API_BASE_URL}proxy/list/download/{token}/{countries}/any/{authentication}/{mode}/{quote(search, safe='') if search else '-'}/"
+
+        response, _ = await self._send("GET", url, {}, stream=True)
+        try:
+            pending = b""
+            async for chunk in response.content.iter_chunked(chunk_size):
+                lines = (pending + chunk).split(b"\n")
+                pending = lines.pop()
+                for line in lines:
+                    proxy = parse_proxy_line(line.decode())
+                    if proxy is not None:
+                        yield proxy
+            proxy = parse_proxy_line(pending.decode())
+            if proxy is not None:
+                yield proxy
+        finally:
+            response.release()
+
+    async def change_password(self, password: str, new_password: str) -> None:
+        """
+        Change the user's password.
+
+        Parameters:
+            password (str): The current password.
+            new_password (str): The new password.
+        """
+        data = {
+            "password": password,
+            "new_password": new_password,
+        }
+        await self._request("POST", "changepassword/", data=data)
+
+    async def change_email(self, new_email: str, password: str) -> None:
+        """
+        Change the user's email.
+
+        Parameters:
+            new_email (str): The new email address.
+            password (str): The current password.
+        """
+        data = {
+            "password": password,
+            "new_email": new_email,
+        }
+        await self._request("POST", "changeemail/", data=data)
+
+    async def change_email_complete(self, confirmation_code: str) -> None:
+        """
+        Complete the email change process.
+
+        Parameters:
+            confirmation_code (str): The confirmation code received after email change request.
+        """
+        data = {
+            "confirmation_code": confirmation_code
+        }
+        await self._request("POST", "changeemail/complete/", data=data)
+
+    async def get_activation_status(self) -> Activation:
+        """
+        Get the activation status of the user account.
+
+        Returns:
+            Activation: The activation status object.
+        """
+        return Activation(await self._request("GET", "activation/"))
+
+    async def resend_activation_email(self) -> Activation:
+        """
+        Resend the activation email.
+
+        Returns:
+            Activation: The activation status object after resending the email.
+        """
+        return Activation(await self._request("POST", "activation/resend/"))
+
+    async def complete_activation(self, activation_token: str) -> str:
+        """
+        Complete the user account activation process.
+
+        Parameters:
+            activation_token (str): The activation token received via email.
+
+        Returns:
+            str: The token for the activated user.
+        """
+        data = {
+            "activation_token": activation_token
+        }
+        response = await self._request("POST", "activation/complete/", data=data)
+        return response.get("token")
+
+    async def logout(self) -> None:
+        """Logout the user."""
+        await self._request("GET", "logout/")
+
+    async def get_profile(self) -> UserProfile:
+        """
+        Get the user's profile information.
+
+        Returns:
+            UserProfile: The user's profile information.
+        """
+        return UserProfile(await self._request("GET", "profile/"))
+
+    async def update_profile(self, id: int = None, email: str = None, first_name: str = None, last_name: str = None, created_at: str = None, last_login: str = None, timezone: str = None, subscribed_bandwidth_usage_notifications: bool = None, subscribed_subscription_notifications: bool = None, subscribed_proxy_usage_statistics: bool = None, subscribed_usage_warnings: bool = None, subscribed_guides_and_tips: bool = None, subscribed_survey_emails: bool = None, tracking_id: str = None, helpscout_beacon_signature: str = None, announce_kit_user_token: str = None) -> UserProfile:
+        """
+        Update the user's profile information.
+
+        Parameters:
+            id (int, optional): The user's ID.
+            email (str, optional): The user's email address.
+            first_name (str, optional): The user's first name.
+            last_name (str, optional): The user's last name.
+            created_at (str, optional): The user's account creation date.
+            last_login (str, optional): The user's last login date.
+            timezone (str, optional): The user's timezone.
+            subscribed_bandwidth_usage_notifications (bool, optional): Subscription status for bandwidth usage notifications.
+            subscribed_subscription_notifications (bool, optional): Subscription status for subscription notifications.
+            subscribed_proxy_usage_statistics (bool, optional): Subscription status for proxy usage statistics.
+            subscribed_usage_warnings (bool, optional): Subscription status for usage warnings.
+            subscribed_guides_and_tips (bool, optional): Subscription status for guides and tips.
+            subscribed_survey_emails (bool, optional): Subscription status for survey emails.
+            tracking_id (str, optional): The user's tracking ID.
+            helpscout_beacon_signature (str, optional): The user's HelpScout beacon signature.
+            announce_kit_user_token (str, optional): The user's Announce Kit user token.
+
+        Returns:
+            UserProfile: The updated user's profile information.
+        """
+        json_data = {
+            "id": id,
+            "email": email,
+            "first_name": first_name,
+            "last_name": last_name,
+            "created_at": created_at,
+            "last_login": last_login,
+            "timezone": timezone,
+            "subscribed_bandwidth_usage_notifications": subscribed_bandwidth_usage_notifications,
+            "subscribed_subscription_notifications": subscribed_subscription_notifications,
+            "subscribed_proxy_usage_statistics": subscribed_proxy_usage_statistics,
+            "subscribed_usage_warnings": subscribed_usage_warnings,
+            "subscribed_guides_and_tips": subscribed_guides_and_tips,
+            "subscribed_survey_emails": subscribed_survey_emails,
+            "tracking_id": tracking_id,
+            "helpscout_beacon_signature": helpscout_beacon_signature,
+            "announce_kit_user_token": announce_kit_user_token,
+        }
+        return UserProfile(await self._request("PATCH", "profile/", data=json_data))
+
+    async def notifications(self) -> NotificationsList:
+        """
+        Get a list of notifications.
+
+        Returns:
+            NotificationsList: A list of notification objects.
+        """
+        return NotificationsList(await self._request("GET", "notification/"))
+
+    async def iter_notifications(self, page_size: Optional[int] = 100) -> AsyncIterator[Notification]:
+        """
+        Iterate over every notification, fetching pages lazily.
+
+        Parameters:
+            page_size (int, optional): The number of notifications fetched per request.
+
+        Yields:
+            Notification: One notification object at a time.
+        """
+        async for page in self._paginate("notification/", NotificationsList, params={"page_size": page_size}):
+            for notification in page.get_results():
+                yield notification
+
+    async def get_notification(self, id: str) -> Notification:
+        """
+        Get a notification by its ID.
+
+        Parameters:
+            id (str): The ID of the notification.
+
+        Returns:
+            Notification: The notification object.
+        """
+        return Notification(await self._request("GET", f"notification/{id}/"))
+
+    async def dismiss_notification(self, id: str) -> Notification:
+        """
+        Dismiss a notification.
+
+        Parameters:
+            id (str): The ID of the notification to dismiss.
+
+        Returns:
+            Notification: The dismissed notification object.
+        """
+        return Notification(await self._request("GET", f"notification/{id}/dismiss/"))
+
+    async def restore_notification(self, id: str) -> Notification:
+        """
+        Restore a previously dismissed notification.
+
+        Parameters:
+            id (str): The ID of the notification to restore.
+
+        Returns:
+            Notification: The restored notification object.
+        """
+        return Notification(await self._request("GET", f"notification/{id}/restore/"))
+
+    async def refresh(self) -> None:
+        """Refresh the proxy list."""
+        await self._request("POST", "proxy/list/refresh/")
+
+    async def proxy_replacement(self, ordering: str = None, state: str = None, dry_run: bool = None) -> ProxyReplacementList:
+        """
+        Replace proxies with optional filters.
+
+        Parameters:
+            ordering (str, optional): The ordering criteria for the proxy replacement.
+            state (str, optional): The state of the proxy replacement.
+            dry_run (bool, optional): Whether to perform a dry run.
+
+        Returns:
+            ProxyReplacementList: A list of proxy replacement objects.
+        """
+        params = {}
+        if ordering:
+            params["ordering"] = ordering
+
+        if state:
+            params["state"] = state
+
+        if dry_run:
+            params["dry_run"] = dry_run
+
+        return ProxyReplacementList(await self._request("POST", "proxy/replace/", params=params))
+
+    async def get_proxy_replacement(self, id: str) -> ProxyReplacement:
+        """
+        Get a proxy replacement by its ID.
+
+        Parameters:
+            id (str): The ID of the proxy replacement.
+
+        Returns:
+            ProxyReplacement: The proxy replacement object.
+        """
+        return ProxyReplacement(await self._request("POST", f"proxy/replace/{id}/"))
+
+    async def create_proxy_replacement(self, to_replace: dict = None, replace_with: list = None, dry_run: bool = None) -> ProxyReplacement:
+        """
+        Create a new proxy replacement.
+
+        Parameters:
+            to_replace (dict, optional): A dictionary of proxies to replace.
+            replace_with (list, optional): A list of proxies to replace with.
+            dry_run (bool, optional): Whether to perform a dry run.
+
+        Returns:
+            ProxyReplacement: The created proxy replacement object.
+        """
+        json_data = {}
+        if to_replace:
+            json_data["to_replace"] = to_replace
+
+        if replace_with:
+            json_data["replace_with"] = replace_with
+
+        if dry_run:
+            json_data["dry_run"] = dry_run
+
+        return ProxyReplacement(await self._request("POST", "proxy/replace/", data=json_data))
+
+    async def get_replaced_proxy(self, proxy_list_replacement: int = None) -> ProxyReplacementList:
+        """
+        Get a list of replaced proxies.
+
+        Parameters:
+            proxy_list_replacement (int, optional): The ID of the proxy list replacement.
+
+        Returns:
+            ProxyReplacementList: A list of replaced proxy objects.
+        """
+        params = {}
+        if proxy_list_replacement:
+            params["proxy_list_replacement"] = proxy_list_replacement
+
+        return ProxyReplacementList(await self._request("GET", "proxy/list/replaced/", params=params))
+
+    async def iter_replaced_proxies(self, proxy_list_replacement: int = None, page_size: Optional[int] = 100) -> AsyncIterator[ProxyReplacement]:
+        """
+        Iterate over every replaced proxy, fetching pages lazily.
+
+        Parameters:
+            proxy_list_replacement (int, optional): The ID of the proxy list replacement.
+            page_size (int, optional): The number of entries fetched per request.
+
+        Yields:
+            ProxyReplacement: One replaced proxy object at a time.
+        """
+        params = {"page_size": page_size}
+        if proxy_list_replacement:
+            params["proxy_list_replacement"] = proxy_list_replacement
+
+        async for page in self._paginate("proxy/list/replaced/", ProxyReplacementList, params=params):
+            for replacement in page.get_results():
+                yield replacement
+
+    async def stream_replaced_proxies(self, proxy_list_replacement: int = None, page_size: Optional[int] = 1000, backend: str = "auto") -> AsyncIterator[ProxyReplacement]:
+        """
+        Iterate over every replaced proxy, decoding each page as its bytes arrive.
+
+        Parameters:
+            proxy_list_replacement (int, optional): The ID of the proxy list replacement.
+            page_size (int, optional): The number of entries fetched per request.
+            backend (str, optional): ``"ijson"``, ``"json"`` or ``"auto"`` to use ijson when it is installed.
+
+        Yields:
+            ProxyReplacement: One replaced proxy object at a time.
+        """
+        params = {"page_size": page_size}
+        if proxy_list_replacement:
+            params["proxy_list_replacement"] = proxy_list_replacement
+
+        async for item in self._stream("proxy/list/replaced/", params=params, backend=backend):
+            yield ProxyReplacement(item)
+
+    async def get_proxy_config(self) -> ProxyConfig:
+        """
+        Get the proxy configuration.
+
+        Returns:
+            ProxyConfig: The proxy configuration object.
+        """
+        return ProxyConfig(await self._request("GET", "proxy/config/"))
+
+    async def update_proxy_config(self, new_username: str) -> ProxyConfig:
+        """
+        Update the proxy configuration with a new username.
+
+        Parameters:
+            new_username (str): The new username to set.
+
+        Returns:
+            ProxyConfig: The updated proxy configuration object.
+        """
+        data = {
+            "username": new_username
+        }
+        return ProxyConfig(await self._request("PATCH", "proxy/config/", data=data))
+
+    async def reset_download_token(self) -> ProxyConfig:
+        """
+        Reset the download token.
+
+        Returns:
+            ProxyConfig: The updated proxy configuration object.
+        """
+        return ProxyConfig(await self._request("POST", "proxy/config/reset_download_token/"))
+
+    async def allocate_unallocated_countries(self, **countries) -> ProxyConfig:
+        """
+        Allocate unallocated countries.
+
+        Parameters:
+            **countries (dict): A dictionary of country codes and allocation values.
+
+        Returns:
+            ProxyConfig: The updated proxy configuration object.
+        """
+        data = {
+            "new_countries": countries
+        }
+        return ProxyConfig(await self._request("POST", "proxy/config/allocate_unallocated_countries/", data=data))
+
+    async def get_my_ip(self) -> str:
+        """
+        Get the user's IP address.
+
+        Returns:
+            str: The user's IP address.
+        """
+        response = await self._request("GET", "proxy/ipauthorization/whatsmyip/")
+        return response.get("ip_address")
+
+    async def create_api_key(self, label_name: str) -> ApiKey:
+        """
+        Create a new API key.
+
+        Parameters:
+            label_name (str): The label name for the new API key.
+
+        Returns:
+            ApiKey: The created API key object.
+        """
+        data = {
+            "label": label_name
+        }
+        return ApiKey(await self._request("POST", "apikey/", data=data))
+
+    async def update_api_key(self, id: str, label_name: str) -> ApiKey:
+        """
+        Update an existing API key.
+
+        Parameters:
+            id (str): The ID of the API key to update.
+            label_name (str): The new label name for the API key.
+
+        Returns:
+            ApiKey: The updated API key object.
+        """
+        data = {
+            "label": label_name
+        }
+        return ApiKey(await self._request("PATCH", f"apikey/{id}/", data=data))
+
+    async def get_api_key(self, id: str) -> ApiKey:
+        """
+        Get an API key by its ID.
+
+        Parameters:
+            id (str): The ID of the API key.
+
+        Returns:
+            ApiKey: The API key object.
+        """
+        return ApiKey(await self._request("GET", f"apikey/{id}/"))
+
+    async def api_keys(self) -> ApiKeyList:
+        """
+        Get a list of API keys.
+
+        Returns:
+            ApiKeyList: A list of API key objects.
+        """
+        return ApiKeyList(await self._request("GET", "apikey/"))
+
+    async def iter_api_keys(self, page_size: Optional[int] = 100) -> AsyncIterator[ApiKey]:
+        """
+        Iterate over every API key, fetching pages lazily.
+
+        Parameters:
+            page_size (int, optional): The number of API keys fetched per request.
+
+        Yields:
+            ApiKey: One API key object at a time.
+        """
+        async for page in self._paginate("apikey/", ApiKeyList, params={"page_size": page_size}):
+            for api_key in page.get_results():
+                yield api_key
+
+
+class AsyncProxyRouter:
+    """
+    Send aiohttp requests through proxies from a rotation, the asyncio counterpart of ``ProxyRoutingAdapter``.
+
+    Each proxy's URL, credentials included, is built once when the proxies are set. A request that cannot
+    reach its proxy is retried through a different one, up to ``max_failover`` times, and a sticky
+    key is then pinned to the proxy that worked. The time to each response's headers is reported to
+    ``rotator.record``, as a success or not according to ``is_success``.
+
+    Parameters:
+        proxies (iterable of Proxy, optional): The proxies to route through.
+        strategy (RotationStrategy, optional): The selection strategy; ``StickyStrategy()`` by default.
+        max_failover (int, optional): How many other proxies to try after the first one fails.
+        is_success (callable, optional): Classifies a response status code as a success of the proxy.
+    """
+
+    def __init__(self, proxies: Iterable[Proxy] = (), strategy: Optional[RotationStrategy] = None, max_failover: int = 2, is_success: Callable[[int], bool] = is_success) -> None:
+        if max_failover < 0:
+            raise ValueError("max_failover must not be negative")
+        self.strategy = strategy or StickyStrategy()
+        self.max_failover = max_failover
+        self.is_success = is_success
+        self.failovers = 0
+        # The rotator and the proxy URLs by ID, swapped together so a request always sees a matching pair.
+        self._routes: Tuple[ProxyRotator, Dict[str, URL]] = (ProxyRotator(strategy=self.strategy), {})
+        self.update(proxies)
+
+    @classmethod
+    def from_list(cls, proxies_list: ProxiesList, **kwargs: Any) -> "AsyncProxyRouter":
+        """
+        Build a router from a ``get_proxy_list`` page.
+
+        Parameters:
+            proxies_list (ProxiesList): The proxies to route through.
+            **kwargs: Passed to the constructor.
+
+        Returns:
+            AsyncProxyRouter: The new router.
+        """
+        return cls(proxies_list.get_results(), **kwargs)
+
+    def update(self, proxies: Iterable[Proxy]) -> None:
+        """
+        Replace the proxies being routed through.
+
+        Parameters:
+            proxies (iterable of Proxy): The new proxies.
+        """
+        proxies = tuple(proxies)
+        targets = {proxy.id: self._target(proxy) for proxy in proxies}
+        self._routes = (ProxyRotator(proxies, strategy=self.strategy), targets)
+
+    @property
+    def rotator(self) -> ProxyRotator:
+        return self._routes[0]
+
+    @staticmethod
+    def _target(proxy: Proxy) -> URL:
+        return URL.build(scheme="http", user=proxy.username or None, password=proxy.password if proxy.username else None, host=proxy.proxy_address, port=proxy.port)
+
+    async def request(self, session: aiohttp.ClientSession, method: str, url: str, key: Optional[str] = None, **kwargs: Any) -> aiohttp.ClientResponse:
+        """
+        Send a request through a proxy, failing over to another proxy if it cannot be reached.
+
+        The caller owns the response and must read or release it, e.g. ``async with await router.request(...) as response``.
+
+        Parameters:
+            session (aiohttp.ClientSession): The session to send the request with.
+            method (str): The HTTP method.
+            url (str): The target URL.
+            key (str, optional): The sticky key; requests with the same key keep using the same proxy.
+            **kwargs: Passed to ``session.request``.
+
+        Returns:
+            aiohttp.ClientResponse: The response.
+
+        Raises:
+            ValueError: If there are no proxies.
+            aiohttp.ClientError: If the last proxy tried could not be reached, or the request failed after reaching it.
+        """
+        rotator, targets = self._routes
+        tried = set()
+        for attempt in range(self.max_failover + 1):
+            proxy = rotator.get(key, exclude=tried)
+            tried.add(proxy)
+            if attempt:
+                self.failovers += 1
+            # A sticky assignment made by a concurrent request after an update may not be in this map yet.
+            proxy_url = targets.get(proxy.id) or self._target(proxy)
+            last = attempt == self.max_failover or len(tried) == len(rotator)
+            started = time.perf_counter()
+            try:
+                response = await session.request(method, url, proxy=proxy_url, **kwargs)
+            except (aiohttp.ClientProxyConnectionError, aiohttp.ClientHttpProxyError, aiohttp.ConnectionTimeoutError):
+                rotator.record(proxy, ok=False, key=key)
+                if last:
+                    raise
+                continue
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                # The request may have reached the target, so it is not retried, but the proxy still failed it.
+                rotator.record(proxy, ok=False, key=key)
+                raise
+            if response.status == 407:
+                rotator.record(proxy, ok=False, key=key)
+                if not last:
+                    response.release()
+                    continue
+            else:
+                rotator.record(proxy, time.perf_counter() - started, self.is_success(response.status), key)
+            if attempt and key is not None:
+                assign = getattr(self.strategy, "assign", None)
+                if assign is not None:
+                    assign(key, proxy)
+            return response
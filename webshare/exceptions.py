@@ -0,0 +1,80 @@
+from typing import Optional
+
+class WebshareError(ValueError):
+    """
+    Base class for every error raised by the client.
+
+    It subclasses ``ValueError`` because that is what the client has always raised, so existing
+    ``except ValueError`` handlers keep working.
+    """
+
+
+class TransportError(WebshareError):
+    """The request never got an HTTP response (connection refused, reset, DNS failure, ...)."""
+
+
+class RequestTimeoutError(TransportError):
+    """The connect or read timeout expired."""
+
+
+class ResponseParseError(WebshareError):
+    """The response body was not valid JSON."""
+
+
+class ApiError(WebshareError):
+    """The API answered with a non-2xx status code."""
+
+    def __init__(self, message: str, status_code: int, body: Optional[str] = None) -> None:
+        super().__init__(message)
+        self.status_code = status_code
+        self.body = body
+
+
+class ClientError(ApiError):
+    """A 4xx response."""
+
+
+class AuthenticationError(ClientError):
+    """A 401 or 403 response: the API key is missing, invalid or lacks permission."""
+
+
+class NotFoundError(ClientError):
+    """A 404 response."""
+
+
+class RateLimitError(ClientError):
+    """A 429 response; ``retry_after`` holds the server's requested delay in seconds, if any."""
+
+    def __init__(self, message: str, status_code: int, body: Optional[str] = None, retry_after: Optional[float] = None) -> None:
+        super().__init__(message, status_code, body)
+        self.retry_after = retry_after
+
+
+class ServerError(ApiError):
+    """A 5xx response."""
+
+
+def error_for_status(status_code: int, message: str, body: Optional[str] = None, retry_after: Optional[float] = None) -> ApiError:
+    """
+    Build the exception matching an HTTP error status.
+
+    Parameters:
+        status_code (int): The HTTP status code.
+        message (str): The error message.
+        body (str, optional): The response body.
+        retry_after (float, optional): The parsed ``Retry-After`` header.
+
+    Returns:
+        ApiError: The exception to raise.
+    """
+    if status_code == 429:
+        return RateLimitError(message, status_code, body, retry_after)
+    if status_code in (401, 403):
+        return AuthenticationError(message, status_code, body)
+    if status_code == 404:
+        return NotFoundError(message, status_code, body)
+    if 400 <= status_code < 500:
+        return ClientError(message, status_code, body)
+    if status_code >= 500:
+        return ServerError(message, status_code, body)
+    return ApiError(message, status_code, body)
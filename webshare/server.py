@@ -0,0 +1,631 @@
+import os
+import sys
+import time
+import base64
+import asyncio
+import argparse
+import binascii
+from collections import deque
+
+from .webshare import ApiClient
+from .util.objects import Proxy
+from .util.breaker import BreakerRegistry, CircuitBreakerStrategy
+from .util.hashring import ConsistentHashStrategy
+from .util.rotation import ProxyRotator, RotationStrategy, RoundRobinStrategy, WeightedRandomStrategy, LeastRecentlyUsedStrategy, StickyStrategy, LatencyAwareStrategy, is_success
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Set, Tuple
+
+Headers = List[Tuple[str, str]]
+Connection = Tuple[asyncio.StreamReader, asyncio.StreamWriter]
+
+# Headers that describe one hop and must not be forwarded.
+_HOP_BY_HOP = frozenset(("connection", "keep-alive", "proxy-connection", "proxy-authorization", "proxy-authenticate"))
+_MAX_HEAD = 65536
+# Upstream answers to CONNECT after which another proxy is worth trying.
+_FAILOVER_STATUSES = frozenset(("407", "502", "503", "504"))
+
+STRATEGIES = {
+    "round-robin": RoundRobinStrategy,
+    "random": WeightedRandomStrategy,
+    "least-recently-used": LeastRecentlyUsedStrategy,
+    "sticky": StickyStrategy,
+    "latency": LatencyAwareStrategy,
+    "consistent-hash": ConsistentHashStrategy,
+}
+
+
+class RotatingProxyServer:
+    """
+    A local HTTP forward proxy that sends every request through a rotating Webshare proxy.
+
+    Clients use it like any HTTP proxy: ``CONNECT`` tunnels (HTTPS and anything else) and
+    absolute-form HTTP requests are both supported. Each tunnel or request goes through a proxy
+    chosen by a ``ProxyRotator``; if the upstream cannot be reached, or refuses the tunnel, another
+    proxy is tried. Connections to upstream proxies used for plain HTTP are kept alive and reused.
+
+    A client can pin its traffic to one upstream by sending a username in its own
+    ``Proxy-Authorization`` header (e.g. ``http://session-42:x@127.0.0.1:8899``); the username is
+    passed to the rotator as the session key, which the ``sticky`` strategy uses.
+
+    Each upstream's outcome is reported to ``rotator.record``; ``is_success`` decides whether a
+    response status counts as a success, and by default target blocks such as 403 and 429 do not.
+
+    Parameters:
+        proxies (iterable of Proxy, optional): The upstream proxies.
+        host (str, optional): The address to listen on.
+        port (int, optional): The port to listen on; 0 picks a free port.
+        strategy (RotationStrategy, optional): How upstreams are chosen; round-robin by default.
+        connect_timeout (float, optional): Seconds allowed for connecting to an upstream and for its CONNECT answer.
+        idle_timeout (float, optional): Seconds a connection may stay idle before it is closed.
+        max_failover (int, optional): How many other upstreams to try after the first one fails.
+        max_idle_per_upstream (int, optional): The number of idle keep-alive connections kept per upstream.
+        buffer_size (int, optional): The number of bytes copied at a time.
+        is_success (callable, optional): Classifies a response status code as a success of the upstream.
+    """
+
+    def __init__(self,
+                 proxies: Iterable[Proxy] = (),
+                 host: str = "127.0.0.1",
+                 port: int = 8899,
+                 strategy: Optional[RotationStrategy] = None,
+                 connect_timeout: float = 10.0,
+                 idle_timeout: float = 60.0,
+                 max_failover: int = 3,
+                 max_idle_per_upstream: int = 8,
+                 buffer_size: int = 65536,
+                 is_success: Callable[[int], bool] = is_success) -> None:
+        self.rotator = ProxyRotator(proxies, strategy)
+        self.host = host
+        self.port = port
+        self.connect_timeout = connect_timeout
+        self.idle_timeout = idle_timeout
+        self.max_failover = max_failover
+        self.max_idle_per_upstream = max_idle_per_upstream
+        self.buffer_size = buffer_size
+        self.is_success = is_success
+        self.stats: Dict[str, int] = {
+            "connections": 0,
+            "active": 0,
+            "tunnels": 0,
+            "requests": 0,
+            "upstream_connects": 0,
+            "upstream_reused": 0,
+            "failovers": 0,
+            "errors": 0,
+        }
+        self._idle: Dict[Tuple[str, int, Optional[str]], Deque[Connection]] = {}
+        self._clients: Set[asyncio.StreamWriter] = set()
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    @classmethod
+    def from_client(cls,
+                    client: ApiClient,
+                    mode: Optional[str] = "direct",
+                    country_code_in: Optional[str] = None,
+                    search: Optional[str] = None,
+                    **kwargs: Any) -> "RotatingProxyServer":
+        """
+        Build a server from the account's proxy list, skipping proxies marked invalid.
+
+        Parameters:
+            client (ApiClient): The client used to fetch the list.
+            mode (str, optional): The proxy mode ('direct', 'residential', 'datacenter').
+            country_code_in (str, optional): The country code to filter proxies by.
+            search (str, optional): The search query to filter proxies by.
+            **kwargs: Passed to the constructor.
+
+        Returns:
+            RotatingProxyServer: The new server, not yet started.
+        """
+        return cls(fetch_proxies(client, mode, country_code_in, search), **kwargs)
+
+    def update(self, proxies: Iterable[Proxy]) -> None:
+        """
+        Swap in a new set of upstream proxies; connections in progress are not interrupted.
+
+        Parameters:
+            proxies (iterable of Proxy): The new upstreams.
+        """
+        self.rotator.update(proxies)
+        current = {_upstream_key(proxy) for proxy in self.rotator.proxies}
+        for upstream in [upstream for upstream in self._idle if upstream not in current]:
+            for _, writer in self._idle.pop(upstream):
+                writer.close()
+
+    async def start(self) -> "RotatingProxyServer":
+        """Start listening; with ``port=0`` the chosen port is stored in ``port``."""
+        self._server = await asyncio.start_server(self._handle_client, self.host, self.port, limit=_MAX_HEAD, backlog=4096)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def serve_forever(self) -> None:
+        if self._server is None:
+            await self.start()
+        await self._server.serve_forever()
+
+    async def close(self) -> None:
+        """Stop listening and close every client and pooled upstream connection."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        for writer in list(self._clients):
+            writer.close()
+        for connections in self._idle.values():
+            for _, writer in connections:
+                writer.close()
+        self._idle.clear()
+
+    async def __aenter__(self) -> "RotatingProxyServer":
+        return await self.start()
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    def _choose(self, key: Optional[str], tried: Set[Tuple[str, int, Optional[str]]]) -> Optional[Proxy]:
+        # Upstreams that already failed are excluded, so the rotator picks another at random and a
+        # circuit breaker only claims a probe for the upstream really used.
+        exclude = {proxy for proxy in self.rotator.proxies if _upstream_key(proxy) in tried} if tried else None
+        try:
+            return self.rotator.get(key, exclude)
+        except ValueError:
+            return None
+
+    async def _connect(self, proxy: Proxy) -> Connection:
+        connection = await asyncio.wait_for(asyncio.open_connection(proxy.proxy_address, proxy.port, limit=_MAX_HEAD), self.connect_timeout)
+        self.stats["upstream_connects"] += 1
+        return connection
+
+    def _checkout(self, proxy: Proxy) -> Optional[Connection]:
+        idle = self._idle.get(_upstream_key(proxy))
+        while idle:
+            reader, writer = idle.pop()
+            if not reader.at_eof() and not writer.is_closing():
+                self.stats["upstream_reused"] += 1
+                return reader, writer
+            writer.close()
+        return None
+
+    def _checkin(self, proxy: Proxy, connection: Connection) -> None:
+        idle = self._idle.setdefault(_upstream_key(proxy), deque())
+        if len(idle) >= self.max_idle_per_upstream:
+            idle.popleft()[1].close()
+        idle.append(connection)
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.stats["connections"] += 1
+        self.stats["active"] += 1
+        self._clients.add(writer)
+        try:
+            while True:
+                head = await asyncio.wait_for(_read_head(reader), self.idle_timeout)
+                if head is None:
+                    break
+                start_line, headers = head
+                parts = start_line.split(" ")
+                if len(parts) != 3:
+                    await _reply(writer, 400, "Bad Request")
+                    break
+
+                method, target, version = parts
+                key = _session_key(headers)
+                if method.upper() == "CONNECT":
+                    await self._tunnel(reader, writer, target, key)
+                    break
+                if not await self._forward(reader, writer, method, target, version, headers, key):
+                    break
+        except (OSError, ValueError, asyncio.TimeoutError, asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+            self.stats["errors"] += 1
+        finally:
+            self.stats["active"] -= 1
+            self._clients.discard(writer)
+            writer.close()
+
+    async def _tunnel(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, target: str, key: Optional[str]) -> None:
+        tried: Set[Tuple[str, int, Optional[str]]] = set()
+        for attempt in range(self.max_failover + 1):
+            proxy = self._choose(key, tried)
+            if proxy is None:
+                break
+            tried.add(_upstream_key(proxy))
+            if attempt:
+                self.stats["failovers"] += 1
+
+            upstream_writer = None
+            started = time.perf_counter()
+            try:
+                upstream_reader, upstream_writer = await self._connect(proxy)
+                request = f"CONNECT {target} HTTP/1.1\r\nHost: {target}\r\n{_proxy_authorization(proxy)}\r\n"
+                upstream_writer.write(request.encode("latin-1"))
+                head = await asyncio.wait_for(_read_head(upstream_reader), self.connect_timeout)
+            except (OSError, ValueError, asyncio.TimeoutError, asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+                self.rotator.record(proxy, ok=False, key=key)
+                if upstream_writer is not None:
+                    upstream_writer.close()
+                continue
+            if head is None:
+                self.rotator.record(proxy, ok=False, key=key)
+                upstream_writer.close()
+                continue
+
+            status = head[0].split(" ", 2)[1:2]
+            if status != ["200"]:
+                upstream_writer.close()
+                if status and status[0] in _FAILOVER_STATUSES:
+                    self.rotator.record(proxy, ok=False, key=key)
+                    continue
+                await _reply(writer, 502, "Bad Gateway")
+                return
+
+            self.rotator.record(proxy, time.perf_counter() - started, key=key)
+            self.stats["tunnels"] += 1
+            writer.write(b"HTTP/1.1 200 Connection Established\r\n\r\n")
+            activity = [time.monotonic()]
+            try:
+                await asyncio.gather(self._pipe(reader, upstream_writer, activity), self._pipe(upstream_reader, writer, activity))
+            finally:
+                upstream_writer.close()
+            return
+
+        await _reply(writer, 502, "Bad Gateway")
+
+    async def _pipe(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, activity: List[float]) -> None:
+        """Copy one direction of a tunnel. ``activity`` holds the last time either direction moved data, so a
+        tunnel is only closed when both directions have been idle, not during a long one-way download."""
+        try:
+            while True:
+                try:
+                    data = await asyncio.wait_for(reader.read(self.buffer_size), activity[0] + self.idle_timeout - time.monotonic())
+                except asyncio.TimeoutError:
+                    if time.monotonic() - activity[0] < self.idle_timeout:
+                        continue
+                    raise
+                if not data:
+                    break
+                writer.write(data)
+                await writer.drain()
+                activity[0] = time.monotonic()
+        except (OSError, asyncio.TimeoutError):
+            writer.close()
+            return
+        # Pass the half-close on so the other side sees EOF but can still answer.
+        if writer.can_write_eof() and not writer.is_closing():
+            try:
+                writer.write_eof()
+            except OSError:
+                pass
+
+    async def _forward(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, method: str, target: str, version: str, headers: Headers, key: Optional[str]) -> bool:
+        """Forward one absolute-form HTTP request; returns whether the client connection can be reused."""
+        if not target.lower().startswith("http://"):
+            await _reply(writer, 400, "Bad Request")
+            return False
+
+        self.stats["requests"] += 1
+        connection_header = (_header(headers, "proxy-connection") or _header(headers, "connection") or "").lower()
+        client_keep_alive = "close" not in connection_header if version == "HTTP/1.1" else "keep-alive" in connection_header
+        chunked = _header(headers, "transfer-encoding") is not None
+        length = _content_length(headers)
+        if length is None:
+            await _reply(writer, 400, "Bad Request")
+            return False
+        if (chunked or length) and "100-continue" in (_header(headers, "expect") or "").lower():
+            # Answer the expectation here, since the body is read before an upstream is chosen.
+            writer.write(b"HTTP/1.1 100 Continue\r\n\r\n")
+        body = None
+        if not chunked and 0 < length <= self.buffer_size:
+            # Small bodies are read up front so the request can be sent again after a failure.
+            body = await reader.readexactly(length)
+        # Other bodies are streamed once; they always get a fresh upstream connection, which cannot be stale.
+        streamed = chunked or length > self.buffer_size
+        forwarded = [(name, value) for name, value in headers if name.lower() not in _HOP_BY_HOP and name.lower() != "expect"]
+        request = (f"{method} {target} HTTP/1.1\r\n" + "".join(f"{name}: {value}\r\n" for name, value in forwarded)).encode("latin-1")
+
+        tried: Set[Tuple[str, int, Optional[str]]] = set()
+        for attempt in range(self.max_failover + 1):
+            proxy = self._choose(key, tried)
+            if proxy is None:
+                break
+            tried.add(_upstream_key(proxy))
+            if attempt:
+                self.stats["failovers"] += 1
+
+            started = time.perf_counter()
+            head = None
+            connection = None if streamed else self._checkout(proxy)
+            if connection is not None:
+                stale = False
+                try:
+                    head = await self._exchange(reader, writer, connection, proxy, request, body, headers)
+                    stale = head is None
+                except asyncio.TimeoutError:
+                    pass
+                except (OSError, ValueError, asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+                    stale = True
+                if stale:
+                    # The upstream dropped the idle connection, which says nothing about the proxy; retry once on a new one.
+                    connection[1].close()
+                    connection = None
+            if connection is None:
+                try:
+                    connection = await self._connect(proxy)
+                except (OSError, asyncio.TimeoutError):
+                    self.rotator.record(proxy, ok=False, key=key)
+                    continue
+                try:
+                    head = await self._exchange(reader, writer, connection, proxy, request, body, headers)
+                except (OSError, ValueError, asyncio.TimeoutError, asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+                    head = None
+            upstream_reader, upstream_writer = connection
+
+            if head is None:
+                self.rotator.record(proxy, ok=False, key=key)
+                upstream_writer.close()
+                # A streamed request body has been consumed, so the request cannot be sent again.
+                if streamed:
+                    break
+                continue
+
+            status_line, response_headers = head
+            response_parts = status_line.split(" ", 2)
+            status = response_parts[1] if len(response_parts) > 1 else ""
+            if status == "407":
+                # The upstream rejected our credentials, which the client cannot fix; try another one.
+                self.rotator.record(proxy, ok=False, key=key)
+                upstream_writer.close()
+                if streamed:
+                    break
+                continue
+            self.rotator.record(proxy, time.perf_counter() - started, status.isdigit() and self.is_success(int(status)), key)
+            upstream_connection = (_header(response_headers, "proxy-connection") or _header(response_headers, "connection") or "").lower()
+            bodyless = method.upper() == "HEAD" or status in ("204", "304") or status.startswith("1")
+            framed = bodyless or _header(response_headers, "transfer-encoding") is not None or _header(response_headers, "content-length") is not None
+            keep_alive = client_keep_alive and framed
+
+            response_headers = [(name, value) for name, value in response_headers if name.lower() not in _HOP_BY_HOP]
+            response_headers.append(("Connection", "keep-alive" if keep_alive else "close"))
+            writer.write(_encode_head(status_line, response_headers))
+            try:
+                if not bodyless:
+                    await _relay_body(upstream_reader, writer, head[1], True, self.buffer_size)
+                await writer.drain()
+            except BaseException:
+                upstream_writer.close()
+                raise
+
+            if framed and response_parts[0] == "HTTP/1.1" and "close" not in upstream_connection:
+                self._checkin(proxy, connection)
+            else:
+                upstream_writer.close()
+            return keep_alive
+
+        await _reply(writer, 502, "Bad Gateway")
+        return False
+
+    async def _exchange(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, connection: Connection, proxy: Proxy, request: bytes, body: Optional[bytes], headers: Headers) -> Optional[Tuple[str, Headers]]:
+        """Send a request upstream and read the head of its final response, relaying interim ones to the client."""
+        upstream_reader, upstream_writer = connection
+        upstream_writer.write(request + (_proxy_authorization(proxy) + "\r\n").encode("latin-1"))
+        if body is not None:
+            upstream_writer.write(body)
+        elif _header(headers, "transfer-encoding") is not None or _content_length(headers):
+            await _relay_body(reader, upstream_writer, headers, False, self.buffer_size)
+        await upstream_writer.drain()
+        head = await asyncio.wait_for(_read_head(upstream_reader), self.idle_timeout)
+        # Relay interim responses such as 100 Continue and wait for the final one.
+        while head is not None and head[0].split(" ", 2)[1:2] in (["100"], ["102"], ["103"]):
+            writer.write(_encode_head(head[0], head[1]))
+            head = await asyncio.wait_for(_read_head(upstream_reader), self.idle_timeout)
+        return head
+
+
+def fetch_proxies(client: ApiClient, mode: Optional[str] = "direct", country_code_in: Optional[str] = None, search: Optional[str] = None) -> List[Proxy]:
+    """
+    Fetch the proxies to serve, skipping ones marked invalid.
+
+    Parameters:
+        client (ApiClient): The client used to fetch the list.
+        mode (str, optional): The proxy mode ('direct', 'residential', 'datacenter').
+        country_code_in (str, optional): The country code to filter proxies by.
+        search (str, optional): The search query to filter proxies by.
+
+    Returns:
+        list of Proxy: The usable proxies.
+    """
+    return [proxy for proxy in client.iter_proxies(mode=mode, country_code_in=country_code_in, search=search) if proxy.valid is not False]
+
+
+async def _read_head(reader: asyncio.StreamReader) -> Optional[Tuple[str, Headers]]:
+    try:
+        data = await reader.readuntil(b"\r\n\r\n")
+    except asyncio.IncompleteReadError as e:
+        if not e.partial.strip():
+            return None
+        raise
+    lines = data.decode("latin-1").split("\r\n")
+    headers = []
+    for line in lines[1:]:
+        if line:
+            name, _, value = line.partition(":")
+            headers.append((name.strip(), value.strip()))
+    return lines[0], headers
+
+
+def _header(headers: Headers, name: str) -> Optional[str]:
+    value = None
+    for header, content in headers:
+        if header.lower() == name:
+            value = content
+    return value
+
+
+def _content_length(headers: Headers) -> Optional[int]:
+    """The request's Content-Length, 0 when absent, or None when it is not a valid length."""
+    value = _header(headers, "content-length")
+    if value is None:
+        return 0
+    return int(value) if value.isdigit() else None
+
+
+def _encode_head(start_line: str, headers: Headers) -> bytes:
+    return (start_line + "\r\n" + "".join(f"{name}: {value}\r\n" for name, value in headers) + "\r\n").encode("latin-1")
+
+
+async def _reply(writer: asyncio.StreamWriter, status: int, reason: str) -> None:
+    writer.write(f"HTTP/1.1 {status} {reason}\r\nContent-Length: 0\r\nConnection: close\r\n\r\n".encode())
+    await writer.drain()
+
+
+def _upstream_key(proxy: Proxy) -> Tuple[str, int, Optional[str]]:
+    # Rotating endpoints share one address and port and differ only by username.
+    return proxy.proxy_address, proxy.port, proxy.username
+
+
+def _proxy_authorization(proxy: Proxy) -> str:
+    if not proxy.username:
+        return ""
+    credentials = base64.b64encode(f"{proxy.username}:{proxy.password}".encode()).decode()
+    return f"Proxy-Authorization: Basic {credentials}\r\n"
+
+
+def _session_key(headers: Headers) -> Optional[str]:
+    value = _header(headers, "proxy-authorization")
+    if not value or not value.lower().startswith("basic "):
+        return None
+    try:
+        username = base64.b64decode(value[6:].strip()).decode("utf-8", "replace").partition(":")[0]
+    except (binascii.Error, ValueError):
+        return None
+    return username or None
+
+
+async def _copy(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, size: int, buffer_size: int) -> None:
+    while size > 0:
+        data = await reader.read(min(size, buffer_size))
+        if not data:
+            raise asyncio.IncompleteReadError(b"", size)
+        writer.write(data)
+        size -= len(data)
+        await writer.drain()
+
+
+async def _relay_body(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, headers: Headers, until_eof: bool, buffer_size: int) -> None:
+    """Copy one message body, framed by chunked encoding, Content-Length or (for responses) EOF."""
+    if "chunked" in (_header(headers, "transfer-encoding") or "").lower():
+        while True:
+            line = await reader.readuntil(b"\r\n")
+            writer.write(line)
+            size = int(line.split(b";", 1)[0].strip(), 16)
+            if size == 0:
+                # Trailers end with an empty line.
+                while line != b"\r\n":
+                    line = await reader.readuntil(b"\r\n")
+                    writer.write(line)
+                break
+            await _copy(reader, writer, size + 2, buffer_size)
+        await writer.drain()
+        return
+
+    length = _header(headers, "content-length")
+    if length is not None:
+        await _copy(reader, writer, int(length), buffer_size)
+        return
+
+    if until_eof:
+        while True:
+            data = await reader.read(buffer_size)
+            if not data:
+                break
+            writer.write(data)
+            await writer.drain()
+
+
+def _parse_upstream(value: str) -> Proxy:
+    # IPv6 addresses are written in brackets, e.g. [2001:db8::1]:8080:username:password.
+    if value.startswith("["):
+        host, _, rest = value[1:].partition("]")
+        parts = [host] + rest[1:].split(":", 2) if rest.startswith(":") else []
+    else:
+        parts = value.split(":", 3)
+    if len(parts) not in (2, 4) or not parts[1].isdigit():
+        raise argparse.ArgumentTypeError(f"Expected host:port or host:port:username:password, got {value!r}")
+    return Proxy({
+        "id": value,
+        "proxy_address": parts[0],
+        "port": int(parts[1]),
+        "username": parts[2] if len(parts) == 4 else None,
+        "password": parts[3] if len(parts) == 4 else None,
+        "valid": True,
+    })
+
+
+async def _run(args: argparse.Namespace, client: Optional[ApiClient], proxies: List[Proxy]) -> None:
+    strategy = STRATEGIES[args.strategy]()
+    if args.circuit_breaker:
+        strategy = CircuitBreakerStrategy(strategy, BreakerRegistry(quarantine=args.quarantine))
+    server = RotatingProxyServer(
+        proxies,
+        host=args.host,
+        port=args.port,
+        strategy=strategy,
+        connect_timeout=args.connect_timeout,
+        idle_timeout=args.idle_timeout,
+        max_failover=args.max_failover,
+    )
+    await server.start()
+    print(f"Serving {len(proxies)} proxies on {server.host}:{server.port}", file=sys.stderr)
+
+    async def refresh() -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(args.refresh)
+            try:
+                server.update(await loop.run_in_executor(None, fetch_proxies, client, args.mode, args.country, args.search))
+            except ValueError as e:
+                print(f"Refreshing the proxy list failed: {e}", file=sys.stderr)
+
+    refresher = asyncio.ensure_future(refresh()) if client is not None and args.refresh else None
+    try:
+        await server.serve_forever()
+    finally:
+        if refresher is not None:
+            refresher.cancel()
+        await server.close()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="webshare-proxy", description="Run a local HTTP/HTTPS forward proxy that rotates through your Webshare proxies.")
+    parser.add_argument("--api-key", default=os.environ.get("WEBSHARE_API_KEY"), help="Webshare API key (default: $WEBSHARE_API_KEY)")
+    parser.add_argument("--host", default="127.0.0.1", help="address to listen on")
+    parser.add_argument("--port", type=int, default=8899, help="port to listen on")
+    parser.add_argument("--mode", default="direct", help="proxy mode: direct, residential or datacenter")
+    parser.add_argument("--country", help="only use proxies in these country codes, e.g. US,DE")
+    parser.add_argument("--search", help="only use proxies matching this search")
+    parser.add_argument("--strategy", choices=sorted(STRATEGIES), default="round-robin", help="how upstream proxies are chosen")
+    parser.add_argument("--circuit-breaker", action="store_true", help="stop using upstreams that keep failing until they recover")
+    parser.add_argument("--quarantine", type=float, default=30.0, help="seconds a failing upstream rests before it is probed again")
+    parser.add_argument("--upstream", action="append", type=_parse_upstream, default=[], metavar="HOST:PORT[:USER:PASS]", help="use this upstream instead of the API list (repeatable); bracket IPv6 hosts")
+    parser.add_argument("--refresh", type=float, default=0, help="re-fetch the proxy list every this many seconds")
+    parser.add_argument("--max-failover", type=int, default=3, help="other upstreams to try when one fails")
+    parser.add_argument("--connect-timeout", type=float, default=10.0, help="seconds to connect to an upstream")
+    parser.add_argument("--idle-timeout", type=float, default=60.0, help="seconds before an idle connection is closed")
+    args = parser.parse_args(argv)
+
+    client = None
+    proxies = args.upstream
+    if not proxies:
+        if not args.api_key:
+            parser.error("an API key is required unless --upstream is given")
+        client = ApiClient(args.api_key)
+        proxies = fetch_proxies(client, args.mode, args.country, args.search)
+    if not proxies:
+        parser.error("no usable proxies")
+
+    try:
+        asyncio.run(_run(args, client, proxies))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1 +1,19 @@
 from .objects import *
+from .pool import ProxyPool
+from .rotation import ProxyRotator, RotationStrategy, RoundRobinStrategy, WeightedRandomStrategy, LeastRecentlyUsedStrategy, StickyStrategy, LatencyAwareStrategy, is_success
+from .health import HealthChecker, HealthReport, HealthResult
+from .cache import ResponseCache
+from .snapshot import ProxySnapshot, SnapshotStore, save_snapshot
+from .sync import ProxySync, SyncResult
+from .retry import RetryPolicy, TokenBucket
+from .table import ProxyTable, ProxyRow
+from .stream import StreamedPage, AsyncStreamedPage
+from .metrics import Metrics, RequestEvent, endpoint_template
+from .batch import BatchReport, BatchResult
+from .singleflight import SingleFlight, AsyncSingleFlight
+from .pooling import PooledAdapter
+from .routing import ProxyRoutingAdapter, proxy_url
+from .query import ProxyQuery, QueryPlan, Predicate
+from .scoring import BanditStrategy, DomainScorer, target_domain
+from .hashring import HashRing, ConsistentHashStrategy
+from .breaker import BreakerRegistry, CircuitBreaker, CircuitBreakerStrategy
@@ -0,0 +1,179 @@
+import asyncio
+import ipaddress
+from concurrent.futures import ThreadPoolExecutor
+
+from .objects import IpAuthorization
+from typing import Any, Awaitable, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+class BatchResult:
+    """The outcome of one item of a batch call."""
+
+    __slots__ = ("item", "ok", "value", "error", "skipped")
+
+    def __init__(self, item: Any, ok: bool, value: Any = None, error: Optional[BaseException] = None, skipped: bool = False) -> None:
+        self.item = item
+        self.ok = ok
+        self.value = value
+        self.error = error
+        self.skipped = skipped
+
+    def __repr__(self) -> str:
+        return f"BatchResult(item={self.item!r}, ok={self.ok}, skipped={self.skipped}, error={self.error!r})"
+
+
+class BatchReport:
+    """The results of a batch call, in the order the items were given."""
+
+    def __init__(self, results: List[BatchResult]) -> None:
+        self.results = results
+
+    def __len__(self) -> int:
+        return len(self.results)
+
+    def __iter__(self) -> Iterator[BatchResult]:
+        return iter(self.results)
+
+    @property
+    def ok(self) -> bool:
+        """True if no item failed."""
+        return all(result.ok for result in self.results)
+
+    def succeeded(self) -> List[BatchResult]:
+        """Items for which a request was made and succeeded."""
+        return [result for result in self.results if result.ok and not result.skipped]
+
+    def skipped(self) -> List[BatchResult]:
+        """Items that needed no request, e.g. an address that was already authorized."""
+        return [result for result in self.results if result.skipped]
+
+    def failed(self) -> List[BatchResult]:
+        return [result for result in self.results if not result.ok]
+
+    def get(self, item: Any) -> Optional[BatchResult]:
+        for result in self.results:
+            if result.item == item:
+                return result
+        return None
+
+
+def run_batch(function: Callable[[Any], Any], items: Sequence[Any], concurrency: int = 8) -> List[BatchResult]:
+    """
+    Call ``function`` for every item on a thread pool, collecting each result or exception.
+
+    An exception only fails its own item; the rest of the batch keeps running.
+
+    Parameters:
+        function (callable): Called with one item.
+        items (sequence): The items to process.
+        concurrency (int, optional): The maximum number of calls in flight.
+
+    Returns:
+        list of BatchResult: One result per item, in order.
+    """
+    def call(item: Any) -> BatchResult:
+        try:
+            return BatchResult(item, True, function(item))
+        except Exception as e:
+            return BatchResult(item, False, error=e)
+
+    if len(items) <= 1 or concurrency <= 1:
+        return [call(item) for item in items]
+    with ThreadPoolExecutor(max_workers=min(concurrency, len(items))) as executor:
+        return list(executor.map(call, items))
+
+
+async def run_batch_async(function: Callable[[Any], Awaitable[Any]], items: Sequence[Any], concurrency: int = 8) -> List[BatchResult]:
+    """
+    Await ``function`` for every item with at most ``concurrency`` calls in flight.
+
+    Parameters:
+        function (callable): A coroutine function called with one item.
+        items (sequence): The items to process.
+        concurrency (int, optional): The maximum number of calls in flight.
+
+    Returns:
+        list of BatchResult: One result per item, in order.
+    """
+    semaphore = asyncio.Semaphore(max(concurrency, 1))
+
+    async def call(item: Any) -> BatchResult:
+        async with semaphore:
+            try:
+                return BatchResult(item, True, await function(item))
+            except Exception as e:
+                return BatchResult(item, False, error=e)
+
+    return list(await asyncio.gather(*(call(item) for item in items)))
+
+
+def _normalize_address(value: Any) -> Optional[str]:
+    try:
+        return str(ipaddress.ip_address(str(value).strip()))
+    except ValueError:
+        return None
+
+
+def plan_ip_creation(ip_addresses: Iterable[str], existing: Iterable[IpAuthorization] = ()) -> Tuple[List[str], Dict[str, BatchResult]]:
+    """
+    Work out which addresses of a ``create_ips`` call actually need a request.
+
+    Parameters:
+        ip_addresses (iterable of str): The requested addresses; duplicates are collapsed.
+        existing (iterable of IpAuthorization, optional): The entries already on the account.
+
+    Returns:
+        tuple: The unique addresses in input order, and skipped results keyed by address for the
+        ones that are already authorized.
+    """
+    authorized = {_normalize_address(entry.ip_address): entry for entry in existing}
+    addresses: List[str] = []
+    skipped: Dict[str, BatchResult] = {}
+    for ip_address in dict.fromkeys(ip_addresses):
+        addresses.append(ip_address)
+        entry = authorized.get(_normalize_address(ip_address))
+        if entry is not None:
+            skipped[ip_address] = BatchResult(ip_address, True, entry, skipped=True)
+    return addresses, skipped
+
+
+def plan_ip_deletion(targets: Iterable[Union[str, int, IpAuthorization]], existing: Iterable[IpAuthorization]) -> Tuple[List[Any], Dict[Any, Any], Dict[Any, BatchResult]]:
+    """
+    Resolve the targets of a ``delete_ips`` call to IP authorization IDs.
+
+    A target is an ``IpAuthorization``, an entry ID, or an IP address; addresses are looked up in
+    ``existing``. IDs and addresses that are not on the account are skipped instead of sent.
+
+    Parameters:
+        targets (iterable): The entries to delete; duplicates are collapsed.
+        existing (iterable of IpAuthorization): The entries on the account.
+
+    Returns:
+        tuple: The unique targets in input order, a map from target to the ID to delete, and
+        skipped results keyed by target.
+    """
+    entries = list(existing)
+    by_address = {_normalize_address(entry.ip_address): entry.id for entry in entries}
+    known_ids = {str(entry.id) for entry in entries}
+
+    order: List[Any] = []
+    ids: Dict[Any, Any] = {}
+    skipped: Dict[Any, BatchResult] = {}
+    for target in targets:
+        key = target.id if isinstance(target, IpAuthorization) else target
+        if key in ids or key in skipped:
+            continue
+        order.append(key)
+
+        address = None if isinstance(target, (int, IpAuthorization)) else _normalize_address(target)
+        if address is not None:
+            entry_id = by_address.get(address)
+        elif str(key) in known_ids:
+            entry_id = key
+        else:
+            entry_id = None
+
+        if entry_id is None:
+            skipped[key] = BatchResult(key, True, None, skipped=True)
+        else:
+            ids[key] = entry_id
+    return order, ids, skipped
@@ -0,0 +1,362 @@
+import time
+import random
+import threading
+
+from .objects import Proxy
+from .rotation import RotationStrategy, RoundRobinStrategy
+from typing import Any, Dict, List, Optional, Tuple
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    The circuit breaker of one proxy.
+
+    While closed, outcomes are counted in a sliding window of ``buckets`` time slices. Once the
+    window holds at least ``min_requests`` outcomes and the failure rate reaches
+    ``failure_threshold``, the breaker opens and the proxy is quarantined. After the quarantine it
+    turns half-open and lets ``half_open_probes`` requests through at a time. ``success_to_close``
+    successful probes close it again; a failed probe reopens it with the quarantine doubled, up to
+    ``max_quarantine``.
+
+    The closed path takes no lock: ``allow`` reads one attribute and ``record`` bumps a counter.
+    Concurrent updates can occasionally drop a count, which only nudges the rate. State changes take
+    the breaker's own lock, so one bad proxy never blocks requests through the others.
+    """
+
+    def __init__(self,
+                 failure_threshold: float = 0.5,
+                 min_requests: int = 10,
+                 window: float = 60.0,
+                 buckets: int = 10,
+                 quarantine: float = 30.0,
+                 max_quarantine: float = 600.0,
+                 half_open_probes: int = 1,
+                 success_to_close: int = 2) -> None:
+        if not 0 < failure_threshold <= 1:
+            raise ValueError("failure_threshold must be in (0, 1]")
+        if window <= 0 or buckets < 1:
+            raise ValueError("window must be positive and buckets at least 1")
+        if half_open_probes < 1 or success_to_close < 1:
+            raise ValueError("half_open_probes and success_to_close must be at least 1")
+        self.failure_threshold = failure_threshold
+        self.min_requests = min_requests
+        self.quarantine = quarantine
+        self.max_quarantine = max_quarantine
+        self.half_open_probes = half_open_probes
+        self.success_to_close = success_to_close
+        self.state = CLOSED
+        self.opened_at = 0.0
+        self.current_quarantine = quarantine
+        self._width = window / buckets
+        self._slots: List[List[int]] = [[-1, 0, 0] for _ in range(buckets)]  # [bucket number, successes, failures]
+        self._probes = 0
+        self._probe_started = 0.0
+        self._probe_successes = 0
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return f"CircuitBreaker(state={self.state!r}, failure_rate={self.failure_rate():.2f})"
+
+    def counts(self, now: Optional[float] = None) -> Tuple[int, int]:
+        """
+        The successes and failures in the current window.
+
+        Returns:
+            tuple: ``(successes, failures)``.
+        """
+        oldest = int((time.monotonic() if now is None else now) / self._width) - len(self._slots) + 1
+        successes = failures = 0
+        for number, ok, failed in list(self._slots):
+            if number >= oldest:
+                successes += ok
+                failures += failed
+        return successes, failures
+
+    def failure_rate(self, now: Optional[float] = None) -> float:
+        successes, failures = self.counts(now)
+        total = successes + failures
+        return failures / total if total else 0.0
+
+    def allow(self) -> bool:
+        """
+        Whether a request may use the proxy now. In the half-open state a ``True`` answer claims a
+        probe slot, which the next ``record`` gives back.
+
+        Returns:
+            bool: True if the request may go ahead.
+        """
+        if self.state == CLOSED:
+            return True
+        now = time.monotonic()
+        with self._lock:
+            if self.state == OPEN:
+                if now - self.opened_at < self.current_quarantine:
+                    return False
+                self.state = HALF_OPEN
+                self._probes = 0
+                self._probe_successes = 0
+            if self.state == HALF_OPEN:
+                # A probe that was never reported must not keep the proxy quarantined forever.
+                if self._probes >= self.half_open_probes and now - self._probe_started < self.current_quarantine:
+                    return False
+                if self._probes >= self.half_open_probes:
+                    self._probes = 0
+                self._probes += 1
+                self._probe_started = now
+                return True
+            return True
+
+    def ready(self) -> bool:
+        """
+        Whether ``allow`` would let a request through now, without claiming a probe slot.
+
+        Returns:
+            bool: True if the proxy may be used.
+        """
+        state = self.state
+        if state == CLOSED:
+            return True
+        now = time.monotonic()
+        if state == OPEN:
+            return now - self.opened_at >= self.current_quarantine
+        return self._probes < self.half_open_probes or now - self._probe_started >= self.current_quarantine
+
+    def record(self, ok: bool) -> None:
+        """
+        Record the outcome of a request through the proxy.
+
+        Parameters:
+            ok (bool): Whether the proxy worked.
+        """
+        now = time.monotonic()
+        state = self.state
+        if state == CLOSED:
+            number = int(now / self._width)
+            slot = self._slots[number % len(self._slots)]
+            if slot[0] != number:
+                slot[:] = [number, 0, 0]
+            slot[1 if ok else 2] += 1
+            if not ok:
+                successes, failures = self.counts(now)
+                total = successes + failures
+                if total >= self.min_requests and failures / total >= self.failure_threshold:
+                    self._trip(now, CLOSED)
+            return
+
+        with self._lock:
+            if self.state != HALF_OPEN:
+                return
+            self._probes = max(self._probes - 1, 0)
+            if not ok:
+                self.current_quarantine = min(self.current_quarantine * 2, self.max_quarantine)
+                self._open(now)
+                return
+            self._probe_successes += 1
+            if self._probe_successes >= self.success_to_close:
+                self.state = CLOSED
+                self.current_quarantine = self.quarantine
+                for slot in self._slots:
+                    slot[:] = [-1, 0, 0]
+
+    def _trip(self, now: float, expected: str) -> None:
+        with self._lock:
+            if self.state == expected:
+                self._open(now)
+
+    def _open(self, now: float) -> None:
+        self.state = OPEN
+        self.opened_at = now
+
+    def reset(self) -> None:
+        """Close the breaker and forget its history."""
+        with self._lock:
+            self.state = CLOSED
+            self.current_quarantine = self.quarantine
+            self._probes = 0
+            self._probe_successes = 0
+            for slot in self._slots:
+                slot[:] = [-1, 0, 0]
+
+
+class BreakerRegistry:
+    """
+    Circuit breakers keyed by ``Proxy.id``, created on first use with the registry's settings.
+
+    Parameters:
+        failure_threshold (float, optional): The failure rate that opens a breaker.
+        min_requests (int, optional): The outcomes a window needs before the rate is trusted.
+        window (float, optional): The length of the sliding window in seconds.
+        buckets (int, optional): The number of time slices the window is divided into.
+        quarantine (float, optional): Seconds an opened breaker waits before probing.
+        max_quarantine (float, optional): The longest quarantine after repeated failed probes.
+        half_open_probes (int, optional): Requests let through at a time while probing.
+        success_to_close (int, optional): Successful probes needed to close a breaker.
+    """
+
+    def __init__(self, **settings: Any) -> None:
+        CircuitBreaker(**settings)  # Validate the settings up front.
+        self.settings = settings
+        self._breakers: Dict[str, CircuitBreaker] = {}
+
+    def __len__(self) -> int:
+        return len(self._breakers)
+
+    def get(self, proxy_id: str) -> CircuitBreaker:
+        """
+        Get the breaker for a proxy ID, creating it if needed.
+
+        Parameters:
+            proxy_id (str): The proxy ID.
+
+        Returns:
+            CircuitBreaker: The breaker.
+        """
+        breaker = self._breakers.get(proxy_id)
+        if breaker is None:
+            breaker = self._breakers.setdefault(proxy_id, CircuitBreaker(**self.settings))
+        return breaker
+
+    def allow(self, proxy: Proxy) -> bool:
+        """
+        Whether a request may use a proxy now; see ``CircuitBreaker.allow``.
+
+        Parameters:
+            proxy (Proxy): The proxy.
+
+        Returns:
+            bool: True if the request may go ahead.
+        """
+        breaker = self._breakers.get(proxy.id)
+        return breaker is None or breaker.allow()
+
+    def ready(self, proxy: Proxy) -> bool:
+        """
+        Whether a proxy may be used now, without claiming a probe slot; see ``CircuitBreaker.ready``.
+
+        Parameters:
+            proxy (Proxy): The proxy.
+
+        Returns:
+            bool: True if the proxy may be used.
+        """
+        breaker = self._breakers.get(proxy.id)
+        return breaker is None or breaker.ready()
+
+    def record(self, proxy: Proxy, ok: bool) -> None:
+        """
+        Record the outcome of a request through a proxy.
+
+        Parameters:
+            proxy (Proxy): The proxy.
+            ok (bool): Whether the proxy worked.
+        """
+        self.get(proxy.id).record(ok)
+
+    def state(self, proxy_id: str) -> str:
+        """
+        The state of a proxy's breaker: ``"closed"``, ``"open"`` or ``"half_open"``.
+
+        Parameters:
+            proxy_id (str): The proxy ID.
+
+        Returns:
+            str: The state.
+        """
+        breaker = self._breakers.get(proxy_id)
+        return CLOSED if breaker is None else breaker.state
+
+    def quarantined(self) -> List[str]:
+        """
+        The IDs of proxies whose breaker is open or half-open.
+
+        Returns:
+            list of str: The proxy IDs.
+        """
+        return [proxy_id for proxy_id, breaker in list(self._breakers.items()) if breaker.state != CLOSED]
+
+    def retain(self, proxy_ids: Any) -> None:
+        """
+        Drop the breakers of proxies that are no longer in use.
+
+        Parameters:
+            proxy_ids (container of str): The IDs to keep.
+        """
+        self._breakers = {proxy_id: breaker for proxy_id, breaker in list(self._breakers.items()) if proxy_id in proxy_ids}
+
+
+class CircuitBreakerStrategy(RotationStrategy):
+    """
+    Wrap another strategy so quarantined proxies are skipped.
+
+    The inner strategy's choice is used if its breaker allows it; otherwise the inner strategy is
+    asked again, up to ``attempts`` times, and then the proxies are scanned for one that is allowed,
+    starting at a random position so a sticky inner strategy does not send every quarantined key to
+    the same fallback. If every proxy is quarantined, the inner strategy's choice is returned anyway
+    rather than failing the request. Candidates are only checked; the half-open probe slot is
+    claimed by ``claim``, which ``ProxyRotator.get`` calls for the proxy it actually returns.
+    Outcomes passed to ``record`` feed both the breakers and the inner strategy, and ``assign`` is
+    forwarded to it.
+
+    Parameters:
+        strategy (RotationStrategy, optional): The strategy to wrap; round-robin by default.
+        registry (BreakerRegistry, optional): The breakers; can be shared, e.g. between a server and a client.
+        attempts (int, optional): How many times the inner strategy is asked before scanning.
+    """
+
+    def __init__(self, strategy: Optional[RotationStrategy] = None, registry: Optional[BreakerRegistry] = None, attempts: int = 3) -> None:
+        self.strategy = strategy or RoundRobinStrategy()
+        self.registry = registry if registry is not None else BreakerRegistry()
+        self.attempts = attempts
+
+    def prepare(self, proxies: Tuple[Proxy, ...]) -> Any:
+        self.registry.retain({proxy.id for proxy in proxies})
+        return self.strategy.prepare(proxies)
+
+    def select(self, proxies: Tuple[Proxy, ...], state: Any, key: Optional[str] = None) -> Proxy:
+        allow = self.registry.ready
+        proxy = self.strategy.select(proxies, state, key)
+        if allow(proxy):
+            return proxy
+        for _ in range(self.attempts - 1):
+            candidate = self.strategy.select(proxies, state, key)
+            if allow(candidate):
+                return candidate
+        start = random.randrange(len(proxies))
+        for index in range(len(proxies)):
+            candidate = proxies[(start + index) % len(proxies)]
+            if allow(candidate):
+                return candidate
+        return proxy
+
+    def claim(self, proxy: Proxy) -> None:
+        """
+        Take a half-open probe slot for a proxy about to be used.
+
+        Parameters:
+            proxy (Proxy): The proxy handed out.
+        """
+        self.registry.allow(proxy)
+
+    def record(self, proxy: Proxy, latency: Optional[float] = None, ok: bool = True, key: Optional[str] = None) -> None:
+        """
+        Record the outcome of a request through a proxy.
+
+        Parameters:
+            proxy (Proxy): The proxy used.
+            latency (float, optional): The observed round-trip time, passed to the inner strategy.
+            ok (bool, optional): Whether the proxy worked.
+            key (str, optional): The selection key, passed to the inner strategy.
+        """
+        self.registry.record(proxy, ok)
+        record = getattr(self.strategy, "record", None)
+        if record is not None:
+            record(proxy, latency, ok, key)
+
+    def assign(self, key: str, proxy: Proxy) -> None:
+        assign = getattr(self.strategy, "assign", None)
+        if assign is not None:
+            assign(key, proxy)
@@ -0,0 +1,164 @@
+import time
+import threading
+from collections import OrderedDict
+
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+class CacheEntry:
+    __slots__ = ("endpoint", "data", "expires_at", "etag", "last_modified")
+
+    def __init__(self, endpoint: str, data: Any, expires_at: float, etag: Optional[str] = None, last_modified: Optional[str] = None) -> None:
+        self.endpoint = endpoint
+        self.data = data
+        self.expires_at = expires_at
+        self.etag = etag
+        self.last_modified = last_modified
+
+    @property
+    def fresh(self) -> bool:
+        return time.monotonic() < self.expires_at
+
+    @property
+    def revalidatable(self) -> bool:
+        return self.etag is not None or self.last_modified is not None
+
+
+class ResponseCache:
+    """
+    A size-bounded LRU cache for GET responses with per-endpoint TTLs.
+
+    Only endpoints that have a TTL are cached; endpoints whose GET has side effects (such as
+    dismissing a notification) are never stored. Expired entries that carried an ``ETag`` or
+    ``Last-Modified`` header are kept so the client can revalidate them with a conditional request.
+
+    Parameters:
+        ttls (dict, optional): Maps endpoint paths to TTLs in seconds; replaces ``DEFAULT_TTLS``.
+        maxsize (int, optional): The maximum number of cached responses.
+    """
+
+    DEFAULT_TTLS: Dict[str, float] = {
+        "proxy/config/": 60,
+        "profile/": 300,
+        "activation/": 300,
+        "proxy/ipauthorization/": 30,
+        "apikey/": 300,
+        "proxy/list/": 30,
+    }
+
+    # Mutations under the key prefix make cached reads under these prefixes stale.
+    INVALIDATES: Dict[str, Tuple[str, ...]] = {
+        "proxy/config/": ("proxy/config/", "proxy/list/"),
+        "proxy/replace/": ("proxy/replace/", "proxy/list/"),
+        "proxy/list/": ("proxy/list/",),
+        "proxy/ipauthorization/": ("proxy/ipauthorization/",),
+        "changeemail/": ("profile/",),
+        "activation/": ("activation/", "profile/"),
+    }
+
+    def __init__(self, ttls: Optional[Dict[str, float]] = None, maxsize: int = 256) -> None:
+        self.ttls = dict(self.DEFAULT_TTLS if ttls is None else ttls)
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Hashable, CacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def ttl_for(self, endpoint: str) -> Optional[float]:
+        """
+        Get the TTL configured for an endpoint.
+
+        Parameters:
+            endpoint (str): The endpoint path relative to the API base URL.
+
+        Returns:
+            float: The TTL in seconds, or None if the endpoint is not cacheable.
+        """
+        return self.ttls.get(endpoint)
+
+    @staticmethod
+    def key(url: str, params: Optional[Dict[str, Any]] = None) -> Hashable:
+        if not params:
+            return url
+        return url, tuple(sorted((name, str(value)) for name, value in params.items() if value is not None))
+
+    def get(self, key: Hashable) -> Optional[CacheEntry]:
+        """
+        Look up an entry and mark it as recently used; fresh hits and misses are counted.
+
+        Parameters:
+            key (hashable): The cache key.
+
+        Returns:
+            CacheEntry: The entry, which may be stale, or None.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            if entry is not None and entry.fresh:
+                self.hits += 1
+            else:
+                self.misses += 1
+            return entry
+
+    def set(self, key: Hashable, endpoint: str, data: Any, etag: Optional[str] = None, last_modified: Optional[str] = None) -> None:
+        """
+        Store a response.
+
+        Parameters:
+            key (hashable): The cache key.
+            endpoint (str): The endpoint path, used for TTLs and invalidation.
+            data (Any): The parsed response.
+            etag (str, optional): The response's ``ETag`` header.
+            last_modified (str, optional): The response's ``Last-Modified`` header.
+        """
+        ttl = self.ttl_for(endpoint)
+        if ttl is None:
+            return
+
+        entry = CacheEntry(endpoint, data, time.monotonic() + ttl, etag, last_modified)
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def touch(self, key: Hashable) -> None:
+        """Restart the TTL of an entry the server confirmed is still current."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry.expires_at = time.monotonic() + (self.ttl_for(entry.endpoint) or 0)
+
+    def invalidate(self, prefix: str) -> None:
+        """
+        Drop every entry whose endpoint starts with a prefix.
+
+        Parameters:
+            prefix (str): The endpoint prefix.
+        """
+        with self._lock:
+            for key in [key for key, entry in self._entries.items() if entry.endpoint.startswith(prefix)]:
+                del self._entries[key]
+
+    def invalidate_for(self, endpoint: str) -> None:
+        """
+        Drop the entries made stale by a mutating request to an endpoint.
+
+        Parameters:
+            endpoint (str): The endpoint that was modified.
+        """
+        matches = [prefix for prefix in self.INVALIDATES if endpoint.startswith(prefix)]
+        if matches:
+            prefixes = self.INVALIDATES[max(matches, key=len)]
+        else:
+            prefixes = (endpoint.split("/", 1)[0] + "/",)
+        for prefix in prefixes:
+            self.invalidate(prefix)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
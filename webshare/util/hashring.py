@@ -0,0 +1,265 @@
+import math
+import heapq
+import bisect
+import random
+import hashlib
+import threading
+
+from .objects import Proxy
+from .rotation import RotationStrategy
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+def _hash(value: str) -> int:
+    # A stable 64-bit hash; Python's hash() differs between processes.
+    return int.from_bytes(hashlib.blake2b(value.encode(), digest_size=8).digest(), "big")
+
+
+class HashRing:
+    """
+    A consistent-hash ring of proxies keyed by ``Proxy.id``.
+
+    Each proxy is placed on the ring at ``vnodes`` points and a key belongs to the first point at or
+    after its hash, found by binary search. Adding or removing a proxy only moves the keys between
+    its points and their neighbours, roughly ``1/n`` of them, and the mapping is the same in every
+    process that has the same proxies.
+
+    Parameters:
+        proxies (iterable of Proxy, optional): The proxies to place on the ring.
+        vnodes (int, optional): Points per proxy; more points spread keys more evenly but use more memory.
+    """
+
+    def __init__(self, proxies: Iterable[Proxy] = (), vnodes: int = 100) -> None:
+        if vnodes < 1:
+            raise ValueError("vnodes must be at least 1")
+        self.vnodes = vnodes
+        # Sorted point hashes, the proxy ID owning each point, and the proxies by ID. Changes build
+        # new containers and swap them in as one tuple, so lookups from other threads always see a
+        # consistent ring.
+        self._ring: Tuple[List[int], List[str], Dict[str, Proxy]] = ([], [], {})
+        self.update(proxies)
+
+    def __len__(self) -> int:
+        return len(self._ring[2])
+
+    def __contains__(self, proxy_id: str) -> bool:
+        return proxy_id in self._ring[2]
+
+    @property
+    def proxies(self) -> List[Proxy]:
+        return list(self._ring[2].values())
+
+    def proxy(self, proxy_id: str) -> Optional[Proxy]:
+        """
+        Get the proxy on the ring with an ID.
+
+        Parameters:
+            proxy_id (str): The proxy ID.
+
+        Returns:
+            Proxy: The proxy, or None if it is not on the ring.
+        """
+        return self._ring[2].get(proxy_id)
+
+    def _points(self, proxy_id: str) -> List[int]:
+        return [_hash(f"{proxy_id}#{index}") for index in range(self.vnodes)]
+
+    def add(self, proxy: Proxy) -> None:
+        """
+        Place a proxy on the ring, or replace the ``Proxy`` object stored for its ID.
+
+        Parameters:
+            proxy (Proxy): The proxy to add.
+        """
+        proxies = dict(self._ring[2])
+        proxies[proxy.id] = proxy
+        self.update(proxies.values())
+
+    def remove(self, proxy_id: str) -> None:
+        """
+        Take a proxy off the ring. Unknown IDs are ignored.
+
+        Parameters:
+            proxy_id (str): The ID of the proxy to remove.
+        """
+        self.update(proxy for current_id, proxy in self._ring[2].items() if current_id != proxy_id)
+
+    def update(self, proxies: Iterable[Proxy]) -> Tuple[List[str], List[str]]:
+        """
+        Make the ring hold exactly ``proxies``, placing only the proxies that are new.
+
+        Points of unchanged proxies are kept as they are, so only keys next to added or removed
+        proxies change owner.
+
+        Parameters:
+            proxies (iterable of Proxy): The new proxy set, e.g. a refreshed ``get_proxy_list`` result.
+
+        Returns:
+            tuple: The IDs that were added and the IDs that were removed.
+        """
+        proxies = {proxy.id: proxy for proxy in proxies}
+        hashes, owners, current = self._ring
+        removed = [proxy_id for proxy_id in current if proxy_id not in proxies]
+        added = [proxy_id for proxy_id in proxies if proxy_id not in current]
+
+        if removed:
+            gone = set(removed)
+            kept = [(point, owner) for point, owner in zip(hashes, owners) if owner not in gone]
+            hashes, owners = [point for point, _ in kept], [owner for _, owner in kept]
+        if added:
+            new = sorted((point, proxy_id) for proxy_id in added for point in self._points(proxy_id))
+            if len(new) > 256:
+                # Many new points: one linear merge beats many insertions.
+                points = list(heapq.merge(zip(hashes, owners), new))
+                hashes, owners = [point for point, _ in points], [owner for _, owner in points]
+            else:
+                hashes, owners = list(hashes), list(owners)
+                for point, proxy_id in new:
+                    index = bisect.bisect_left(hashes, point)
+                    hashes.insert(index, point)
+                    owners.insert(index, proxy_id)
+
+        self._ring = (hashes, owners, proxies)
+        return added, removed
+
+    def _index(self, key: str, hashes: List[int]) -> int:
+        if not hashes:
+            raise ValueError("The hash ring is empty")
+        index = bisect.bisect_left(hashes, _hash(key))
+        return 0 if index == len(hashes) else index
+
+    def get(self, key: str) -> Proxy:
+        """
+        Find the proxy a key maps to.
+
+        Parameters:
+            key (str): The session key, e.g. an account name or a target domain.
+
+        Returns:
+            Proxy: The proxy.
+
+        Raises:
+            ValueError: If the ring is empty.
+        """
+        hashes, owners, proxies = self._ring
+        return proxies[owners[self._index(key, hashes)]]
+
+    def walk(self, key: str) -> Iterator[Proxy]:
+        """
+        Yield every proxy in ring order starting from the one ``key`` maps to, each once.
+
+        The order is the key's preference list: the proxies it would move to, in turn, if the ones
+        before were removed.
+
+        Parameters:
+            key (str): The session key.
+
+        Yields:
+            Proxy: The proxies in preference order.
+        """
+        hashes, owners, proxies = self._ring
+        start, count = self._index(key, hashes), len(owners)
+        seen = set()
+        for offset in range(count):
+            owner = owners[(start + offset) % count]
+            if owner not in seen:
+                seen.add(owner)
+                yield proxies[owner]
+                if len(seen) == len(proxies):
+                    return
+
+
+class ConsistentHashStrategy(RotationStrategy):
+    """
+    Map each key to a proxy with a consistent-hash ring, so a key keeps its proxy across refreshes
+    and only the keys of removed proxies move.
+
+    Without ``load_factor`` the mapping is stateless and identical in every process. With it the
+    strategy uses consistent hashing with bounded loads: a proxy accepts new keys only while it
+    holds fewer than ``ceil(load_factor * keys / proxies)``, and keys that find their proxy full
+    move on along the ring. That prevents hot spots, at the cost of remembering up to ``max_keys``
+    assignments. Keys pinned with ``assign`` (e.g. after a failover) are remembered in both modes.
+    Selections without a key pick a proxy at random.
+
+    Parameters:
+        vnodes (int, optional): Points per proxy on the ring.
+        load_factor (float, optional): How far above the average load a proxy may go, e.g. ``1.25``.
+        max_keys (int, optional): The number of assignments kept before the oldest ones are dropped.
+    """
+
+    def __init__(self, vnodes: int = 100, load_factor: Optional[float] = None, max_keys: int = 100000) -> None:
+        if load_factor is not None and load_factor < 1:
+            raise ValueError("load_factor must be at least 1")
+        self.ring = HashRing(vnodes=vnodes)
+        self.load_factor = load_factor
+        self.max_keys = max_keys
+        self._assignments: Dict[str, str] = {}
+        self._loads: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def prepare(self, proxies: Tuple[Proxy, ...]) -> Any:
+        with self._lock:
+            _, removed = self.ring.update(proxies)
+            if removed:
+                gone = set(removed)
+                self._assignments = {key: proxy_id for key, proxy_id in self._assignments.items() if proxy_id not in gone}
+                for proxy_id in gone:
+                    self._loads.pop(proxy_id, None)
+        return None
+
+    def select(self, proxies: Tuple[Proxy, ...], state: Any, key: Optional[str] = None) -> Proxy:
+        if key is None:
+            return proxies[int(random.random() * len(proxies))]
+
+        ring = self.ring
+        proxy_id = self._assignments.get(key)
+        if proxy_id is not None:
+            proxy = ring.proxy(proxy_id)
+            if proxy is not None:
+                return proxy
+        if self.load_factor is None:
+            return ring.get(key)
+
+        with self._lock:
+            proxy_id = self._assignments.get(key)
+            proxy = None if proxy_id is None else ring.proxy(proxy_id)
+            if proxy is not None:
+                return proxy
+            loads = self._loads
+            capacity = math.ceil(self.load_factor * (len(self._assignments) + 1) / len(ring))
+            for proxy in ring.walk(key):
+                if loads.get(proxy.id, 0) < capacity:
+                    break
+            self._store(key, proxy.id)
+            return proxy
+
+    def assign(self, key: str, proxy: Proxy) -> None:
+        """
+        Pin a key to a proxy, e.g. after the proxy it hashes to failed and another one worked.
+
+        Parameters:
+            key (str): The session key.
+            proxy (Proxy): The proxy the key should use from now on.
+        """
+        with self._lock:
+            self._store(key, proxy.id)
+
+    def _store(self, key: str, proxy_id: str) -> None:
+        assignments, loads = self._assignments, self._loads
+        previous = assignments.pop(key, None)
+        if previous is not None:
+            loads[previous] = loads.get(previous, 1) - 1
+        while len(assignments) >= self.max_keys:
+            oldest = next(iter(assignments))
+            loads[assignments.pop(oldest)] -= 1
+        assignments[key] = proxy_id
+        loads[proxy_id] = loads.get(proxy_id, 0) + 1
+
+    def load(self) -> Dict[str, int]:
+        """
+        The number of remembered keys per proxy ID.
+
+        Returns:
+            dict: Proxy ID to key count.
+        """
+        with self._lock:
+            return {proxy_id: count for proxy_id, count in self._loads.items() if count}
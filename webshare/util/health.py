@@ -0,0 +1,147 @@
+import time
+import base64
+import asyncio
+
+from .objects import Proxy
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
+
+class HealthResult:
+    """The outcome of probing a single proxy."""
+
+    __slots__ = ("proxy", "ok", "latency", "error", "checked_at")
+
+    def __init__(self, proxy: Proxy, ok: bool, latency: Optional[float] = None, error: Optional[str] = None) -> None:
+        self.proxy = proxy
+        self.ok = ok
+        self.latency = latency
+        self.error = error
+        self.checked_at = time.time()
+
+    def __repr__(self) -> str:
+        return f"HealthResult(proxy={self.proxy.id!r}, ok={self.ok}, latency={self.latency}, error={self.error!r})"
+
+
+class HealthReport:
+    """The results of a health check run, in the order the proxies were given."""
+
+    def __init__(self, results: List[HealthResult]) -> None:
+        self.results = results
+
+    def __len__(self) -> int:
+        return len(self.results)
+
+    def __iter__(self) -> Iterator[HealthResult]:
+        return iter(self.results)
+
+    def healthy(self) -> List[HealthResult]:
+        return [result for result in self.results if result.ok]
+
+    def failed(self) -> List[HealthResult]:
+        return [result for result in self.results if not result.ok]
+
+    def filter(self, predicate: Callable[[HealthResult], bool]) -> List[HealthResult]:
+        return [result for result in self.results if predicate(result)]
+
+    def sorted_by_latency(self) -> List[HealthResult]:
+        """Healthy results ordered from fastest to slowest."""
+        return sorted(self.healthy(), key=lambda result: result.latency)
+
+    def fastest(self, count: int) -> List[Proxy]:
+        return [result.proxy for result in self.sorted_by_latency()[:count]]
+
+    def get(self, proxy_id: str) -> Optional[HealthResult]:
+        for result in self.results:
+            if result.proxy.id == proxy_id:
+                return result
+        return None
+
+
+class HealthChecker:
+    """
+    Probe proxies concurrently and measure their connect latency.
+
+    By default a probe only opens a TCP connection to the proxy. When ``target`` is given the probe
+    also asks the proxy to ``CONNECT`` to that host with the proxy's credentials, which checks that
+    the proxy accepts them and can reach the outside world.
+
+    Parameters:
+        concurrency (int, optional): The maximum number of probes in flight.
+        timeout (float, optional): The per-probe timeout in seconds.
+        target (tuple, optional): A ``(host, port)`` to tunnel to through each proxy.
+    """
+
+    def __init__(self, concurrency: int = 500, timeout: float = 5.0, target: Optional[Tuple[str, int]] = None) -> None:
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.target = target
+
+    def check(self, proxies: Iterable[Proxy]) -> HealthReport:
+        """
+        Probe every proxy and wait for the results.
+
+        Parameters:
+            proxies (iterable of Proxy): The proxies to probe.
+
+        Returns:
+            HealthReport: One result per proxy.
+        """
+        return asyncio.run(self.check_async(proxies))
+
+    async def check_async(self, proxies: Iterable[Proxy]) -> HealthReport:
+        """
+        Probe every proxy from a running event loop.
+
+        Parameters:
+            proxies (iterable of Proxy): The proxies to probe.
+
+        Returns:
+            HealthReport: One result per proxy.
+        """
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def bounded(proxy: Proxy) -> HealthResult:
+            async with semaphore:
+                return await self.probe(proxy)
+
+        return HealthReport(list(await asyncio.gather(*(bounded(proxy) for proxy in proxies))))
+
+    async def probe(self, proxy: Proxy) -> HealthResult:
+        """
+        Probe a single proxy.
+
+        Parameters:
+            proxy (Proxy): The proxy to probe.
+
+        Returns:
+            HealthResult: The probe outcome; ``latency`` is the TCP connect time in seconds.
+        """
+        writer = None
+        try:
+            started = time.perf_counter()
+            reader, writer = await asyncio.wait_for(asyncio.open_connection(proxy.proxy_address, proxy.port), self.timeout)
+            latency = time.perf_counter() - started
+
+            if self.target is not None:
+                await asyncio.wait_for(self._tunnel(proxy, reader, writer), self.timeout)
+            return HealthResult(proxy, True, latency)
+        except asyncio.TimeoutError:
+            return HealthResult(proxy, False, error="timeout")
+        except (OSError, ValueError) as e:
+            return HealthResult(proxy, False, error=str(e) or type(e).__name__)
+        finally:
+            if writer is not None:
+                writer.close()
+
+    async def _tunnel(self, proxy: Proxy, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        host, port = self.target
+        request = f"CONNECT {host}:{port} HTTP/1.1\r\nHost: {host}:{port}\r\n"
+        if proxy.username:
+            credentials = base64.b64encode(f"{proxy.username}:{proxy.password}".encode()).decode()
+            request += f"Proxy-Authorization: Basic {credentials}\r\n"
+        writer.write((request + "\r\n").encode())
+        await writer.drain()
+
+        status_line = await reader.readline()
+        parts = status_line.split(None, 2)
+        if len(parts) < 2 or parts[1] != b"200":
+            raise ValueError(f"Proxy refused tunnel: {status_line.decode(errors='replace').strip()}")
@@ -0,0 +1,182 @@
+import re
+import threading
+from bisect import bisect_left
+
+from typing import Dict, List, Optional, Sequence, Tuple
+
+DEFAULT_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+DEFAULT_SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+_ID_SEGMENT = re.compile(r"^(\d+|[0-9a-fA-F-]{16,}|[A-Za-z0-9_-]{24,})$")
+_DOWNLOAD_PREFIX = "proxy/list/download/"
+
+
+def endpoint_template(endpoint: str) -> str:
+    """
+    Replace the ID-like path segments of an endpoint with ``{id}`` to keep metric labels bounded.
+
+    Parameters:
+        endpoint (str): An endpoint path such as ``notification/42/dismiss/``.
+
+    Returns:
+        str: The template, e.g. ``notification/{id}/dismiss/``.
+    """
+    # The download path carries the download token and free-form filters; never use them as labels.
+    if endpoint.startswith(_DOWNLOAD_PREFIX):
+        return _DOWNLOAD_PREFIX
+    return "/".join("{id}" if _ID_SEGMENT.match(segment) else segment for segment in endpoint.split("/"))
+
+
+class RequestEvent:
+    """
+    The data passed to request hooks.
+
+    ``pre_request`` hooks see the request fields only; ``post_request`` hooks also get the status
+    code (None if no response arrived), the elapsed time in seconds, the response size in bytes
+    (None when the body is streamed) and the exception, if any. One event is emitted per attempt,
+    so retried requests produce several.
+    """
+
+    __slots__ = ("method", "url", "endpoint", "attempt", "status_code", "elapsed", "size", "error")
+
+    def __init__(self, method: str, url: str, endpoint: str, attempt: int = 0) -> None:
+        self.method = method
+        self.url = url
+        self.endpoint = endpoint
+        self.attempt = attempt
+        self.status_code: Optional[int] = None
+        self.elapsed: Optional[float] = None
+        self.size: Optional[int] = None
+        self.error: Optional[BaseException] = None
+
+
+class Histogram:
+    """A cumulative histogram with fixed bucket upper bounds."""
+
+    __slots__ = ("bounds", "counts", "sum", "count")
+
+    def __init__(self, bounds: Sequence[float]) -> None:
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        """The ``(le, count)`` pairs in Prometheus order, ending with ``+Inf``."""
+        result, total = [], 0
+        for bound, count in zip(self.bounds + (float("inf"),), self.counts):
+            total += count
+            result.append(("+Inf" if bound == float("inf") else repr(bound), total))
+        return result
+
+
+class Metrics:
+    """
+    Per-endpoint request metrics, fed by the client's ``post_request`` hook.
+
+    Records request counts by endpoint, method and status, latency and response-size histograms by
+    endpoint and method, bytes received, and transport errors by type. Updates take one short lock,
+    so the overhead per request is a few microseconds.
+
+    Parameters:
+        latency_buckets (sequence of float, optional): The latency histogram bounds in seconds.
+        size_buckets (sequence of float, optional): The response-size histogram bounds in bytes.
+    """
+
+    def __init__(self, latency_buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS, size_buckets: Sequence[float] = DEFAULT_SIZE_BUCKETS) -> None:
+        self.latency_buckets = tuple(latency_buckets)
+        self.size_buckets = tuple(size_buckets)
+        self.requests: Dict[Tuple[str, str, str], int] = {}
+        self.errors: Dict[Tuple[str, str, str], int] = {}
+        self.bytes_received: Dict[Tuple[str, str], int] = {}
+        self.latency: Dict[Tuple[str, str], Histogram] = {}
+        self.sizes: Dict[Tuple[str, str], Histogram] = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, event: RequestEvent) -> None:
+        self.record(event)
+
+    def record(self, event: RequestEvent) -> None:
+        """
+        Record one finished request attempt.
+
+        Parameters:
+            event (RequestEvent): The event passed to ``post_request`` hooks.
+        """
+        key = (endpoint_template(event.endpoint), event.method)
+        with self._lock:
+            if event.status_code is not None:
+                request_key = key + (str(event.status_code),)
+                self.requests[request_key] = self.requests.get(request_key, 0) + 1
+            if event.error is not None and event.status_code is None:
+                error_key = key + (type(event.error).__name__,)
+                self.errors[error_key] = self.errors.get(error_key, 0) + 1
+
+            if event.elapsed is not None:
+                histogram = self.latency.get(key)
+                if histogram is None:
+                    histogram = self.latency[key] = Histogram(self.latency_buckets)
+                histogram.observe(event.elapsed)
+
+            if event.size is not None:
+                self.bytes_received[key] = self.bytes_received.get(key, 0) + event.size
+                histogram = self.sizes.get(key)
+                if histogram is None:
+                    histogram = self.sizes[key] = Histogram(self.size_buckets)
+                histogram.observe(event.size)
+
+    def reset(self) -> None:
+        with self._lock:
+            self.requests.clear()
+            self.errors.clear()
+            self.bytes_received.clear()
+            self.latency.clear()
+            self.sizes.clear()
+
+    def export_prometheus(self, prefix: str = "webshare") -> str:
+        """
+        Render every metric in the Prometheus text exposition format.
+
+        Parameters:
+            prefix (str, optional): The metric name prefix.
+
+        Returns:
+            str: The exposition text.
+        """
+        with self._lock:
+            lines: List[str] = []
+
+            lines.append(f"# HELP {prefix}_requests_total API responses by endpoint, method and status.")
+            lines.append(f"# TYPE {prefix}_requests_total counter")
+            for (endpoint, method, status), value in sorted(self.requests.items()):
+                lines.append(f'{prefix}_requests_total{{endpoint="{endpoint}",method="{method}",status="{status}"}} {value}')
+
+            lines.append(f"# HELP {prefix}_request_errors_total API requests that got no response, by error type.")
+            lines.append(f"# TYPE {prefix}_request_errors_total counter")
+            for (endpoint, method, error), value in sorted(self.errors.items()):
+                lines.append(f'{prefix}_request_errors_total{{endpoint="{endpoint}",method="{method}",error="{error}"}} {value}')
+
+            lines.append(f"# HELP {prefix}_response_bytes_total Response body bytes received.")
+            lines.append(f"# TYPE {prefix}_response_bytes_total counter")
+            for (endpoint, method), value in sorted(self.bytes_received.items()):
+                lines.append(f'{prefix}_response_bytes_total{{endpoint="{endpoint}",method="{method}"}} {value}')
+
+            self._export_histograms(lines, f"{prefix}_request_duration_seconds", "API request latency in seconds.", self.latency)
+            self._export_histograms(lines, f"{prefix}_response_size_bytes", "API response body size in bytes.", self.sizes)
+            return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def _export_histograms(lines: List[str], name: str, help_text: str, histograms: Dict[Tuple[str, str], Histogram]) -> None:
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} histogram")
+        for (endpoint, method), histogram in sorted(histograms.items()):
+            labels = f'endpoint="{endpoint}",method="{method}"'
+            for bound, count in histogram.cumulative():
+                lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {count}')
+            lines.append(f"{name}_sum{{{labels}}} {histogram.sum}")
+            lines.append(f"{name}_count{{{labels}}} {histogram.count}")
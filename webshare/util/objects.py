@@ -1,6 +1,8 @@
 from typing import List
 
 class IpAuthorization:
+    __slots__ = ("data",)
+
     def __init__(self, data: dict):
         self.data = data
 
@@ -22,8 +24,11 @@ class IpAuthorization:
 
 
 class IpAuthorizationList:
+    __slots__ = ("data", "_results")
+
     def __init__(self, data: dict):
         self.data = data
+        self._results = None
 
     @property
     def count(self) -> int:
@@ -38,10 +43,14 @@ class IpAuthorizationList:
         return self.data.get("previous")
 
     def get_results(self) -> List[IpAuthorization]:
-        return [IpAuthorization(item) for item in self.data.get("results", [])]
+        if self._results is None:
+            self._results = [IpAuthorization(item) for item in self.data.get("results", [])]
+        return list(self._results)
 
 
 class Proxy:
+    __slots__ = ("data",)
+
     def __init__(self, data: dict):
         self.data = data
 
@@ -87,8 +96,11 @@ class Proxy:
 
 
 class ProxiesList:
+    __slots__ = ("data", "_results")
+
     def __init__(self, data: dict):
         self.data = data
+        self._results = None
 
     @property
     def count(self) -> int:
@@ -103,10 +115,14 @@ class ProxiesList:
         return self.data.get("previous")
 
     def get_results(self) -> List[Proxy]:
-        return [Proxy(item) for item in self.data.get("results", [])]
+        if self._results is None:
+            self._results = [Proxy(item) for item in self.data.get("results", [])]
+        return list(self._results)
 
 
 class Activation:
+    __slots__ = ("data",)
+
     def __init__(self, data: dict):
         self.data = data
 
@@ -128,6 +144,8 @@ class Activation:
 
 
 class UserProfile:
+    __slots__ = ("data",)
+
     def __init__(self, data: dict):
         self.data = data
 
@@ -201,6 +219,8 @@ class UserProfile:
 
 
 class Notification:
+    __slots__ = ("data",)
+
     def __init__(self, data: dict):
         self.data = data
 
@@ -234,8 +254,11 @@ class Notification:
 
 
 class NotificationsList:
+    __slots__ = ("data", "_results")
+
     def __init__(self, data: dict):
         self.data = data
+        self._results = None
 
     @property
     def count(self) -> int:
@@ -250,10 +273,14 @@ class NotificationsList:
         return self.data.get("previous")
 
     def get_results(self) -> List[Notification]:
-        return [Notification(item) for item in self.data.get("results", [])]
+        if self._results is None:
+            self._results = [Notification(item) for item in self.data.get("results", [])]
+        return list(self._results)
 
 
 class ProxyReplacement:
+    __slots__ = ("data",)
+
     def __init__(self, data: dict):
         self.data = data
 
@@ -299,8 +326,11 @@ class ProxyReplacement:
 
 
 class ProxyReplacementList:
+    __slots__ = ("data", "_results")
+
     def __init__(self, data: dict):
         self.data = data
+        self._results = None
 
     @property
     def count(self) -> int:
@@ -315,10 +345,14 @@ class ProxyReplacementList:
         return self.data.get("previous")
 
     def get_results(self) -> List[ProxyReplacement]:
-        return [ProxyReplacement(item) for item in self.data.get("results", [])]
+        if self._results is None:
+            self._results = [ProxyReplacement(item) for item in self.data.get("results", [])]
+        return list(self._results)
 
 
 class ProxyConfig:
+    __slots__ = ("data",)
+
     def __init__(self, data: dict):
         self.data = data
 
@@ -424,6 +458,8 @@ class ProxyConfig:
 
 
 class ApiKey:
+    __slots__ = ("data",)
+
     def __init__(self, data: dict):
         self.data = data
 
@@ -449,8 +485,11 @@ class ApiKey:
 
 
 class ApiKeyList:
+    __slots__ = ("data", "_results")
+
     def __init__(self, data: dict):
         self.data = data
+        self._results = None
 
     @property
     def count(self) -> int:
@@ -465,4 +504,6 @@ class ApiKeyList:
         return self.data.get("previous")
 
     def get_results(self) -> List[ApiKey]:
-        return [ApiKey(item) for item in self.data.get("results", [])]
+        if self._results is None:
+            self._results = [ApiKey(item) for item in self.data.get("results", [])]
+        return list(self._results)
@@ -0,0 +1,223 @@
+import threading
+
+from .objects import Proxy, ProxiesList
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Union
+
+class ProxyPool:
+    """
+    An in-memory set of proxies with secondary indexes on country, city, validity and address.
+
+    Queries intersect the relevant index sets, starting from the smallest one, so their cost
+    grows with the size of the result rather than the size of the pool.
+    """
+
+    def __init__(self, proxies: Iterable[Proxy] = ()) -> None:
+        self._lock = threading.Lock()
+        self._proxies: Dict[str, Proxy] = {}
+        self._by_country: Dict[str, Set[str]] = {}
+        self._by_city: Dict[str, Set[str]] = {}
+        self._by_address: Dict[str, Set[str]] = {}
+        self._valid: Set[str] = set()
+        self._invalid: Set[str] = set()
+        self.update(proxies)
+
+    @classmethod
+    def from_lists(cls, *proxies_lists: ProxiesList) -> "ProxyPool":
+        """
+        Build a pool from one or more ``ProxiesList`` pages.
+
+        Parameters:
+            *proxies_lists (ProxiesList): The pages to load.
+
+        Returns:
+            ProxyPool: A pool holding every proxy on the given pages.
+        """
+        pool = cls()
+        for proxies_list in proxies_lists:
+            pool.load(proxies_list)
+        return pool
+
+    def __len__(self) -> int:
+        return len(self._proxies)
+
+    def __contains__(self, proxy_id: str) -> bool:
+        return proxy_id in self._proxies
+
+    def __iter__(self) -> Iterator[Proxy]:
+        return iter(list(self._proxies.values()))
+
+    def load(self, proxies_list: ProxiesList) -> None:
+        """
+        Add every proxy on a ``ProxiesList`` page to the pool.
+
+        Parameters:
+            proxies_list (ProxiesList): The page to load.
+        """
+        self.update(proxies_list.get_results())
+
+    def update(self, proxies: Iterable[Proxy]) -> None:
+        """
+        Add or replace several proxies.
+
+        Parameters:
+            proxies (iterable of Proxy): The proxies to add; a proxy with a known ID replaces the old entry.
+        """
+        with self._lock:
+            for proxy in proxies:
+                self._add(proxy)
+
+    def add(self, proxy: Proxy) -> None:
+        """
+        Add a proxy, replacing any existing entry with the same ID.
+
+        Parameters:
+            proxy (Proxy): The proxy to add.
+        """
+        with self._lock:
+            self._add(proxy)
+
+    def remove(self, proxy_id: str) -> Optional[Proxy]:
+        """
+        Remove a proxy from the pool and its indexes.
+
+        Parameters:
+            proxy_id (str): The ID of the proxy to remove.
+
+        Returns:
+            Proxy: The removed proxy, or None if it was not in the pool.
+        """
+        with self._lock:
+            return self._remove(proxy_id)
+
+    def replace(self, removed: Iterable[str], added: Iterable[Proxy]) -> None:
+        """
+        Apply a replacement in one step, so readers never see a half-updated pool.
+
+        Parameters:
+            removed (iterable of str): The IDs of the proxies that were removed.
+            added (iterable of Proxy): The proxies that replaced them.
+        """
+        with self._lock:
+            for proxy_id in removed:
+                self._remove(proxy_id)
+            for proxy in added:
+                self._add(proxy)
+
+    def clear(self) -> None:
+        """Remove every proxy from the pool."""
+        with self._lock:
+            self._proxies.clear()
+            self._by_country.clear()
+            self._by_city.clear()
+            self._by_address.clear()
+            self._valid.clear()
+            self._invalid.clear()
+
+    def get(self, proxy_id: str) -> Optional[Proxy]:
+        """
+        Get a proxy by its ID.
+
+        Parameters:
+            proxy_id (str): The ID of the proxy.
+
+        Returns:
+            Proxy: The proxy, or None if it is not in the pool.
+        """
+        return self._proxies.get(proxy_id)
+
+    def get_by_address(self, proxy_address: str, port: Optional[int] = None) -> List[Proxy]:
+        """
+        Get the proxies listening on an address.
+
+        Parameters:
+            proxy_address (str): The proxy address.
+            port (int, optional): Only return the proxy on this port.
+
+        Returns:
+            list of Proxy: The matching proxies.
+        """
+        with self._lock:
+            proxies = [self._proxies[proxy_id] for proxy_id in self._by_address.get(proxy_address, ())]
+        if port is not None:
+            proxies = [proxy for proxy in proxies if proxy.port == port]
+        return proxies
+
+    def filter(self,
+               country_code: Union[str, Iterable[str], None] = None,
+               city_name: Union[str, Iterable[str], None] = None,
+               valid: Optional[bool] = None) -> List[Proxy]:
+        """
+        Get the proxies matching every given criterion.
+
+        Parameters:
+            country_code (str or iterable of str, optional): One or more country codes to match.
+            city_name (str or iterable of str, optional): One or more city names to match.
+            valid (bool, optional): Only return valid (True) or invalid (False) proxies.
+
+        Returns:
+            list of Proxy: The matching proxies.
+        """
+        with self._lock:
+            candidates: List[Set[str]] = []
+            if country_code is not None:
+                candidates.append(self._union(self._by_country, country_code))
+            if city_name is not None:
+                candidates.append(self._union(self._by_city, city_name))
+            if valid is not None:
+                candidates.append(self._valid if valid else self._invalid)
+
+            if not candidates:
+                return list(self._proxies.values())
+
+            candidates.sort(key=len)
+            smallest, others = candidates[0], candidates[1:]
+            return [self._proxies[proxy_id] for proxy_id in smallest if all(proxy_id in other for other in others)]
+
+    def count(self, **criteria) -> int:
+        """
+        Count the proxies matching the given ``filter`` criteria.
+
+        Returns:
+            int: The number of matching proxies.
+        """
+        return len(self.filter(**criteria))
+
+    @staticmethod
+    def _union(index: Dict[str, Set[str]], keys: Union[str, Iterable[str]]) -> Set[str]:
+        if isinstance(keys, str):
+            return index.get(keys, set())
+        result: Set[str] = set()
+        for key in keys:
+            result |= index.get(key, set())
+        return result
+
+    def _add(self, proxy: Proxy) -> None:
+        proxy_id = proxy.id
+        if proxy_id in self._proxies:
+            self._remove(proxy_id)
+
+        self._proxies[proxy_id] = proxy
+        self._by_country.setdefault(proxy.country_code, set()).add(proxy_id)
+        self._by_city.setdefault(proxy.city_name, set()).add(proxy_id)
+        self._by_address.setdefault(proxy.proxy_address, set()).add(proxy_id)
+        (self._valid if proxy.valid else self._invalid).add(proxy_id)
+
+    def _remove(self, proxy_id: str) -> Optional[Proxy]:
+        proxy = self._proxies.pop(proxy_id, None)
+        if proxy is None:
+            return None
+
+        self._discard(self._by_country, proxy.country_code, proxy_id)
+        self._discard(self._by_city, proxy.city_name, proxy_id)
+        self._discard(self._by_address, proxy.proxy_address, proxy_id)
+        self._valid.discard(proxy_id)
+        self._invalid.discard(proxy_id)
+        return proxy
+
+    @staticmethod
+    def _discard(index: Dict[str, Set[str]], key: str, proxy_id: str) -> None:
+        ids = index.get(key)
+        if ids is not None:
+            ids.discard(proxy_id)
+            if not ids:
+                del index[key]
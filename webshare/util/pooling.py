@@ -0,0 +1,66 @@
+import threading
+
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+from typing import Any, Dict, Type
+
+class PooledAdapter(HTTPAdapter):
+    """
+    An ``HTTPAdapter`` that counts the requests it sends and the connections it opens.
+
+    urllib3's own pool counters miss reconnects of a dropped connection and are lost when a pool
+    is evicted, so the adapter counts every socket ``connect`` itself. The adapter (and its pool)
+    is safe to share between sessions in different threads.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        self.requests = 0
+        self.connections = 0
+        self._stats_lock = threading.Lock()
+        super().__init__(*args, **kwargs)
+
+    def init_poolmanager(self, *args: Any, **kwargs: Any) -> None:
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": self._counting_pool(HTTPConnectionPool),
+            "https": self._counting_pool(HTTPSConnectionPool),
+        }
+
+    def _counting_pool(self, pool_class: Type[HTTPConnectionPool]) -> Type[HTTPConnectionPool]:
+        adapter = self
+
+        class CountingConnection(pool_class.ConnectionCls):
+            def connect(self) -> None:
+                super().connect()
+                with adapter._stats_lock:
+                    adapter.connections += 1
+
+        return type(pool_class.__name__, (pool_class,), {"ConnectionCls": CountingConnection})
+
+    def send(self, request: Any, **kwargs: Any) -> Any:
+        with self._stats_lock:
+            self.requests += 1
+        return super().send(request, **kwargs)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Report how well connections are being reused.
+
+        Returns:
+            dict: ``requests`` sent, ``connections`` opened, ``reused`` (requests that did not need a
+            new connection), ``pools`` (one per host) and ``idle`` (connections waiting in the pools).
+        """
+        pools = self.poolmanager.pools
+        with pools.lock:
+            current = list(pools._container.values())
+        idle = sum(pool.pool.qsize() for pool in current if pool.pool is not None)
+        with self._stats_lock:
+            requests, connections = self.requests, self.connections
+        return {
+            "requests": requests,
+            "connections": connections,
+            "reused": max(requests - connections, 0),
+            "pools": len(current),
+            "idle": idle,
+        }
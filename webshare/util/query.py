@@ -0,0 +1,370 @@
+import heapq
+import datetime
+
+from .table import ProxyTable
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+COLUMNS = ("id", "username", "password", "proxy_address", "port", "valid", "country_code", "city_name", "last_verification", "created_at")
+
+# Dictionary-encoded columns: (codes attribute, values attribute) on ProxyTable.
+_ENCODED = {"country_code": ("country_codes", "countries"), "city_name": ("city_codes", "cities")}
+
+
+def _ordered(test: Callable[[Any, Any], bool]) -> Callable[[Any, Any], bool]:
+    return lambda value, operand: value is not None and test(value, operand)
+
+
+_LOOKUPS: Dict[str, Callable[[Any, Any], bool]] = {
+    "exact": lambda value, operand: value == operand,
+    "ne": lambda value, operand: value != operand,
+    "in": lambda value, operand: value in operand,
+    "isnull": lambda value, operand: (value is None) == operand,
+    "startswith": _ordered(lambda value, operand: value.startswith(operand)),
+    "endswith": _ordered(lambda value, operand: value.endswith(operand)),
+    "contains": _ordered(lambda value, operand: operand in value),
+    "gt": _ordered(lambda value, operand: value > operand),
+    "gte": _ordered(lambda value, operand: value >= operand),
+    "lt": _ordered(lambda value, operand: value < operand),
+    "lte": _ordered(lambda value, operand: value <= operand),
+}
+
+
+class Predicate:
+    """
+    One ``field__lookup=value`` condition of a ``ProxyQuery``.
+
+    Parameters:
+        field (str): A proxy column such as ``country_code`` or ``created_at``.
+        lookup (str): ``exact``, ``ne``, ``in``, ``isnull``, ``startswith``, ``endswith``, ``contains``, ``gt``, ``gte``, ``lt`` or ``lte``.
+        value: The operand. Dates and datetimes are compared as ISO-8601 strings, like the API returns them.
+            ``in`` takes an iterable or a comma-separated string such as ``"US,DE"``.
+    """
+
+    __slots__ = ("field", "lookup", "value", "_test")
+
+    def __init__(self, field: str, lookup: str, value: Any) -> None:
+        if field not in COLUMNS:
+            raise ValueError(f"Unknown proxy column: {field}")
+        if lookup not in _LOOKUPS:
+            raise ValueError(f"Unknown lookup: {lookup}")
+        if lookup == "in":
+            if isinstance(value, str):
+                # The API's own form: "US,DE".
+                value = [item.strip() for item in value.split(",") if item.strip()]
+            value = frozenset(_normalize(item) for item in value)
+        else:
+            value = _normalize(value)
+        self.field = field
+        self.lookup = lookup
+        self.value = value
+        self._test = _LOOKUPS[lookup]
+
+    def __repr__(self) -> str:
+        value = sorted(self.value, key=str) if self.lookup == "in" else self.value
+        return f"{self.field} {self.lookup} {value!r}"
+
+    def matches(self, value: Any) -> bool:
+        return self._test(value, self.value)
+
+    def filter(self, table: ProxyTable, rows: Sequence[int]) -> List[int]:
+        """
+        Keep the rows of ``table`` that satisfy the condition.
+
+        Dictionary-encoded columns are tested once per distinct value and then filtered by code;
+        other columns are tested value by value.
+
+        Parameters:
+            table (ProxyTable): The table to read.
+            rows (sequence of int): The candidate row indices.
+
+        Returns:
+            list: The matching row indices, in order.
+        """
+        encoded = _ENCODED.get(self.field)
+        if encoded is not None:
+            codes, values = getattr(table, encoded[0]), getattr(table, encoded[1])
+            allowed = {code for code, value in enumerate(values) if self.matches(value)}
+            if len(allowed) == len(values):
+                return list(rows)
+            return [row for row in rows if codes[row] in allowed]
+        if self.field == "valid":
+            flags, test = table.valid_flags, self.matches
+            allowed = {flag for flag in (-1, 0, 1) if test(None if flag < 0 else bool(flag))}
+            return [row for row in rows if flags[row] in allowed]
+        values, test = table.column(self.field), self.matches
+        return [row for row in rows if test(values[row])]
+
+
+def _normalize(value: Any) -> Any:
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.isoformat()
+    return value
+
+
+class QueryPlan:
+    """
+    How a ``ProxyQuery`` runs: the parameters sent to the API and the work left to the client.
+
+    Attributes:
+        server_params (dict): Query parameters for ``proxy/list/``.
+        client_filters (list of Predicate): Conditions evaluated over the fetched rows.
+        client_ordering (list of str): Sort keys applied after filtering (``-`` for descending).
+        limit (int or None): The maximum number of rows returned.
+        early_stop (bool): Whether fetching stops once ``limit`` rows have matched.
+    """
+
+    def __init__(self, server_params: Dict[str, Any], client_filters: List[Predicate], client_ordering: List[str], limit: Optional[int]) -> None:
+        self.server_params = server_params
+        self.client_filters = client_filters
+        self.client_ordering = client_ordering
+        self.limit = limit
+        self.early_stop = limit is not None and not client_ordering
+
+    def __str__(self) -> str:
+        params = " ".join(f"{name}={value}" for name, value in self.server_params.items() if value is not None)
+        lines = [f"server: GET proxy/list/ {params}"]
+        for predicate in self.client_filters:
+            how = "dictionary-encoded" if predicate.field in _ENCODED or predicate.field == "valid" else "column scan"
+            lines.append(f"client: {predicate!r} ({how})")
+        if self.client_ordering:
+            how = "top-k" if self.limit is not None and len(self.client_ordering) == 1 else "sort"
+            lines.append(f"client: order by {', '.join(self.client_ordering)} ({how})")
+        if self.limit is not None:
+            lines.append(f"limit: {self.limit}" + (" (stops fetching pages once reached)" if self.early_stop else ""))
+        return "\n".join(lines)
+
+
+class ProxyQuery:
+    """
+    A compound query over the proxy list.
+
+    Conditions the API can apply (countries, ``search``, a single ordering key) are sent with the
+    request; the rest are evaluated client-side over each fetched page, loaded into a
+    ``ProxyTable`` and filtered column by column. When no ordering is left to the client, pages
+    are fetched only until ``limit`` rows have matched. Every method returns a new query.
+
+    Example:
+        ProxyQuery().where(country_code__in=["US", "DE"], valid=True, city_name__startswith="New")
+                    .order_by("-created_at").limit(10).run(client)
+
+    Parameters:
+        mode (str, optional): The proxy mode ('direct', 'residential', 'datacenter').
+        page_size (int, optional): The number of proxies fetched per request.
+    """
+
+    def __init__(self, mode: Optional[str] = "direct", page_size: int = 100) -> None:
+        self.mode = mode
+        self.page_size = page_size
+        self._predicates: Tuple[Predicate, ...] = ()
+        self._search: Optional[str] = None
+        self._ordering: Tuple[str, ...] = ()
+        self._limit: Optional[int] = None
+
+    def _copy(self, **changes: Any) -> "ProxyQuery":
+        query = ProxyQuery.__new__(ProxyQuery)
+        query.__dict__.update(self.__dict__, **changes)
+        return query
+
+    def where(self, **conditions: Any) -> "ProxyQuery":
+        """
+        Add conditions, all of which must hold. Keywords are ``field`` or ``field__lookup``.
+
+        Parameters:
+            **conditions: For example ``country_code__in=["US", "DE"]``, ``valid=True`` or ``created_at__gte="2024-01-01"``.
+
+        Returns:
+            ProxyQuery: The new query.
+        """
+        predicates = []
+        for name, value in conditions.items():
+            field, _, lookup = name.partition("__")
+            predicates.append(Predicate(field, lookup or "exact", value))
+        return self._copy(_predicates=self._predicates + tuple(predicates))
+
+    def search(self, text: str) -> "ProxyQuery":
+        """
+        Add the API's ``search`` filter. It always runs on the server, so ``apply`` cannot evaluate it.
+
+        Parameters:
+            text (str): The search text.
+
+        Returns:
+            ProxyQuery: The new query.
+        """
+        return self._copy(_search=text)
+
+    def order_by(self, *fields: str) -> "ProxyQuery":
+        """
+        Order the results; prefix a field with ``-`` for descending order. Missing values sort last.
+
+        Parameters:
+            *fields (str): Proxy columns, most significant first.
+
+        Returns:
+            ProxyQuery: The new query.
+        """
+        for field in fields:
+            if field.lstrip("-") not in COLUMNS:
+                raise ValueError(f"Unknown proxy column: {field.lstrip('-')}")
+        return self._copy(_ordering=tuple(fields))
+
+    def limit(self, count: int) -> "ProxyQuery":
+        """
+        Return at most ``count`` rows.
+
+        Parameters:
+            count (int): The maximum number of rows.
+
+        Returns:
+            ProxyQuery: The new query.
+        """
+        if count < 0:
+            raise ValueError("limit must not be negative")
+        return self._copy(_limit=count)
+
+    def plan(self) -> QueryPlan:
+        """
+        Split the query between the API and the client.
+
+        Returns:
+            QueryPlan: The plan ``run`` follows.
+        """
+        client_filters = list(self._predicates)
+        countries = None
+        for predicate in client_filters:
+            if predicate.field == "country_code" and predicate.lookup in ("exact", "in") and predicate.value is not None:
+                values = predicate.value if predicate.lookup == "in" else {predicate.value}
+                if values and None not in values:
+                    countries = ",".join(sorted(values))
+                    client_filters.remove(predicate)
+                    break
+
+        ordering, client_ordering = None, list(self._ordering)
+        if len(client_ordering) == 1:
+            ordering = client_ordering.pop()
+
+        params = {"mode": self.mode, "country_code__in": countries, "search": self._search, "ordering": ordering}
+        return QueryPlan(params, client_filters, client_ordering, self._limit)
+
+    def explain(self) -> str:
+        """
+        Describe which conditions run on the server and which on the client.
+
+        Returns:
+            str: One line per step.
+        """
+        return str(self.plan())
+
+    def run(self, client: Any) -> ProxyTable:
+        """
+        Execute the query against the API.
+
+        Parameters:
+            client (ApiClient): The client used to fetch the proxy list.
+
+        Returns:
+            ProxyTable: The matching proxies, in query order.
+        """
+        plan = self.plan()
+        result = ProxyTable()
+        page = 1
+        while plan.limit != 0:
+            proxies_list = client.get_proxy_list(page=page, page_size=self._page_size(plan), **_client_kwargs(plan.server_params))
+            if self._collect(plan, ProxyTable.from_lists(proxies_list), result) or not proxies_list.next:
+                break
+            page += 1
+        return self._finish(plan, result)
+
+    async def run_async(self, client: Any) -> ProxyTable:
+        """
+        Execute the query with an ``AsyncApiClient``.
+
+        Parameters:
+            client (AsyncApiClient): The client used to fetch the proxy list.
+
+        Returns:
+            ProxyTable: The matching proxies, in query order.
+        """
+        plan = self.plan()
+        result = ProxyTable()
+        page = 1
+        while plan.limit != 0:
+            proxies_list = await client.get_proxy_list(page=page, page_size=self._page_size(plan), **_client_kwargs(plan.server_params))
+            if self._collect(plan, ProxyTable.from_lists(proxies_list), result) or not proxies_list.next:
+                break
+            page += 1
+        return self._finish(plan, result)
+
+    def apply(self, table: ProxyTable) -> ProxyTable:
+        """
+        Evaluate the whole query locally, e.g. over a cached or snapshotted table.
+
+        Parameters:
+            table (ProxyTable): The proxies to query.
+
+        Returns:
+            ProxyTable: The matching proxies, in query order.
+
+        Raises:
+            ValueError: If the query uses ``search``, which only the API can evaluate.
+        """
+        if self._search is not None:
+            raise ValueError("search() can only be evaluated by the API")
+        plan = QueryPlan({}, list(self._predicates), list(self._ordering), self._limit)
+        result = ProxyTable()
+        if plan.limit != 0:
+            self._collect(plan, table, result)
+        return self._finish(plan, result)
+
+    def _page_size(self, plan: QueryPlan) -> int:
+        if plan.early_stop and not plan.client_filters:
+            # Every row the server returns is a match, so fetch no more than needed.
+            return max(min(self.page_size, plan.limit), 1)
+        return self.page_size
+
+    @staticmethod
+    def _collect(plan: QueryPlan, table: ProxyTable, result: ProxyTable) -> bool:
+        rows: Sequence[int] = range(len(table))
+        for predicate in plan.client_filters:
+            if not rows:
+                break
+            rows = predicate.filter(table, rows)
+        if plan.early_stop:
+            rows = rows[:plan.limit - len(result)]
+        for row in rows:
+            result.append(table.row_dict(row))
+        return plan.early_stop and len(result) >= plan.limit
+
+    @staticmethod
+    def _finish(plan: QueryPlan, result: ProxyTable) -> ProxyTable:
+        if not plan.client_ordering:
+            return result
+        ordered = ProxyTable()
+        ordered.extend(result.row_dict(row) for row in _sort(result, plan.client_ordering, plan.limit))
+        return ordered
+
+
+def _client_kwargs(params: Dict[str, Any]) -> Dict[str, Any]:
+    return {"mode": params["mode"], "country_code_in": params["country_code__in"], "search": params["search"], "ordering": params["ordering"]}
+
+
+def _sort(table: ProxyTable, ordering: Sequence[str], limit: Optional[int]) -> List[int]:
+    rows = list(range(len(table)))
+    # Stable sorts from the least to the most significant key; missing values go last either way.
+    if limit is not None and len(ordering) == 1:
+        field = ordering[0]
+        values = table.column(field.lstrip("-"))
+        present = [row for row in rows if values[row] is not None]
+        if field.startswith("-"):
+            top = heapq.nlargest(limit, present, key=lambda row: (values[row], -row))
+        else:
+            top = heapq.nsmallest(limit, present, key=lambda row: (values[row], row))
+        if len(top) < limit:
+            top += [row for row in rows if values[row] is None][:limit - len(top)]
+        return top
+    for field in reversed(ordering):
+        values = table.column(field.lstrip("-"))
+        missing = [row for row in rows if values[row] is None]
+        present = sorted((row for row in rows if values[row] is not None), key=values.__getitem__, reverse=field.startswith("-"))
+        rows = present + missing
+    return rows if limit is None else rows[:limit]
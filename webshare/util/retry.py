@@ -0,0 +1,130 @@
+import time
+import random
+import threading
+from email.utils import parsedate_to_datetime
+
+from typing import Iterable, Optional
+
+class RetryPolicy:
+    """
+    Decide whether a failed request is retried and how long to wait first.
+
+    Delays use exponential backoff with full jitter (a random delay between zero and the
+    exponential cap), which spreads retries from many workers instead of synchronizing them.
+    A ``Retry-After`` from the server replaces the computed delay and is honoured in full; if it is
+    longer than ``max_backoff`` the request is not retried, and the client raises the error (a
+    ``RateLimitError`` for 429) with the delay in ``retry_after``.
+
+    Rate-limited (429) responses are retried for every method, because the server did not process
+    the request. Server errors, read timeouts and dropped connections are only retried for
+    idempotent methods, so a POST is never sent twice. Failures to connect are always retried.
+
+    Parameters:
+        max_retries (int, optional): The number of retries after the first attempt.
+        backoff_factor (float, optional): The base delay in seconds; attempt ``n`` waits up to ``backoff_factor * 2 ** n``.
+        max_backoff (float, optional): The upper bound of a single delay in seconds.
+        retry_statuses (iterable of int, optional): The status codes that may be retried.
+        idempotent_methods (iterable of str, optional): The methods that are safe to repeat.
+    """
+
+    def __init__(self,
+                 max_retries: int = 3,
+                 backoff_factor: float = 0.5,
+                 max_backoff: float = 30.0,
+                 retry_statuses: Iterable[int] = (429, 500, 502, 503, 504),
+                 idempotent_methods: Iterable[str] = ("GET", "HEAD", "OPTIONS", "PUT", "DELETE")) -> None:
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.retry_statuses = frozenset(retry_statuses)
+        self.idempotent_methods = frozenset(idempotent_methods)
+
+    def should_retry_status(self, method: str, status_code: int, attempt: int, retry_after: Optional[float] = None) -> bool:
+        if attempt >= self.max_retries or status_code not in self.retry_statuses:
+            return False
+        if retry_after is not None and retry_after > self.max_backoff:
+            return False
+        return status_code == 429 or method.upper() in self.idempotent_methods
+
+    def should_retry_error(self, method: str, connected: bool, attempt: int) -> bool:
+        if attempt >= self.max_retries:
+            return False
+        return not connected or method.upper() in self.idempotent_methods
+
+    def delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        if retry_after is not None:
+            return retry_after
+        return random.uniform(0, min(self.max_backoff, self.backoff_factor * (2 ** attempt)))
+
+    @staticmethod
+    def parse_retry_after(value: Optional[str]) -> Optional[float]:
+        """
+        Parse a ``Retry-After`` header given either in seconds or as an HTTP date.
+
+        Returns:
+            float: The delay in seconds, or None if the header is missing or malformed.
+        """
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+
+
+class TokenBucket:
+    """
+    A thread-safe token-bucket rate limiter shared by every thread using a client.
+
+    Callers reserve a token and are told how long to wait for it, so waiting happens outside the
+    lock and callers are released in arrival order at exactly the configured rate.
+
+    Parameters:
+        rate (float): The sustained number of requests per second.
+        capacity (float, optional): The burst size; defaults to ``rate``.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None) -> None:
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """
+        Take a token, possibly one that has not been generated yet.
+
+        Returns:
+            float: The number of seconds to wait before using the token.
+        """
+        with self._lock:
+            self._refill()
+            self._tokens -= 1
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    def acquire(self) -> None:
+        """Block until a token is available."""
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    def defer(self, seconds: float) -> None:
+        """
+        Hold back every caller for ``seconds``, e.g. after the server answered 429 with ``Retry-After``.
+
+        Parameters:
+            seconds (float): How long no new token should be handed out.
+        """
+        with self._lock:
+            self._refill()
+            self._tokens = min(self._tokens, -seconds * self.rate)
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
@@ -0,0 +1,408 @@
+import math
+import time
+import heapq
+import random
+import itertools
+import threading
+
+from .objects import Proxy, ProxiesList
+from typing import Any, Callable, Container, Dict, Iterable, List, Optional, Sequence, Tuple
+
+class RotationStrategy:
+    """
+    Base class for proxy selection strategies.
+
+    ``prepare`` is called once whenever the rotator's proxy set changes and returns any state the
+    strategy derives from it. The rotator publishes the proxies and that state together as one
+    immutable snapshot, so ``select`` usually needs no lock: it only relies on operations that are
+    atomic under the GIL (``next`` on ``itertools.count``, single dict lookups and stores).
+    Strategies that keep an ordering, such as ``LeastRecentlyUsedStrategy``, take a short lock.
+
+    A strategy may also define ``claim(proxy)``, which ``ProxyRotator.get`` calls with the proxy it
+    finally returns, e.g. to reserve a limited slot only for a proxy that is really used.
+    """
+
+    def prepare(self, proxies: Tuple[Proxy, ...]) -> Any:
+        return None
+
+    def select(self, proxies: Tuple[Proxy, ...], state: Any, key: Optional[str] = None) -> Proxy:
+        raise NotImplementedError
+
+
+class RoundRobinStrategy(RotationStrategy):
+    """Hand out proxies in list order, wrapping around at the end."""
+
+    def __init__(self) -> None:
+        self._counter = itertools.count()
+
+    def select(self, proxies: Tuple[Proxy, ...], state: Any, key: Optional[str] = None) -> Proxy:
+        return proxies[next(self._counter) % len(proxies)]
+
+
+class WeightedRandomStrategy(RotationStrategy):
+    """
+    Pick proxies at random in proportion to a weight.
+
+    Uses Walker's alias method, so a selection costs two random numbers regardless of pool size.
+
+    Parameters:
+        weight (callable, optional): Maps a proxy to a non-negative weight; every proxy weighs 1 by default.
+    """
+
+    def __init__(self, weight: Optional[Callable[[Proxy], float]] = None) -> None:
+        self.weight = weight
+
+    def prepare(self, proxies: Tuple[Proxy, ...]) -> Any:
+        if self.weight is None or not proxies:
+            return None
+
+        weights = [float(self.weight(proxy)) for proxy in proxies]
+        total = sum(weights)
+        if total <= 0:
+            return None
+
+        count = len(weights)
+        scaled = [weight * count / total for weight in weights]
+        probability = [1.0] * count
+        alias = list(range(count))
+        small = [index for index, value in enumerate(scaled) if value < 1.0]
+        large = [index for index, value in enumerate(scaled) if value >= 1.0]
+        while small and large:
+            less, more = small.pop(), large.pop()
+            probability[less] = scaled[less]
+            alias[less] = more
+            scaled[more] -= 1.0 - scaled[less]
+            (small if scaled[more] < 1.0 else large).append(more)
+        return probability, alias
+
+    def select(self, proxies: Tuple[Proxy, ...], state: Any, key: Optional[str] = None) -> Proxy:
+        index = int(random.random() * len(proxies))
+        if state is None:
+            return proxies[index]
+        probability, alias = state
+        return proxies[index if random.random() < probability[index] else alias[index]]
+
+
+class LeastRecentlyUsedStrategy(RotationStrategy):
+    """
+    Hand out the proxy whose last use is the longest ago.
+
+    A proxy counts as used when it is selected and again when its outcome is reported with
+    ``record``, so a proxy held by a long request goes to the back of the line when the request
+    ends. Proxies never used come first. The order is kept in a heap, so a selection costs
+    ``O(log n)``; unlike the other strategies, it takes a short lock.
+    """
+
+    def __init__(self) -> None:
+        self._clock = itertools.count(1)
+        self._last_used: Dict[str, int] = {}
+        # (last use, index, proxy) entries; outdated ones are skipped when popped.
+        self._heap: List[Tuple[int, int, Proxy]] = []
+        self._proxies: Dict[str, Tuple[int, Proxy]] = {}
+        self._lock = threading.Lock()
+
+    def prepare(self, proxies: Tuple[Proxy, ...]) -> Any:
+        with self._lock:
+            self._proxies = {proxy.id: (index, proxy) for index, proxy in enumerate(proxies)}
+            self._last_used = {proxy_id: used for proxy_id, used in self._last_used.items() if proxy_id in self._proxies}
+            self._rebuild()
+        return None
+
+    def _rebuild(self) -> None:
+        self._heap = [(self._last_used.get(proxy_id, 0), index, proxy) for proxy_id, (index, proxy) in self._proxies.items()]
+        heapq.heapify(self._heap)
+
+    def _touch(self, index: int, proxy: Proxy) -> None:
+        used = next(self._clock)
+        self._last_used[proxy.id] = used
+        heapq.heappush(self._heap, (used, index, proxy))
+        if len(self._heap) > 2 * len(self._proxies) + 64:
+            self._rebuild()
+
+    def select(self, proxies: Tuple[Proxy, ...], state: Any, key: Optional[str] = None) -> Proxy:
+        with self._lock:
+            while True:
+                used, index, proxy = heapq.heappop(self._heap)
+                if self._last_used.get(proxy.id, 0) == used:
+                    break
+            self._touch(index, proxy)
+            return proxy
+
+    def record(self, proxy: Proxy, latency: Optional[float] = None, ok: bool = True, key: Optional[str] = None) -> None:
+        """
+        Mark a proxy as used when its request ends.
+
+        Parameters:
+            proxy (Proxy): The proxy used.
+            latency (float, optional): Ignored.
+            ok (bool, optional): Ignored.
+            key (str, optional): Ignored.
+        """
+        with self._lock:
+            entry = self._proxies.get(proxy.id)
+            if entry is not None:
+                self._touch(*entry)
+
+
+class StickyStrategy(RotationStrategy):
+    """
+    Keep handing the same proxy to the same key.
+
+    Keys without an assignment, or whose proxy has left the pool, are assigned by the fallback strategy.
+
+    Parameters:
+        fallback (RotationStrategy, optional): The strategy used for new keys; round-robin by default.
+        max_keys (int, optional): The number of assignments kept before the oldest ones are dropped.
+    """
+
+    def __init__(self, fallback: Optional[RotationStrategy] = None, max_keys: int = 100000) -> None:
+        self.fallback = fallback or RoundRobinStrategy()
+        self.max_keys = max_keys
+        self._assignments: Dict[str, Proxy] = {}
+
+    def prepare(self, proxies: Tuple[Proxy, ...]) -> Any:
+        # Point kept keys at the new Proxy objects, so callers that look proxies up in the new set find them.
+        by_id = {proxy.id: proxy for proxy in proxies}
+        self._assignments = {key: by_id[proxy.id] for key, proxy in list(self._assignments.items()) if proxy.id in by_id}
+        return self.fallback.prepare(proxies)
+
+    def select(self, proxies: Tuple[Proxy, ...], state: Any, key: Optional[str] = None) -> Proxy:
+        if key is None:
+            return self.fallback.select(proxies, state)
+
+        assignments = self._assignments
+        proxy = assignments.get(key)
+        if proxy is not None:
+            return proxy
+
+        if len(assignments) >= self.max_keys:
+            try:
+                del assignments[next(iter(assignments))]
+            except (KeyError, StopIteration, RuntimeError):
+                pass
+        return assignments.setdefault(key, self.fallback.select(proxies, state))
+
+    def assign(self, key: str, proxy: Proxy) -> None:
+        """
+        Pin a key to a proxy, e.g. after its previous proxy failed and another one worked.
+
+        Parameters:
+            key (str): The session key.
+            proxy (Proxy): The proxy the key should use from now on.
+        """
+        self._assignments[key] = proxy
+
+
+class LatencyAwareStrategy(RotationStrategy):
+    """
+    Prefer proxies that have been fast and reliable, using the power of two choices.
+
+    Each selection samples two proxies at random and returns the one with the lower cost, so picking
+    is O(1) for any pool size while slow proxies are chosen far less often. The cost of a proxy is its
+    exponentially weighted moving average (EWMA) latency plus its EWMA error rate times
+    ``failure_cost``. Proxies without observations cost ``initial_latency``, so new proxies are tried
+    early. As a proxy's observations age its cost fades back towards ``initial_latency`` over
+    ``decay`` seconds, so a proxy that had a bad spell is eventually tried again.
+
+    Observations are fed with ``record`` (or ``ProxyRotator.record``) after each use and are keyed
+    by ``Proxy.id``. Concurrent ``record`` calls for the same proxy may occasionally drop one
+    observation, which the averages absorb.
+
+    Parameters:
+        alpha (float, optional): The weight of each new observation, between 0 and 1.
+        failure_cost (float, optional): The seconds of latency an error rate of 1.0 is worth.
+        decay (float, optional): Seconds for an unobserved proxy's cost to fade by a factor of e; 0 disables fading.
+        initial_latency (float, optional): The cost of a proxy without observations, in seconds.
+    """
+
+    def __init__(self, alpha: float = 0.3, failure_cost: float = 5.0, decay: float = 60.0, initial_latency: float = 0.0) -> None:
+        if not 0 < alpha <= 1:
+            raise ValueError("alpha must be in (0, 1]")
+        self.alpha = alpha
+        self.failure_cost = failure_cost
+        self.decay = decay
+        self.initial_latency = initial_latency
+        # Proxy ID -> (EWMA latency, EWMA error rate, monotonic time of the last observation).
+        self._stats: Dict[str, Tuple[float, float, float]] = {}
+
+    def prepare(self, proxies: Tuple[Proxy, ...]) -> Any:
+        ids = {proxy.id for proxy in proxies}
+        self._stats = {proxy_id: entry for proxy_id, entry in list(self._stats.items()) if proxy_id in ids}
+        return None
+
+    def select(self, proxies: Tuple[Proxy, ...], state: Any, key: Optional[str] = None) -> Proxy:
+        count = len(proxies)
+        if count == 1:
+            return proxies[0]
+        first = int(random.random() * count)
+        second = int(random.random() * (count - 1))
+        if second >= first:
+            second += 1
+        now = time.monotonic()
+        a, b = proxies[first], proxies[second]
+        return a if self.cost(a, now) <= self.cost(b, now) else b
+
+    def record(self, proxy: Proxy, latency: Optional[float] = None, ok: bool = True, key: Optional[str] = None) -> None:
+        """
+        Record one use of a proxy.
+
+        Parameters:
+            proxy (Proxy): The proxy that was used.
+            latency (float, optional): The observed round-trip time in seconds; leave out for failures without a timing.
+            ok (bool, optional): Whether the proxy worked.
+            key (str, optional): Ignored; the statistics are per proxy.
+        """
+        error = 0.0 if ok else 1.0
+        entry = self._stats.get(proxy.id)
+        if entry is None:
+            self._stats[proxy.id] = (self.initial_latency if latency is None else latency, error, time.monotonic())
+            return
+        average, errors, _ = entry
+        if latency is not None:
+            average += self.alpha * (latency - average)
+        errors += self.alpha * (error - errors)
+        self._stats[proxy.id] = (average, errors, time.monotonic())
+
+    def cost(self, proxy: Proxy, now: Optional[float] = None) -> float:
+        """
+        The current cost of a proxy; lower is better.
+
+        Parameters:
+            proxy (Proxy): The proxy.
+            now (float, optional): The ``time.monotonic()`` value to age the observations to.
+
+        Returns:
+            float: The expected latency in seconds, with errors counted as ``failure_cost``.
+        """
+        entry = self._stats.get(proxy.id)
+        if entry is None:
+            return self.initial_latency
+        average, errors, updated = entry
+        cost = average + errors * self.failure_cost
+        if self.decay:
+            age = (time.monotonic() if now is None else now) - updated
+            cost = self.initial_latency + (cost - self.initial_latency) * math.exp(-age / self.decay)
+        return cost
+
+    def stats(self, proxy: Proxy) -> Optional[Tuple[float, float]]:
+        """
+        The averages recorded for a proxy.
+
+        Parameters:
+            proxy (Proxy): The proxy.
+
+        Returns:
+            tuple: The EWMA latency in seconds and the EWMA error rate, or None if it has no observations.
+        """
+        entry = self._stats.get(proxy.id)
+        return None if entry is None else entry[:2]
+
+
+class ProxyRotator:
+    """
+    Hand out proxies to concurrent workers according to a selection strategy.
+
+    Selection is lock-free, so a single rotator can be shared by many threads and by coroutines on
+    an event loop. ``update`` swaps in a new proxy set atomically.
+
+    Parameters:
+        proxies (iterable of Proxy, optional): The proxies to rotate through.
+        strategy (RotationStrategy, optional): The selection strategy; round-robin by default.
+    """
+
+    def __init__(self, proxies: Iterable[Proxy] = (), strategy: Optional[RotationStrategy] = None) -> None:
+        self.strategy = strategy or RoundRobinStrategy()
+        self._claim = getattr(self.strategy, "claim", None)
+        self._snapshot: Tuple[Tuple[Proxy, ...], Any] = ((), None)
+        self.update(proxies)
+
+    @classmethod
+    def from_list(cls, proxies_list: ProxiesList, strategy: Optional[RotationStrategy] = None) -> "ProxyRotator":
+        """
+        Build a rotator from a ``ProxiesList`` page.
+
+        Parameters:
+            proxies_list (ProxiesList): The proxies to rotate through.
+            strategy (RotationStrategy, optional): The selection strategy.
+
+        Returns:
+            ProxyRotator: The new rotator.
+        """
+        return cls(proxies_list.get_results(), strategy=strategy)
+
+    def __len__(self) -> int:
+        return len(self._snapshot[0])
+
+    @property
+    def proxies(self) -> Sequence[Proxy]:
+        return self._snapshot[0]
+
+    def update(self, proxies: Iterable[Proxy]) -> None:
+        """
+        Replace the set of proxies being rotated.
+
+        Parameters:
+            proxies (iterable of Proxy): The new proxies.
+        """
+        proxies = tuple(proxies)
+        self._snapshot = (proxies, self.strategy.prepare(proxies))
+
+    def get(self, key: Optional[str] = None, exclude: Optional[Container[Proxy]] = None) -> Proxy:
+        """
+        Select a proxy.
+
+        Parameters:
+            key (str, optional): A session key used by sticky strategies.
+            exclude (container of Proxy, optional): Proxies not to return, e.g. ones that already
+                failed for this request. If the strategy picks one of them, another proxy is chosen at random.
+
+        Returns:
+            Proxy: The selected proxy.
+
+        Raises:
+            ValueError: If there are no proxies to rotate through, or all of them are excluded.
+        """
+        proxies, state = self._snapshot
+        if not proxies:
+            raise ValueError("No proxies available for rotation")
+        proxy = self.strategy.select(proxies, state, key)
+        if exclude and proxy in exclude:
+            # Spread failovers over the remaining proxies rather than piling them onto the first one.
+            remaining = [proxy for proxy in proxies if proxy not in exclude]
+            if not remaining:
+                raise ValueError("Every proxy has been excluded")
+            proxy = random.choice(remaining)
+        if self._claim is not None:
+            self._claim(proxy)
+        return proxy
+
+    def record(self, proxy: Proxy, latency: Optional[float] = None, ok: bool = True, key: Optional[str] = None) -> None:
+        """
+        Report how a proxy performed to strategies that learn from it, such as ``LatencyAwareStrategy``.
+
+        Other strategies ignore the report, so callers can always feed it.
+
+        Parameters:
+            proxy (Proxy): The proxy that was used.
+            latency (float, optional): The observed round-trip time in seconds.
+            ok (bool, optional): Whether the proxy worked.
+            key (str, optional): The key the proxy was selected with.
+        """
+        record = getattr(self.strategy, "record", None)
+        if record is not None:
+            record(proxy, latency, ok, key)
+
+
+def is_success(status: int) -> bool:
+    """
+    The default response classifier of the proxy routers: whether a response status shows the proxy
+    worked for its target. Blocks such as 403 and 429 count as failures, so learning strategies move
+    away from proxies a site refuses; a 404 is the target's answer, not the proxy's fault.
+
+    Parameters:
+        status (int): The HTTP status code.
+
+    Returns:
+        bool: True if the request through the proxy succeeded.
+    """
+    return status < 400 or status == 404
@@ -0,0 +1,192 @@
+import time
+import threading
+from collections import OrderedDict
+from urllib.parse import quote
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.exceptions import ConnectTimeout, ProxyError
+
+from .objects import Proxy, ProxiesList
+from .rotation import ProxyRotator, RotationStrategy, StickyStrategy, is_success
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+def proxy_url(proxy: Proxy, scheme: str = "http") -> str:
+    """
+    Format a proxy as a URL usable in a ``requests`` ``proxies`` mapping.
+
+    Parameters:
+        proxy (Proxy): The proxy.
+        scheme (str, optional): The proxy protocol, ``http`` or ``socks5``.
+
+    Returns:
+        str: The URL, with the credentials percent-encoded.
+    """
+    credentials = ""
+    if proxy.username:
+        credentials = f"{quote(proxy.username, safe='')}:{quote(proxy.password or '', safe='')}@"
+    return f"{scheme}://{credentials}{proxy.proxy_address}:{proxy.port}"
+
+
+class ProxyRoutingAdapter(HTTPAdapter):
+    """
+    A ``requests`` transport adapter that sends every request through a proxy from a rotation.
+
+    Proxy URLs are formatted once when the proxies are set, not per request. A request that cannot
+    reach its proxy (a connection error, a connect timeout, or a 407 from the proxy) is retried
+    through a different proxy, up to ``max_failover`` times; with a sticky strategy the key is then
+    pinned to the proxy that worked. Responses from the target server are returned as they are, and
+    read timeouts and other transport errors are raised. Each outcome, including those errors, is
+    reported to ``rotator.record``, so a
+    ``LatencyAwareStrategy`` learns which proxies are fast; ``is_success`` decides whether a response
+    counts as a success, and by default target blocks such as 403 and 429 do not.
+
+    The sticky key is read from the ``session_header`` request header, which is removed before the
+    request is sent, or computed by ``key_func``.
+
+    Parameters:
+        proxies (iterable of Proxy, optional): The proxies to route through.
+        strategy (RotationStrategy, optional): The selection strategy; ``StickyStrategy()`` by default.
+        max_failover (int, optional): How many other proxies to try after the first one fails.
+        session_header (str, optional): The request header carrying the sticky key.
+        key_func (callable, optional): Computes the sticky key from the ``PreparedRequest`` when the header is absent.
+        max_proxy_managers (int, optional): Connection pools kept for the most recently used proxies; older ones are closed.
+        scheme (str, optional): The proxy protocol, ``http`` or ``socks5`` (which needs ``requests[socks]``).
+        is_success (callable, optional): Classifies a response status code as a success of the proxy.
+        **kwargs: Passed to ``HTTPAdapter``, e.g. ``pool_maxsize``.
+    """
+
+    def __init__(self,
+                 proxies: Iterable[Proxy] = (),
+                 strategy: Optional[RotationStrategy] = None,
+                 max_failover: int = 2,
+                 session_header: str = "X-Proxy-Session",
+                 key_func: Optional[Callable[[requests.PreparedRequest], Optional[str]]] = None,
+                 max_proxy_managers: int = 64,
+                 scheme: str = "http",
+                 is_success: Callable[[int], bool] = is_success,
+                 **kwargs: Any) -> None:
+        if max_failover < 0:
+            raise ValueError("max_failover must not be negative")
+        self.strategy = strategy or StickyStrategy()
+        self.max_failover = max_failover
+        self.session_header = session_header
+        self.key_func = key_func
+        self.max_proxy_managers = max_proxy_managers
+        self.scheme = scheme
+        self.is_success = is_success
+        self.failovers = 0
+        # The rotator and the proxy URLs by ID, swapped together so a send always sees a matching pair.
+        self._routes: Tuple[ProxyRotator, Dict[str, Dict[str, str]]] = (ProxyRotator(strategy=self.strategy), {})
+        self._managers_lock = threading.Lock()
+        super().__init__(**kwargs)
+        self.proxy_manager = OrderedDict()
+        self.update(proxies)
+
+    @classmethod
+    def from_list(cls, proxies_list: ProxiesList, **kwargs: Any) -> "ProxyRoutingAdapter":
+        """
+        Build an adapter from a ``get_proxy_list`` page.
+
+        Parameters:
+            proxies_list (ProxiesList): The proxies to route through.
+            **kwargs: Passed to the constructor.
+
+        Returns:
+            ProxyRoutingAdapter: The new adapter.
+        """
+        return cls(proxies_list.get_results(), **kwargs)
+
+    def update(self, proxies: Iterable[Proxy]) -> None:
+        """
+        Replace the proxies being routed through. Requests in flight finish on their current proxy.
+
+        Parameters:
+            proxies (iterable of Proxy): The new proxies.
+        """
+        proxies = tuple(proxies)
+        previous = self._routes[1]
+        urls = {proxy.id: self._route(proxy) for proxy in proxies}
+        self._routes = (ProxyRotator(proxies, strategy=self.strategy), urls)
+
+        current = {mapping["http"] for mapping in urls.values()}
+        removed = {mapping["http"] for mapping in previous.values()} - current
+        with self._managers_lock:
+            for url in removed:
+                manager = self.proxy_manager.pop(url, None)
+                if manager is not None:
+                    manager.clear()
+
+    @property
+    def rotator(self) -> ProxyRotator:
+        return self._routes[0]
+
+    def _route(self, proxy: Proxy) -> Dict[str, str]:
+        url = proxy_url(proxy, self.scheme)
+        return {"http": url, "https": url}
+
+    def session(self) -> requests.Session:
+        """
+        Create a ``requests.Session`` that sends everything through this adapter.
+
+        Returns:
+            requests.Session: The session.
+        """
+        session = requests.Session()
+        session.mount("http://", self)
+        session.mount("https://", self)
+        return session
+
+    def proxy_manager_for(self, proxy: str, **proxy_kwargs: Any) -> Any:
+        with self._managers_lock:
+            manager = self.proxy_manager.get(proxy)
+            if manager is not None:
+                self.proxy_manager.move_to_end(proxy)
+                return manager
+            manager = super().proxy_manager_for(proxy, **proxy_kwargs)
+            while len(self.proxy_manager) > self.max_proxy_managers:
+                _, evicted = self.proxy_manager.popitem(last=False)
+                evicted.clear()
+            return manager
+
+    def send(self, request: requests.PreparedRequest, **kwargs: Any) -> requests.Response:
+        key = request.headers.pop(self.session_header, None)
+        if key is None and self.key_func is not None:
+            key = self.key_func(request)
+        # A streamed body cannot be sent twice.
+        replayable = request.body is None or isinstance(request.body, (bytes, str))
+
+        rotator, urls = self._routes
+        tried = set()
+        for attempt in range(self.max_failover + 1):
+            proxy = rotator.get(key, exclude=tried)
+            tried.add(proxy)
+            if attempt:
+                self.failovers += 1
+            # A sticky assignment made by a concurrent send after an update may not be in this map yet.
+            kwargs["proxies"] = urls.get(proxy.id) or self._route(proxy)
+            last = attempt == self.max_failover or not replayable or len(tried) == len(rotator)
+            started = time.perf_counter()
+            try:
+                response = super().send(request, **kwargs)
+            except (ProxyError, ConnectTimeout):
+                rotator.record(proxy, ok=False, key=key)
+                if last:
+                    raise
+                continue
+            except requests.RequestException:
+                # The request may have reached the target, so it is not retried, but the proxy still failed it.
+                rotator.record(proxy, ok=False, key=key)
+                raise
+            if response.status_code == 407:
+                rotator.record(proxy, ok=False, key=key)
+                if not last:
+                    response.close()
+                    continue
+            else:
+                rotator.record(proxy, time.perf_counter() - started, self.is_success(response.status_code), key)
+            if attempt and key is not None:
+                assign = getattr(self.strategy, "assign", None)
+                if assign is not None:
+                    assign(key, proxy)
+            return response
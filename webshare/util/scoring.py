@@ -0,0 +1,196 @@
+import time
+import random
+import threading
+from collections import OrderedDict
+from urllib.parse import urlsplit
+
+from .objects import Proxy
+from .rotation import RotationStrategy
+from typing import Any, Dict, Optional, Tuple
+
+def target_domain(url: str) -> str:
+    """
+    Get the host name of a URL, lower-cased, for use as a scoring key.
+
+    Parameters:
+        url (str): The target URL.
+
+    Returns:
+        str: The host name, or an empty string if the URL has none.
+    """
+    return (urlsplit(url).hostname or "").lower()
+
+
+class DomainScorer:
+    """
+    Success and failure counts per (proxy, target domain) pair.
+
+    Each pair holds a Beta posterior over the proxy's success rate on that domain, starting from
+    ``prior``. Counts decay with a half-life, so a proxy that gets blocked, or unblocked, is noticed
+    again. The least recently updated pairs are evicted beyond ``max_entries``, which keeps memory
+    bounded however many pairs are seen; an evicted pair simply starts again from the prior.
+
+    Parameters:
+        half_life (float, optional): Seconds for an observation to lose half its weight; 0 disables decay.
+        max_entries (int, optional): The number of (proxy, domain) pairs kept.
+        prior (tuple, optional): The Beta prior as ``(successes, failures)``.
+        max_domains (int, optional): The number of domains whose best proxy is remembered.
+    """
+
+    def __init__(self, half_life: float = 3600.0, max_entries: int = 1000000, prior: Tuple[float, float] = (1.0, 1.0), max_domains: int = 100000) -> None:
+        if prior[0] <= 0 or prior[1] <= 0:
+            raise ValueError("prior counts must be positive")
+        self.half_life = half_life
+        self.max_entries = max_entries
+        self.prior = prior
+        self.max_domains = max_domains
+        # (domain, proxy ID) -> (successes, failures, monotonic time of the last update).
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[float, float, float]]" = OrderedDict()
+        # domain -> ID of the proxy with the best success rate seen there.
+        self._leaders: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _decayed(self, entry: Optional[Tuple[float, float, float]], now: float) -> Tuple[float, float]:
+        if entry is None:
+            return 0.0, 0.0
+        successes, failures, updated = entry
+        if self.half_life and now > updated:
+            weight = 0.5 ** ((now - updated) / self.half_life)
+            return successes * weight, failures * weight
+        return successes, failures
+
+    def record(self, proxy: Proxy, domain: str, ok: bool) -> None:
+        """
+        Count one request through a proxy to a domain.
+
+        Parameters:
+            proxy (Proxy): The proxy used.
+            domain (str): The target domain, e.g. from ``target_domain``.
+            ok (bool): Whether the request succeeded.
+        """
+        now = time.monotonic()
+        key = (domain, proxy.id)
+        with self._lock:
+            successes, failures = self._decayed(self._entries.get(key), now)
+            if ok:
+                successes += 1.0
+            else:
+                failures += 1.0
+            self._entries[key] = (successes, failures, now)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+            leader = self._leaders.get(domain)
+            if leader == proxy.id:
+                if not ok:
+                    del self._leaders[domain]
+                else:
+                    self._leaders.move_to_end(domain)
+            elif ok and (leader is None or self._mean(successes, failures) >= self.success_rate(leader, domain, now)):
+                self._leaders[domain] = proxy.id
+                self._leaders.move_to_end(domain)
+                while len(self._leaders) > self.max_domains:
+                    self._leaders.popitem(last=False)
+
+    def _mean(self, successes: float, failures: float) -> float:
+        alpha, beta = self.prior[0] + successes, self.prior[1] + failures
+        return alpha / (alpha + beta)
+
+    def success_rate(self, proxy_id: str, domain: str, now: Optional[float] = None) -> float:
+        """
+        The expected success rate of a proxy on a domain (the posterior mean).
+
+        Parameters:
+            proxy_id (str): The proxy ID.
+            domain (str): The target domain.
+            now (float, optional): The ``time.monotonic()`` value to decay the counts to.
+
+        Returns:
+            float: A rate between 0 and 1.
+        """
+        return self._mean(*self._decayed(self._entries.get((domain, proxy_id)), time.monotonic() if now is None else now))
+
+    def sample(self, proxy_id: str, domain: str, now: Optional[float] = None) -> float:
+        """
+        Draw a success rate from the posterior of a proxy on a domain (Thompson sampling).
+
+        Parameters:
+            proxy_id (str): The proxy ID.
+            domain (str): The target domain.
+            now (float, optional): The ``time.monotonic()`` value to decay the counts to.
+
+        Returns:
+            float: A rate between 0 and 1.
+        """
+        successes, failures = self._decayed(self._entries.get((domain, proxy_id)), time.monotonic() if now is None else now)
+        return random.betavariate(self.prior[0] + successes, self.prior[1] + failures)
+
+    def leader(self, domain: str) -> Optional[str]:
+        """
+        The ID of the proxy with the best success rate seen on a domain, if any.
+
+        Parameters:
+            domain (str): The target domain.
+
+        Returns:
+            str: The proxy ID, or None.
+        """
+        return self._leaders.get(domain)
+
+
+class BanditStrategy(RotationStrategy):
+    """
+    Choose proxies per target domain with Thompson sampling, so proxies blocked by one site stop
+    being used for it while they keep serving others.
+
+    The selection key is the target domain (see ``target_domain``). Each selection draws a success
+    rate for ``candidates`` randomly sampled proxies plus the domain's best proxy so far, and returns
+    the highest draw. Selection therefore costs the same for any pool size. Proxies with few
+    observations have wide posteriors and are explored, while proven ones are exploited. Outcomes are
+    fed with ``record`` (or ``ProxyRotator.record``) using the same key.
+
+    Parameters:
+        scorer (DomainScorer, optional): Where outcomes are kept; can be shared between strategies.
+        candidates (int, optional): The number of random proxies compared per selection.
+    """
+
+    def __init__(self, scorer: Optional[DomainScorer] = None, candidates: int = 8) -> None:
+        if candidates < 1:
+            raise ValueError("candidates must be at least 1")
+        self.scorer = scorer if scorer is not None else DomainScorer()
+        self.candidates = candidates
+
+    def prepare(self, proxies: Tuple[Proxy, ...]) -> Any:
+        return {proxy.id: proxy for proxy in proxies}
+
+    def select(self, proxies: Tuple[Proxy, ...], state: Dict[str, Proxy], key: Optional[str] = None) -> Proxy:
+        domain = key or ""
+        count = len(proxies)
+        if count <= self.candidates:
+            candidates = list(proxies)
+        else:
+            draw = random.random
+            # Sampling with replacement; an occasional duplicate candidate is harmless.
+            candidates = [proxies[int(draw() * count)] for _ in range(self.candidates)]
+            leader = state.get(self.scorer.leader(domain))
+            if leader is not None:
+                candidates.append(leader)
+
+        scorer, now = self.scorer, time.monotonic()
+        return max(candidates, key=lambda proxy: scorer.sample(proxy.id, domain, now))
+
+    def record(self, proxy: Proxy, latency: Optional[float] = None, ok: bool = True, key: Optional[str] = None) -> None:
+        """
+        Record the outcome of a request through a proxy.
+
+        Parameters:
+            proxy (Proxy): The proxy used.
+            latency (float, optional): Ignored; accepted so any strategy can be fed the same way.
+            ok (bool, optional): Whether the request succeeded.
+            key (str, optional): The target domain the request went to.
+        """
+        self.scorer.record(proxy, key or "", ok)
@@ -0,0 +1,143 @@
+import asyncio
+import threading
+
+from .metrics import endpoint_template
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+# GET endpoints without side effects, as ``endpoint_template`` patterns. GETs such as
+# ``notification/{id}/dismiss/`` and ``logout/`` change state, so every call must reach the API.
+READ_ONLY_ENDPOINTS = frozenset((
+    "profile/",
+    "activation/",
+    "proxy/config/",
+    "proxy/list/",
+    "proxy/list/replaced/",
+    "proxy/ipauthorization/",
+    "proxy/ipauthorization/whatsmyip/",
+    "notification/",
+    "notification/{id}/",
+    "apikey/",
+    "apikey/{id}/",
+))
+
+
+def coalescable(endpoint: str) -> bool:
+    """
+    Whether concurrent GETs of an endpoint may share one request.
+
+    Parameters:
+        endpoint (str): The endpoint path relative to the API base URL.
+
+    Returns:
+        bool: True if the endpoint is read-only.
+    """
+    return endpoint_template(endpoint) in READ_ONLY_ENDPOINTS
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException = None
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls with the same key into one execution.
+
+    The first thread to call ``do`` with a key runs the function; threads that arrive with the
+    same key while it is running wait for it and receive the same result, or the same exception.
+    Once the call finishes the key is forgotten, so later calls run again.
+    """
+
+    def __init__(self) -> None:
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+        self.executed = 0
+        self.shared = 0
+
+    def do(self, key: Hashable, function: Callable[[], Any]) -> Any:
+        """
+        Run ``function`` unless a call with the same key is already in flight.
+
+        Parameters:
+            key (hashable): Identifies equivalent calls.
+            function (callable): Called with no arguments by the first caller only.
+
+        Returns:
+            The function's result, shared with every caller that joined the flight.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.executed += 1
+            else:
+                self.shared += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = function()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
+
+
+class AsyncSingleFlight:
+    """
+    The asyncio counterpart of ``SingleFlight`` for coroutines running on one event loop.
+
+    The shared call runs as its own task and every caller awaits it through ``asyncio.shield``,
+    so cancelling one waiter does not cancel the request the others are waiting for.
+    """
+
+    def __init__(self) -> None:
+        self._tasks: Dict[Hashable, asyncio.Future] = {}
+        self.executed = 0
+        self.shared = 0
+
+    async def do(self, key: Hashable, function: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Await ``function()`` unless a call with the same key is already in flight.
+
+        Parameters:
+            key (hashable): Identifies equivalent calls.
+            function (callable): A coroutine function called with no arguments by the first caller only.
+
+        Returns:
+            The coroutine's result, shared with every caller that joined the flight.
+        """
+        task = self._tasks.get(key)
+        if task is not None:
+            self.shared += 1
+        else:
+            task = self._tasks[key] = asyncio.ensure_future(function())
+            self.executed += 1
+            task.add_done_callback(lambda done: self._finish(key, done))
+        return await asyncio.shield(task)
+
+    def _finish(self, key: Hashable, task: asyncio.Future) -> None:
+        if self._tasks.get(key) is task:
+            del self._tasks[key]
+        # Mark the exception as retrieved in case every waiter was cancelled.
+        if not task.cancelled():
+            task.exception()
+
+    def in_flight(self) -> int:
+        return len(self._tasks)
@@ -0,0 +1,240 @@
+import os
+import sys
+import json
+import mmap
+import time
+import array
+import struct
+import logging
+import threading
+
+from .objects import Proxy
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional
+
+MAGIC = b"WSPS"
+FORMAT_VERSION = 1
+
+# magic, format version, reserved, metadata length
+_HEADER = struct.Struct("<4sHHI")
+
+logger = logging.getLogger(__name__)
+
+
+class ProxySnapshot:
+    """
+    A proxy list loaded from a snapshot file.
+
+    The file is memory-mapped and records are only decoded when they are accessed, so opening a
+    snapshot costs the same regardless of how many proxies it holds.
+
+    File layout: a fixed header, a JSON metadata block, a table of ``count + 1`` little-endian
+    64-bit record offsets, then each proxy as compact JSON.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        try:
+            size = len(self._mmap)
+            if size < _HEADER.size:
+                raise ValueError(f"{path} is truncated")
+            magic, version, _, meta_length = _HEADER.unpack_from(self._mmap, 0)
+            if magic != MAGIC:
+                raise ValueError(f"{path} is not a proxy snapshot")
+            if version != FORMAT_VERSION:
+                raise ValueError(f"Unsupported snapshot format version {version}")
+
+            start = _HEADER.size
+            self.metadata: Dict[str, Any] = json.loads(self._mmap[start:start + meta_length])
+            count = self.metadata.get("count") if isinstance(self.metadata, dict) else None
+            if not isinstance(count, int) or count < 0:
+                raise ValueError(f"{path} has no valid record count")
+            start += meta_length
+            end = start + 8 * (count + 1)
+            if end > size:
+                raise ValueError(f"{path} is truncated")
+
+            with memoryview(self._mmap)[start:end] as table:
+                if sys.byteorder == "little":
+                    self._offsets = table.cast("Q")
+                else:
+                    # The table is stored little-endian; big-endian hosts decode a swapped copy.
+                    self._offsets = array.array("Q")
+                    self._offsets.frombytes(table)
+                    self._offsets.byteswap()
+            if self._offsets[0] != end or self._offsets[count] > size:
+                self._release_offsets()
+                raise ValueError(f"{path} is truncated or corrupt")
+        except Exception:
+            self._mmap.close()
+            raise
+
+    def __enter__(self) -> "ProxySnapshot":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self.metadata["count"]
+
+    def __getitem__(self, index: int) -> Proxy:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("snapshot index out of range")
+        return Proxy(json.loads(self._mmap[self._offsets[index]:self._offsets[index + 1]]))
+
+    def __iter__(self) -> Iterator[Proxy]:
+        offsets, data = self._offsets, self._mmap
+        for index in range(len(self)):
+            yield Proxy(json.loads(data[offsets[index]:offsets[index + 1]]))
+
+    @property
+    def fetched_at(self) -> float:
+        return self.metadata["fetched_at"]
+
+    @property
+    def params(self) -> Dict[str, Any]:
+        return self.metadata["params"]
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.fetched_at
+
+    def close(self) -> None:
+        self._release_offsets()
+        self._mmap.close()
+
+    def _release_offsets(self) -> None:
+        # The mapping cannot be closed while a view into it is still exported.
+        if isinstance(self._offsets, memoryview):
+            self._offsets.release()
+
+
+def save_snapshot(path: str, proxies: Iterable[Proxy], params: Optional[Dict[str, Any]] = None, fetched_at: Optional[float] = None) -> int:
+    """
+    Write proxies to a snapshot file.
+
+    The file is written next to ``path`` and then renamed over it, so readers never see a partial snapshot.
+
+    Parameters:
+        path (str): The snapshot file path.
+        proxies (iterable of Proxy): The proxies to store.
+        params (dict, optional): The filters the proxies were fetched with.
+        fetched_at (float, optional): The fetch time as a Unix timestamp; now by default.
+
+    Returns:
+        int: The number of proxies written.
+    """
+    records = [json.dumps(proxy.data, separators=(",", ":")).encode() for proxy in proxies]
+    metadata = json.dumps({
+        "count": len(records),
+        "fetched_at": time.time() if fetched_at is None else fetched_at,
+        "params": params or {},
+    }, separators=(",", ":")).encode()
+
+    offset = _HEADER.size + len(metadata) + 8 * (len(records) + 1)
+    offsets = [offset]
+    for record in records:
+        offset += len(record)
+        offsets.append(offset)
+
+    temporary_path = f"{path}.{os.getpid()}.tmp"
+    with open(temporary_path, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, FORMAT_VERSION, 0, len(metadata)))
+        f.write(metadata)
+        f.write(struct.pack(f"<{len(offsets)}Q", *offsets))
+        f.writelines(records)
+    os.replace(temporary_path, path)
+    return len(records)
+
+
+class SnapshotStore:
+    """
+    Serve a proxy list from a snapshot file and keep it current in the background.
+
+    ``load`` returns the snapshot on disk when it exists and was taken with the same filters, and
+    only falls back to a blocking download when there is nothing usable. ``refresh`` downloads the
+    list with ``ApiClient.fetch_all_proxies``, rewrites the file and swaps the new snapshot in.
+
+    Parameters:
+        client (ApiClient): The client used to download the proxy list.
+        path (str): The snapshot file path.
+        **filters: The ``fetch_all_proxies`` filters (``mode``, ``country_code_in``, ``search``, ``ordering``).
+    """
+
+    def __init__(self, client, path: str, **filters) -> None:
+        self.client = client
+        self.path = path
+        self.filters = filters
+        self.snapshot: Optional[ProxySnapshot] = None
+        self._lock = threading.Lock()
+
+    def load(self, refresh: bool = True, on_refresh: Optional[Callable[[ProxySnapshot], None]] = None) -> ProxySnapshot:
+        """
+        Open the snapshot, downloading the list first if no usable snapshot exists.
+
+        Parameters:
+            refresh (bool, optional): Start a background refresh when an existing snapshot was opened.
+            on_refresh (callable, optional): Called with the new snapshot after a background refresh.
+
+        Returns:
+            ProxySnapshot: The loaded snapshot.
+        """
+        try:
+            snapshot = ProxySnapshot(self.path)
+        except (OSError, ValueError, KeyError, BufferError):
+            return self.refresh()
+
+        if snapshot.params != self.filters:
+            snapshot.close()
+            return self.refresh()
+
+        self.snapshot = snapshot
+        if refresh:
+            self.refresh_in_background(on_refresh)
+        return snapshot
+
+    def refresh(self) -> ProxySnapshot:
+        """
+        Download the proxy list, rewrite the snapshot file and swap the new snapshot in.
+
+        Returns:
+            ProxySnapshot: The new snapshot.
+        """
+        fetched_at = time.time()
+        proxies = list(self.client.fetch_all_proxies(**self.filters))
+        with self._lock:
+            save_snapshot(self.path, proxies, self.filters, fetched_at)
+            snapshot = ProxySnapshot(self.path)
+        # The previous snapshot is left open for readers still holding it; its mapping is
+        # released when the last reference goes away.
+        self.snapshot = snapshot
+        return snapshot
+
+    def refresh_in_background(self, on_refresh: Optional[Callable[[ProxySnapshot], None]] = None) -> threading.Thread:
+        """
+        Run ``refresh`` on a daemon thread.
+
+        A failed refresh is logged and leaves the current snapshot in place.
+
+        Parameters:
+            on_refresh (callable, optional): Called with the new snapshot once the refresh completes.
+
+        Returns:
+            threading.Thread: The started thread.
+        """
+        def run() -> None:
+            try:
+                snapshot = self.refresh()
+                if on_refresh is not None:
+                    on_refresh(snapshot)
+            except Exception:
+                logger.exception("Background snapshot refresh of %s failed", self.path)
+
+        thread = threading.Thread(target=run, name="webshare-snapshot-refresh", daemon=True)
+        thread.start()
+        return thread
@@ -0,0 +1,380 @@
+import json
+import codecs
+
+from .objects import Proxy
+from collections import deque
+from typing import Any, AsyncIterable, AsyncIterator, Callable, Dict, Iterable, Iterator, Optional
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+_WHITESPACE = " \t\n\r"
+# Bytes kept from each end of a body for the ijson backend to recover the fields around ``results``.
+_EDGE_SIZE = 4096
+
+
+class StreamedPage:
+    """
+    A list page whose ``results`` are decoded incrementally as the body arrives.
+
+    Iterating the page yields each raw result dict as soon as it is complete. The top-level
+    ``count``, ``next`` and ``previous`` fields are filled in as the parser reaches them: the API
+    sends them before ``results``, so they are normally available once the first result has been
+    yielded, and fields sent after ``results`` are available once iteration finishes.
+
+    Parameters:
+        chunks (iterable of bytes): The response body.
+        backend (str, optional): ``"ijson"`` (requires the ijson package), ``"json"`` (the standard
+            library) or ``"auto"`` to use ijson when it is installed.
+    """
+
+    def __init__(self, chunks: Iterable[bytes], backend: str = "auto") -> None:
+        if backend == "auto":
+            backend = "ijson" if ijson is not None else "json"
+        if backend == "ijson" and ijson is None:
+            raise ValueError("The ijson backend requires the 'ijson' package")
+        if backend not in ("ijson", "json"):
+            raise ValueError(f"Unknown JSON backend: {backend}")
+
+        self.backend = backend
+        self.meta: Dict[str, Any] = {}
+        self._chunks = chunks
+
+    @property
+    def count(self) -> Optional[int]:
+        return self.meta.get("count")
+
+    @property
+    def next(self) -> Optional[str]:
+        return self.meta.get("next")
+
+    @property
+    def previous(self) -> Optional[str]:
+        return self.meta.get("previous")
+
+    def __iter__(self) -> Iterator[dict]:
+        if self.backend == "ijson":
+            return self._iter_ijson()
+        return self._iter_json()
+
+    def _iter_ijson(self) -> Iterator[dict]:
+        reader = _ChunkReader(self._chunks)
+        for item in ijson.items(reader, "results.item", use_float=True):
+            if not self.meta:
+                self.meta.update(_head_meta(reader.head))
+            yield item
+        if not self.meta:
+            self.meta.update(_head_meta(reader.head))
+        for key, value in _tail_meta(reader.tail).items():
+            self.meta.setdefault(key, value)
+
+    def _iter_json(self) -> Iterator[dict]:
+        parser = _IncrementalParser(self._chunks)
+        parser.expect("{")
+        while not parser.consume("}"):
+            parser.consume(",")
+            key = parser.value()
+            parser.expect(":")
+            if key != "results":
+                self.meta[key] = parser.value()
+                continue
+
+            parser.expect("[")
+            while not parser.consume("]"):
+                parser.consume(",")
+                yield parser.value()
+
+
+class AsyncStreamedPage(StreamedPage):
+    """
+    The asyncio counterpart of ``StreamedPage``, over an async iterable of byte chunks such as
+    ``aiohttp.StreamReader.iter_chunked``. Iterate it with ``async for``.
+
+    The json backend parses whatever has arrived and, when a value is cut off at the end of the
+    data, waits for the next chunk and parses that value again; ijson reads the chunks directly.
+    """
+
+    def __init__(self, chunks: AsyncIterable[bytes], backend: str = "auto") -> None:
+        super().__init__((), backend)
+        self._chunks = chunks
+
+    def __iter__(self) -> Iterator[dict]:
+        raise TypeError("AsyncStreamedPage is iterated with 'async for'")
+
+    def __aiter__(self) -> AsyncIterator[dict]:
+        if self.backend == "ijson":
+            return self._aiter_ijson()
+        return self._aiter_json()
+
+    async def _aiter_ijson(self) -> AsyncIterator[dict]:
+        reader = _AsyncChunkReader(self._chunks)
+        async for item in ijson.items_async(reader, "results.item", use_float=True):
+            if not self.meta:
+                self.meta.update(_head_meta(reader.head))
+            yield item
+        if not self.meta:
+            self.meta.update(_head_meta(reader.head))
+        for key, value in _tail_meta(reader.tail).items():
+            self.meta.setdefault(key, value)
+
+    async def _aiter_json(self) -> AsyncIterator[dict]:
+        parser = _FeedParser()
+        chunks = self._chunks.__aiter__()
+
+        async def step(function: Callable[[], Any]) -> Any:
+            while True:
+                position = parser.position
+                try:
+                    result = function()
+                except _Starved:
+                    parser.position = position
+                    try:
+                        parser.feed(await chunks.__anext__())
+                    except StopAsyncIteration:
+                        parser.close()
+                    continue
+                parser.compact()
+                return result
+
+        def next_value() -> Any:
+            parser.consume(",")
+            return parser.value()
+
+        await step(lambda: parser.expect("{"))
+        while not await step(lambda: parser.consume("}")):
+            key = await step(next_value)
+            await step(lambda: parser.expect(":"))
+            if key != "results":
+                self.meta[key] = await step(parser.value)
+                continue
+
+            await step(lambda: parser.expect("["))
+            while not await step(lambda: parser.consume("]")):
+                yield await step(next_value)
+
+
+class _ChunkReader:
+    """A minimal file-like object over an iterable of byte chunks, as ijson expects."""
+
+    def __init__(self, chunks: Iterable[bytes]) -> None:
+        self._chunks = iter(chunks)
+        self._pending = b""
+        self.head = b""
+        self.tail = b""
+
+    def read(self, size: int = -1) -> bytes:
+        if size == 0:
+            return b""
+        if not self._pending:
+            self._pending = next((chunk for chunk in self._chunks if chunk), b"")
+            if len(self.head) < _EDGE_SIZE:
+                self.head += self._pending[:_EDGE_SIZE - len(self.head)]
+            if len(self._pending) >= _EDGE_SIZE:
+                self.tail = self._pending[-_EDGE_SIZE:]
+            else:
+                self.tail = (self.tail + self._pending)[-_EDGE_SIZE:]
+        if size < 0:
+            size = len(self._pending)
+        data, self._pending = self._pending[:size], self._pending[size:]
+        return data
+
+
+class _AsyncChunkReader(_ChunkReader):
+    """``_ChunkReader`` with the coroutine ``read`` that ``ijson``'s async functions expect."""
+
+    def __init__(self, chunks: AsyncIterable[bytes]) -> None:
+        super().__init__(())
+        self._async_chunks = chunks.__aiter__()
+
+    async def read(self, size: int = -1) -> bytes:
+        if size != 0 and not self._pending:
+            async for chunk in self._async_chunks:
+                if chunk:
+                    self._chunks = iter((chunk,))
+                    break
+        return _ChunkReader.read(self, size)
+
+
+def _head_meta(head: bytes) -> Dict[str, Any]:
+    """
+    Read the top-level fields that precede ``results`` from the start of a list page.
+
+    ``ijson.items`` only reports the results themselves, but the API always sends ``count``,
+    ``next`` and ``previous`` first, so they can be recovered from the first bytes of the body.
+    """
+    parser = _IncrementalParser([head])
+    meta: Dict[str, Any] = {}
+    try:
+        parser.expect("{")
+        while not parser.consume("}"):
+            parser.consume(",")
+            key = parser.value()
+            parser.expect(":")
+            if key == "results":
+                break
+            meta[key] = parser.value()
+    except ValueError:
+        pass
+    return meta
+
+
+def _tail_meta(tail: bytes) -> Dict[str, Any]:
+    """
+    Read the top-level fields that follow ``results`` from the end of a list page.
+
+    The fields start at the comma after the ``]`` that closes ``results``. That is the first comma
+    after which the rest of the body parses as the remainder of an object: any earlier one leaves
+    the closing ``]`` in the text, which does not parse.
+    """
+    text = tail.decode("utf-8", "ignore").rstrip()
+    if not text.endswith("}"):
+        return {}
+    position = text.find(",")
+    while position != -1:
+        try:
+            meta = json.loads("{" + text[position + 1:])
+        except ValueError:
+            position = text.find(",", position + 1)
+            continue
+        return meta if isinstance(meta, dict) else {}
+    return {}
+
+
+class _IncrementalParser:
+    """
+    Decode JSON values one at a time from a stream of byte chunks using ``json``'s C scanner.
+
+    Only the part of the body that has not been consumed yet is kept in memory.
+    """
+
+    def __init__(self, chunks: Iterable[bytes]) -> None:
+        self._chunks = iter(chunks)
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._json = json.JSONDecoder()
+        self._buffer = ""
+        self._position = 0
+        self._eof = False
+
+    def _fill(self) -> bool:
+        if self._eof:
+            return False
+        for chunk in self._chunks:
+            text = self._decoder.decode(chunk)
+            if text:
+                self._buffer = self._buffer[self._position:] + text
+                self._position = 0
+                return True
+        self._eof = True
+        self._buffer = self._buffer[self._position:] + self._decoder.decode(b"", final=True)
+        self._position = 0
+        return True
+
+    def _skip_whitespace(self) -> None:
+        while True:
+            buffer, position = self._buffer, self._position
+            while position < len(buffer) and buffer[position] in _WHITESPACE:
+                position += 1
+            self._position = position
+            if position < len(buffer) or not self._fill():
+                return
+
+    def consume(self, token: str) -> bool:
+        self._skip_whitespace()
+        if self._buffer.startswith(token, self._position):
+            self._position += len(token)
+            return True
+        return False
+
+    def expect(self, token: str) -> None:
+        if not self.consume(token):
+            snippet = self._buffer[self._position:self._position + 20]
+            raise ValueError(f"Expected {token!r} in JSON stream, found {snippet!r}")
+
+    def value(self) -> Any:
+        self._skip_whitespace()
+        while True:
+            try:
+                value, end = self._json.raw_decode(self._buffer, self._position)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            # A number or literal that ends exactly at the buffer edge may continue in the next chunk.
+            if end == len(self._buffer) and not self._eof:
+                self._fill()
+                continue
+            self._position = end
+            return value
+
+
+class _Starved(Exception):
+    """Raised by ``_FeedParser`` when it needs bytes that have not arrived yet."""
+
+
+class _FeedParser(_IncrementalParser):
+    """
+    An ``_IncrementalParser`` that is fed chunks instead of pulling them.
+
+    The buffer is only appended to while a value is being parsed, so a caller that catches
+    ``_Starved`` can rewind ``position``, ``feed`` the next chunk and parse the value again.
+    """
+
+    def __init__(self) -> None:
+        super().__init__(())
+        self._fed: deque = deque()
+        self._closed = False
+
+    @property
+    def position(self) -> int:
+        return self._position
+
+    @position.setter
+    def position(self, position: int) -> None:
+        self._position = position
+
+    def feed(self, chunk: bytes) -> None:
+        self._fed.append(chunk)
+
+    def close(self) -> None:
+        self._closed = True
+
+    def compact(self) -> None:
+        self._buffer = self._buffer[self._position:]
+        self._position = 0
+
+    def _fill(self) -> bool:
+        if self._eof:
+            return False
+        if self._fed:
+            self._buffer += self._decoder.decode(self._fed.popleft())
+            return True
+        if not self._closed:
+            raise _Starved()
+        self._eof = True
+        self._buffer += self._decoder.decode(b"", final=True)
+        return True
+
+
+def parse_proxy_line(line: str) -> Optional[Proxy]:
+    """
+    Parse one ``address:port[:username:password]`` line of the plain-text proxy list export.
+
+    The export carries no proxy IDs, so the ID is derived from the address, port and username. It is
+    stable across downloads, and pools, rotators and breakers need it to tell the proxies apart.
+    Returns None for a blank line.
+    """
+    line = line.strip()
+    if not line:
+        return None
+    fields = line.split(":", 3)
+    port = int(fields[1]) if len(fields) > 1 else None
+    username = fields[2] if len(fields) > 2 else None
+    return Proxy({
+        "id": ":".join(str(field) for field in (fields[0], port, username) if field is not None),
+        "proxy_address": fields[0],
+        "port": port,
+        "username": username,
+        "password": fields[3] if len(fields) > 3 else None,
+    })
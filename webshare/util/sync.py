@@ -0,0 +1,204 @@
+import logging
+import threading
+
+from .objects import Proxy, ProxyReplacement
+from .pool import ProxyPool
+from typing import Dict, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+class SyncResult:
+    """What a single ``ProxySync.sync`` call did."""
+
+    __slots__ = ("full", "removed", "added")
+
+    def __init__(self, full: bool, removed: int = 0, added: int = 0) -> None:
+        self.full = full
+        self.removed = removed
+        self.added = added
+
+    def __repr__(self) -> str:
+        return f"SyncResult(full={self.full}, removed={self.removed}, added={self.added})"
+
+
+class ProxySync:
+    """
+    Keep a ``ProxyPool`` in step with the account's proxy list using the replacement history.
+
+    After one full download, each ``sync`` only reads the replaced-proxies history newer than the
+    last applied entry; when there is nothing new it makes no further requests. Otherwise it removes
+    the replaced proxies and looks up each added address with a ``search`` request. Replacements
+    that were still in progress are remembered by ID and applied once they complete. It falls back to a full download when it cannot prove the delta is complete: the history was
+    not read back to the last applied entry within ``max_history_pages``, or the pool size no longer
+    matches the server's ``count`` afterwards.
+
+    Parameters:
+        client (ApiClient): The client used to talk to the API.
+        pool (ProxyPool, optional): The pool to keep current; a new one is created by default.
+        page_size (int, optional): The page size used for history and full downloads.
+        max_history_pages (int, optional): How many history pages to read before assuming a gap.
+        **filters: The ``get_proxy_list`` filters (``mode``, ``country_code_in``, ``search``).
+    """
+
+    def __init__(self, client, pool: Optional[ProxyPool] = None, page_size: int = 100, max_history_pages: int = 10, **filters) -> None:
+        self.client = client
+        self.pool = pool if pool is not None else ProxyPool()
+        self.page_size = page_size
+        self.max_history_pages = max_history_pages
+        self.filters = filters
+        self.watermark: Optional[str] = None
+        self._watermark_ids: Set[str] = set()
+        self._pending: Set[str] = set()
+        self._loaded = False
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+
+    def full_sync(self) -> SyncResult:
+        """
+        Download the whole proxy list into the pool.
+
+        Returns:
+            SyncResult: The result, with ``full`` set.
+        """
+        with self._lock:
+            return self._full_sync()
+
+    def sync(self) -> SyncResult:
+        """
+        Apply the replacements made since the last sync, or download everything if needed.
+
+        Returns:
+            SyncResult: What was applied.
+        """
+        with self._lock:
+            if not self._loaded:
+                return self._full_sync()
+
+            delta = self._new_replacements()
+            if delta is None:
+                return self._full_sync()
+            replacements, pending = delta
+
+            removed: List[str] = []
+            added: List[Proxy] = []
+            found: Dict[str, List[Proxy]] = {}
+            for replacement in reversed(replacements):
+                for address in replacement.proxies_removed or ():
+                    removed.extend(proxy.id for proxy in self.pool.get_by_address(address))
+                for address in replacement.proxies_added or ():
+                    if address not in found:
+                        found[address] = self._lookup(address)
+                        added.extend(found[address])
+            self.pool.replace(removed, added)
+            self._advance(replacements)
+            self._pending = pending
+
+            if replacements and len(self.pool) != self._server_count():
+                return self._full_sync()
+            return SyncResult(False, len(removed), len(added))
+
+    def run_in_background(self, interval: float = 60.0) -> threading.Thread:
+        """
+        Call ``sync`` every ``interval`` seconds on a daemon thread until ``stop`` is called.
+
+        Errors are logged and do not end the loop; the next tick retries.
+
+        Parameters:
+            interval (float, optional): The number of seconds between syncs.
+
+        Returns:
+            threading.Thread: The started thread.
+        """
+        self._stop.clear()
+
+        def run() -> None:
+            while not self._stop.is_set():
+                try:
+                    self.sync()
+                except Exception:
+                    logger.exception("Background proxy sync failed")
+                self._stop.wait(interval)
+
+        thread = threading.Thread(target=run, name="webshare-proxy-sync", daemon=True)
+        thread.start()
+        return thread
+
+    def stop(self) -> None:
+        """Stop the background loop started by ``run_in_background``."""
+        self._stop.set()
+
+    def _full_sync(self) -> SyncResult:
+        # Read the history head first so replacements made during the download are replayed next time.
+        head = self.client.get_replaced_proxy().get_results()
+        proxies = list(self.client.fetch_all_proxies(page_size=self.page_size, **self.filters))
+
+        self.pool.clear()
+        self.pool.update(proxies)
+        self.watermark = None
+        self._watermark_ids = set()
+        self._advance(head)
+        self._pending = {replacement.id for replacement in head if _is_pending(replacement)}
+        self._loaded = True
+        return SyncResult(True, added=len(proxies))
+
+    def _new_replacements(self) -> Optional[Tuple[List[ProxyReplacement], Set[str]]]:
+        """
+        Return the completed entries to apply, newest first, and the IDs still pending, or None on a gap.
+
+        Pending entries may be older than the watermark by the time they complete, so the history is
+        read past the watermark until every previously pending ID has been seen again.
+        """
+        replacements: List[ProxyReplacement] = []
+        pending: Set[str] = set()
+        unseen = set(self._pending)
+        reached = False
+        limit = self.max_history_pages * self.page_size
+        for position, replacement in enumerate(self.client.iter_replaced_proxies(page_size=self.page_size)):
+            applied = self._is_applied(replacement)
+            reached = reached or applied
+            if applied and not unseen:
+                return replacements, pending
+            if position >= limit:
+                return None
+            if applied and replacement.id not in unseen:
+                continue
+            unseen.discard(replacement.id)
+            if _is_pending(replacement):
+                pending.add(replacement.id)
+            elif replacement.state != "failed":
+                replacements.append(replacement)
+        # Reached the start of the history; that is only complete if nothing was applied before, or
+        # the watermark and every pending entry were found on the way.
+        if self.watermark is None or (reached and not unseen):
+            return replacements, pending
+        return None
+
+    def _is_applied(self, replacement: ProxyReplacement) -> bool:
+        if self.watermark is None or replacement.created_at is None:
+            return False
+        if replacement.created_at == self.watermark:
+            return replacement.id in self._watermark_ids
+        return replacement.created_at < self.watermark
+
+    def _advance(self, replacements: List[ProxyReplacement]) -> None:
+        for replacement in replacements:
+            created_at = replacement.created_at
+            if created_at is None:
+                continue
+            if self.watermark is None or created_at > self.watermark:
+                self.watermark = created_at
+                self._watermark_ids = {replacement.id}
+            elif created_at == self.watermark:
+                self._watermark_ids.add(replacement.id)
+
+    def _lookup(self, address: str) -> List[Proxy]:
+        filters = {name: value for name, value in self.filters.items() if name != "search"}
+        proxies_list = self.client.get_proxy_list(search=address, **filters)
+        return [proxy for proxy in proxies_list.get_results() if proxy.proxy_address == address]
+
+    def _server_count(self) -> int:
+        return self.client.get_proxy_list(page_size=1, **self.filters).count
+
+
+def _is_pending(replacement: ProxyReplacement) -> bool:
+    return replacement.state not in (None, "completed", "failed")
@@ -0,0 +1,280 @@
+import socket
+import struct
+from array import array
+
+from .objects import Proxy, ProxiesList
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+
+_NO_ADDRESS = 0
+_IPV4 = struct.Struct("!I")
+
+
+class ProxyRow(Proxy):
+    """
+    A view of one row of a ``ProxyTable`` with the same properties as ``Proxy``.
+
+    Rows hold no data of their own; ``data`` rebuilds the API dict on demand.
+    """
+
+    __slots__ = ("_table", "_index")
+
+    def __init__(self, table: "ProxyTable", index: int) -> None:
+        self._table = table
+        self._index = index
+
+    def __repr__(self) -> str:
+        return f"ProxyRow(id={self.id!r}, proxy_address={self.proxy_address!r}, port={self.port!r})"
+
+    @property
+    def data(self) -> dict:
+        return self._table.row_dict(self._index)
+
+    @property
+    def id(self) -> str:
+        return self._table.ids[self._index]
+
+    @property
+    def username(self) -> str:
+        return self._table.usernames[self._index]
+
+    @property
+    def password(self) -> str:
+        return self._table.passwords[self._index]
+
+    @property
+    def proxy_address(self) -> str:
+        return self._table.address(self._index)
+
+    @property
+    def port(self) -> int:
+        port = self._table.ports[self._index]
+        return port if port else None
+
+    @property
+    def valid(self) -> bool:
+        value = self._table.valid_flags[self._index]
+        return None if value < 0 else bool(value)
+
+    @property
+    def last_verification(self) -> str:
+        return self._table.last_verifications[self._index]
+
+    @property
+    def country_code(self) -> str:
+        return self._table.countries[self._table.country_codes[self._index]]
+
+    @property
+    def city_name(self) -> str:
+        return self._table.cities[self._table.city_codes[self._index]]
+
+    @property
+    def created_at(self) -> str:
+        return self._table.created_ats[self._index]
+
+
+class ProxyTable:
+    """
+    A column-oriented, memory-efficient store for large proxy lists.
+
+    IPv4 addresses are packed into 32-bit integers and ports into 16-bit integers, validity is one
+    byte per proxy, and country and city names are dictionary-encoded into small integer codes.
+    Repeated strings (usernames, passwords) are interned so every row shares one object. Rows are
+    read back as ``ProxyRow`` views that behave like ``Proxy``, and whole columns can be read
+    without creating any row objects.
+    """
+
+    def __init__(self, proxies: Iterable[Union[Proxy, dict]] = ()) -> None:
+        self.ids: List[str] = []
+        self.usernames: List[str] = []
+        self.passwords: List[str] = []
+        self.addresses = array("I")
+        self.ports = array("H")
+        self.valid_flags = array("b")
+        self.country_codes = array("H")
+        self.city_codes = array("I")
+        self.last_verifications: List[str] = []
+        self.created_ats: List[str] = []
+
+        self.countries: List[Optional[str]] = []
+        self.cities: List[Optional[str]] = []
+        self._country_lookup: Dict[Optional[str], int] = {}
+        self._city_lookup: Dict[Optional[str], int] = {}
+        self._strings: Dict[str, str] = {}
+        self._hosts: Dict[int, str] = {}
+        self._index: Dict[str, int] = {}
+        self.extend(proxies)
+
+    @classmethod
+    def from_lists(cls, *proxies_lists: ProxiesList) -> "ProxyTable":
+        """
+        Build a table from one or more ``ProxiesList`` pages, reading their raw results directly.
+
+        Parameters:
+            *proxies_lists (ProxiesList): The pages to load.
+
+        Returns:
+            ProxyTable: The new table.
+        """
+        table = cls()
+        for proxies_list in proxies_lists:
+            table.extend(proxies_list.data.get("results", []))
+        return table
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __contains__(self, proxy_id: str) -> bool:
+        return proxy_id in self._index
+
+    def __getitem__(self, index: int) -> ProxyRow:
+        if index < 0:
+            index += len(self.ids)
+        if not 0 <= index < len(self.ids):
+            raise IndexError("table index out of range")
+        return ProxyRow(self, index)
+
+    def __iter__(self) -> Iterator[ProxyRow]:
+        for index in range(len(self.ids)):
+            yield ProxyRow(self, index)
+
+    def get(self, proxy_id: str) -> Optional[ProxyRow]:
+        """
+        Get the row for a proxy ID.
+
+        Parameters:
+            proxy_id (str): The ID of the proxy.
+
+        Returns:
+            ProxyRow: The row, or None if the ID is not in the table.
+        """
+        index = self._index.get(proxy_id)
+        return None if index is None else ProxyRow(self, index)
+
+    def extend(self, proxies: Iterable[Union[Proxy, dict]]) -> None:
+        """
+        Append proxies, given either as ``Proxy`` objects or as raw API dicts.
+
+        Parameters:
+            proxies (iterable): The proxies to append.
+        """
+        for proxy in proxies:
+            self.append(proxy)
+
+    def append(self, proxy: Union[Proxy, dict]) -> None:
+        """
+        Append one proxy, given either as a ``Proxy`` object or as a raw API dict.
+
+        Parameters:
+            proxy (Proxy or dict): The proxy to append.
+        """
+        data = proxy if isinstance(proxy, dict) else proxy.data
+        intern = self._intern
+        self._index[data.get("id")] = len(self.ids)
+        self.ids.append(data.get("id"))
+        self.usernames.append(intern(data.get("username")))
+        self.passwords.append(intern(data.get("password")))
+        self.addresses.append(self._pack_address(len(self.ids) - 1, data.get("proxy_address")))
+        self.ports.append(data.get("port") or 0)
+        valid = data.get("valid")
+        self.valid_flags.append(-1 if valid is None else int(bool(valid)))
+        self.country_codes.append(self._encode(self.countries, self._country_lookup, data.get("country_code")))
+        self.city_codes.append(self._encode(self.cities, self._city_lookup, data.get("city_name")))
+        self.last_verifications.append(data.get("last_verification"))
+        self.created_ats.append(data.get("created_at"))
+
+    def address(self, index: int) -> Optional[str]:
+        """
+        Get the proxy address of a row.
+
+        Parameters:
+            index (int): The row index.
+
+        Returns:
+            str: The dotted IPv4 address or host name.
+        """
+        packed = self.addresses[index]
+        if packed == _NO_ADDRESS:
+            return self._hosts.get(index)
+        return socket.inet_ntoa(_IPV4.pack(packed))
+
+    def column(self, name: str) -> List[Any]:
+        """
+        Read a whole column as Python values without creating row objects.
+
+        Parameters:
+            name (str): A ``Proxy`` property name such as ``country_code`` or ``port``.
+
+        Returns:
+            list: One value per row.
+        """
+        if name == "id":
+            return list(self.ids)
+        if name == "username":
+            return list(self.usernames)
+        if name == "password":
+            return list(self.passwords)
+        if name == "proxy_address":
+            return [self.address(index) for index in range(len(self.ids))]
+        if name == "port":
+            return [port or None for port in self.ports]
+        if name == "valid":
+            return [None if value < 0 else bool(value) for value in self.valid_flags]
+        if name == "country_code":
+            return [self.countries[code] for code in self.country_codes]
+        if name == "city_name":
+            return [self.cities[code] for code in self.city_codes]
+        if name == "last_verification":
+            return list(self.last_verifications)
+        if name == "created_at":
+            return list(self.created_ats)
+        raise ValueError(f"Unknown proxy column: {name}")
+
+    def row_dict(self, index: int) -> dict:
+        """
+        Rebuild the API dict for a row.
+
+        Parameters:
+            index (int): The row index.
+
+        Returns:
+            dict: The proxy in the same shape as the API returns it.
+        """
+        valid = self.valid_flags[index]
+        return {
+            "id": self.ids[index],
+            "username": self.usernames[index],
+            "password": self.passwords[index],
+            "proxy_address": self.address(index),
+            "port": self.ports[index] or None,
+            "valid": None if valid < 0 else bool(valid),
+            "last_verification": self.last_verifications[index],
+            "country_code": self.countries[self.country_codes[index]],
+            "city_name": self.cities[self.city_codes[index]],
+            "created_at": self.created_ats[index],
+        }
+
+    def _intern(self, value: Optional[str]) -> Optional[str]:
+        if value is None:
+            return None
+        return self._strings.setdefault(value, value)
+
+    def _pack_address(self, index: int, address: Optional[str]) -> int:
+        if address is None:
+            return _NO_ADDRESS
+        try:
+            packed = _IPV4.unpack(socket.inet_aton(address))[0]
+        except OSError:
+            packed = _NO_ADDRESS
+        # inet_aton also accepts shorthand forms like "10.1", so only pack canonical dotted quads.
+        if packed == _NO_ADDRESS or address.count(".") != 3:
+            self._hosts[index] = address
+            return _NO_ADDRESS
+        return packed
+
+    @staticmethod
+    def _encode(values: List[Optional[str]], lookup: Dict[Optional[str], int], value: Optional[str]) -> int:
+        code = lookup.get(value)
+        if code is None:
+            code = lookup[value] = len(values)
+            values.append(value)
+        return code
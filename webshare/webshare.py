@@ -1,20 +1,249 @@
+import math
+import time
+import urllib3
 import requests
+import threading
+from contextlib import contextmanager
+from collections import deque
+from itertools import islice
+from urllib.parse import quote
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 
 from .util.objects import *
-from typing import Optional, Dict, Union, List, Any
+from .util.cache import ResponseCache, CacheEntry
+from .util.retry import RetryPolicy, TokenBucket
+from .util.stream import StreamedPage, parse_proxy_line
+from .util.metrics import Metrics, RequestEvent
+from .util.singleflight import SingleFlight, coalescable
+from .util.pooling import PooledAdapter
+from .util.batch import BatchResult, BatchReport, run_batch, plan_ip_creation, plan_ip_deletion
+from .exceptions import TransportError, RequestTimeoutError, ResponseParseError, error_for_status
+from typing import Optional, Dict, Union, List, Any, Iterable, Iterator, Type, Tuple, Callable, Hashable, Generator
+
+_UNSET = object()
+
 
 class ApiClient:
     API_BASE_URL = "https://proxy.webshare.io/api/v2/"
 
-    def __init__(self, api_key: str) -> None:
+    def __init__(self,
+                 api_key: str,
+                 cache: Optional[ResponseCache] = None,
+                 timeout: Union[float, Tuple[float, float], None] = (5.0, 30.0),
+                 retry: Optional[RetryPolicy] = None,
+                 rate_limiter: Optional[TokenBucket] = None,
+                 metrics: Optional[Metrics] = None,
+                 coalesce: bool = True,
+                 pool_connections: int = 10,
+                 pool_maxsize: int = 10,
+                 pool_block: bool = False,
+                 keep_alive: bool = True,
+                 thread_safe: bool = False) -> None:
         """
         Initialize the Webshare Proxy API client.
 
+        With ``thread_safe=True`` one client can be shared by any number of threads: each thread
+        gets its own ``requests.Session`` (sessions are not thread-safe), but all of them send
+        through the same adapter, so they share one connection pool. Size ``pool_maxsize`` to the
+        number of threads and set ``pool_block=True`` to make threads wait for a free connection
+        instead of opening throw-away ones ("Connection pool is full" warnings, new TLS handshakes).
+
         Parameters:
             api_key (str): The API key used for authentication.
+            cache (ResponseCache, optional): A cache for read-only GET responses; nothing is cached by default.
+            timeout (float or tuple, optional): The request timeout in seconds, or a ``(connect, read)`` pair.
+            retry (RetryPolicy, optional): When and how to retry failed requests; ``RetryPolicy()`` by default.
+                Pass ``RetryPolicy(max_retries=0)`` to disable retries.
+            rate_limiter (TokenBucket, optional): A limiter every request waits on; it can be shared by several clients.
+            metrics (Metrics, optional): Collects per-endpoint request metrics; installed as a ``post_request`` hook.
+            coalesce (bool, optional): Share one request between threads making the same read-only GET at the same time.
+            pool_connections (int, optional): The number of per-host connection pools to keep.
+            pool_maxsize (int, optional): The maximum number of connections kept open per host.
+            pool_block (bool, optional): Wait for a pooled connection instead of opening an extra one when all are busy.
+            keep_alive (bool, optional): Reuse connections between requests; False sends ``Connection: close``.
+            thread_safe (bool, optional): Use one session per thread over a shared connection pool.
         """
         self.headers: Dict[str, str] = {"Authorization": f"Token {api_key}"}
-        self.session = requests.Session()
+        if not keep_alive:
+            self.headers["Connection"] = "close"
+        self.adapter = PooledAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, pool_block=pool_block)
+        self.thread_safe = thread_safe
+        self._local = threading.local()
+        self._session = None if thread_safe else self._new_session()
+        self.cache = cache
+        self.timeout = timeout
+        self.retry = retry if retry is not None else RetryPolicy()
+        self.rate_limiter = rate_limiter
+        self.metrics = metrics
+        self._flights = SingleFlight() if coalesce else None
+        self._generation = 0
+        self.hooks: Dict[str, List[Callable[[RequestEvent], None]]] = {"pre_request": [], "post_request": []}
+        if metrics is not None:
+            self.add_hook("post_request", metrics)
+
+    def __enter__(self) -> "ApiClient":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _new_session(self) -> requests.Session:
+        session = requests.Session()
+        session.mount("https://", self.adapter)
+        session.mount("http://", self.adapter)
+        return session
+
+    @property
+    def session(self) -> requests.Session:
+        """The ``requests.Session`` used by the calling thread."""
+        if not self.thread_safe:
+            return self._session
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._local.session = self._new_session()
+        return session
+
+    @session.setter
+    def session(self, session: requests.Session) -> None:
+        if self.thread_safe:
+            self._local.session = session
+        else:
+            self._session = session
+
+    def close(self) -> None:
+        """Close every pooled connection."""
+        self.adapter.close()
+        if self._session is not None:
+            self._session.close()
+
+    @contextmanager
+    def override_timeout(self, timeout: Union[float, Tuple[float, float], None]) -> Generator[None, None, None]:
+        """
+        Use a different timeout for the requests made by the current thread inside the block.
+
+        Parameters:
+            timeout (float or tuple): The timeout in seconds, or a ``(connect, read)`` pair.
+        """
+        previous = getattr(self._local, "timeout", _UNSET)
+        self._local.timeout = timeout
+        try:
+            yield
+        finally:
+            if previous is _UNSET:
+                del self._local.timeout
+            else:
+                self._local.timeout = previous
+
+    def connection_stats(self) -> Dict[str, int]:
+        """
+        Report how well connections are being reused across every thread using the client.
+
+        Returns:
+            dict: ``requests`` sent, ``connections`` opened, ``reused`` (requests that did not need
+            a new connection), ``pools`` (one per host) and ``idle`` (connections waiting in the pools).
+        """
+        return self.adapter.stats()
+
+    def add_hook(self, event: str, hook: Callable[[RequestEvent], None]) -> None:
+        """
+        Register a function called around every HTTP attempt.
+
+        Parameters:
+            event (str): 'pre_request' (before sending) or 'post_request' (after a response or error).
+            hook (callable): Called with the ``RequestEvent`` for the attempt.
+        """
+        if event not in self.hooks:
+            raise ValueError(f"Unknown hook event: {event}")
+        self.hooks[event].append(hook)
+
+    def _send(self, method: str, url: str, headers: Dict[str, str], data: Optional[Dict[str, Any]] = None, params: Optional[Dict[str, Any]] = None, stream: bool = False) -> requests.Response:
+        """
+        Send a request, applying the rate limiter, timeout and retry policy.
+
+        Parameters:
+            method (str): The HTTP method.
+            url (str): The absolute URL.
+            headers (dict): The request headers.
+            data (dict, optional): The JSON body.
+            params (dict, optional): Query parameters.
+            stream (bool, optional): Leave the response body unread.
+
+        Returns:
+            requests.Response: A response with a status code below 400.
+
+        Raises:
+            TransportError: If no response was received after all retries.
+            ApiError: If the final response has an error status.
+        """
+        endpoint = url[len(self.API_BASE_URL):].split("?", 1)[0] if url.startswith(self.API_BASE_URL) else url
+        session = self.session
+        timeout = getattr(self._local, "timeout", self.timeout)
+        attempt = 0
+        while True:
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+
+            event = None
+            if self.hooks["pre_request"] or self.hooks["post_request"]:
+                event = RequestEvent(method, url, endpoint, attempt)
+                for hook in self.hooks["pre_request"]:
+                    hook(event)
+                started = time.perf_counter()
+
+            try:
+                response = session.request(method, url, headers=headers, json=data, params=params, timeout=timeout, stream=stream)
+            except requests.exceptions.RequestException as e:
+                if event is not None:
+                    event.elapsed, event.error = time.perf_counter() - started, e
+                    for hook in self.hooks["post_request"]:
+                        hook(event)
+                if self.retry.should_retry_error(method, self._connected(e), attempt):
+                    time.sleep(self.retry.delay(attempt))
+                    attempt += 1
+                    continue
+                error_class = RequestTimeoutError if isinstance(e, requests.exceptions.Timeout) else TransportError
+                raise error_class(f"An error occurred while making the request: {e}") from e
+
+            if event is not None:
+                event.elapsed, event.status_code = time.perf_counter() - started, response.status_code
+                if not stream:
+                    event.size = len(response.content)
+                elif "Content-Length" in response.headers:
+                    event.size = int(response.headers["Content-Length"])
+                for hook in self.hooks["post_request"]:
+                    hook(event)
+
+            if response.status_code < 400:
+                return response
+
+            retry_after = self.retry.parse_retry_after(response.headers.get("Retry-After"))
+            retrying = self.retry.should_retry_status(method, response.status_code, attempt, retry_after)
+            deferred = retrying and response.status_code == 429 and bool(retry_after) and self.rate_limiter is not None
+            if deferred:
+                # Hold back every thread sharing the limiter, not just this one.
+                self.rate_limiter.defer(retry_after)
+
+            if retrying:
+                response.close()
+                if not deferred:
+                    time.sleep(self.retry.delay(attempt, retry_after))
+                attempt += 1
+                continue
+
+            raise error_for_status(
+                response.status_code,
+                f"An error occurred while making the request: {response.status_code} {response.reason} for url: {response.url}",
+                body=response.text,
+                retry_after=retry_after,
+            )
+
+    @staticmethod
+    def _connected(error: requests.exceptions.RequestException) -> bool:
+        """Whether the request may have reached the server before ``error`` happened."""
+        if isinstance(error, requests.exceptions.ConnectTimeout):
+            return False
+        reason = getattr(error.args[0], "reason", None) if error.args else None
+        return not isinstance(reason, (urllib3.exceptions.NewConnectionError, urllib3.exceptions.ConnectTimeoutError))
 
     def _request(self, method: str, endpoint: str, data: Optional[Dict[str, Any]] = None, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
@@ -22,7 +251,7 @@ class ApiClient:
 
         Parameters:
             method (str): The HTTP method ('GET', 'POST', 'PATCH', 'DELETE').
-            endpoint (str): The API endpoint to call.
+            endpoint (str): The API endpoint to call, or an absolute URL such as a list page's ``next`` link.
             data (dict, optional): The JSON data to send with the request (for 'POST' and 'PATCH' methods).
             params (dict, optional): Query parameters for the request.
 
@@ -30,18 +259,102 @@ class ApiClient:
             dict: The parsed JSON response from the API.
 
         Raises:
-            ValueError: If the response status is not in the 2xx range or the JSON parsing fails.
+            ApiError: If the response status is not in the 2xx range after all retries.
+            TransportError: If no response was received after all retries.
+            ResponseParseError: If the JSON parsing fails.
         """
-        url = self.API_BASE_URL + endpoint
-        response = self.session.request(method, url, headers=self.headers, json=data, params=params)
-
+        url = endpoint if endpoint.startswith(("http://", "https://")) else self.API_BASE_URL + endpoint
+        if url.startswith(self.API_BASE_URL):
+            endpoint = url[len(self.API_BASE_URL):].split("?", 1)[0]
+
+        headers = self.headers
+        cache_key = entry = None
+        if self.cache is not None and method == "GET" and self.cache.ttl_for(endpoint) is not None:
+            cache_key = self.cache.key(url, params)
+            entry = self.cache.get(cache_key)
+            if entry is not None and entry.fresh:
+                return entry.data
+            if entry is not None and entry.revalidatable:
+                headers = dict(headers)
+                if entry.etag:
+                    headers["If-None-Match"] = entry.etag
+                if entry.last_modified:
+                    headers["If-Modified-Since"] = entry.last_modified
+
+        if method == "GET" and self._flights is not None and coalescable(endpoint):
+            key = (self._generation, ResponseCache.key(url, params))
+            return self._flights.do(key, lambda: self._fetch(method, url, endpoint, headers, data, params, cache_key, entry))
+        return self._fetch(method, url, endpoint, headers, data, params, cache_key, entry)
+
+    def _fetch(self, method: str, url: str, endpoint: str, headers: Dict[str, str], data: Optional[Dict[str, Any]], params: Optional[Dict[str, Any]], cache_key: Optional[Hashable], entry: Optional[CacheEntry]) -> Dict[str, Any]:
         try:
-            response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
-            raise ValueError(f"An error occurred while making the request: {e}")
+            response = self._send(method, url, headers, data=data, params=params)
+        finally:
+            if method != "GET":
+                # Reads that start after a write must not join a flight that started before it.
+                self._generation += 1
+        if self.cache is not None and method != "GET":
+            self.cache.invalidate_for(endpoint)
+        if entry is not None and response.status_code == 304:
+            self.cache.touch(cache_key)
+            return entry.data
+
+        if not response.content:
+            # 204 No Content and other empty bodies (e.g. DELETE, logout).
+            return {}
+        try:
+            result = response.json()
         except ValueError as e:
-            raise ValueError(f"Failed to parse JSON response: {e}")
+            raise ResponseParseError(f"Failed to parse JSON response: {e}")
+        if cache_key is not None:
+            self.cache.set(cache_key, endpoint, result, response.headers.get("ETag"), response.headers.get("Last-Modified"))
+        return result
+
+    def _paginate(self, endpoint: str, list_class: Type, params: Optional[Dict[str, Any]] = None) -> Iterator[Any]:
+        """
+        Lazily follow the ``next`` links of a paginated list endpoint.
+
+        Only one page is held in memory at a time, so iterating a list of any size keeps memory flat.
+
+        Parameters:
+            endpoint (str): The list endpoint to start from.
+            list_class (type): The list wrapper used for each page (e.g. ``ProxiesList``).
+            params (dict, optional): Query parameters for the first page.
+
+        Yields:
+            Each page wrapped in ``list_class``.
+        """
+        page = list_class(self._request("GET", endpoint, params=params))
+        yield page
+        while page.next:
+            page = list_class(self._request("GET", page.next))
+            yield page
+
+    def _stream(self, endpoint: str, params: Optional[Dict[str, Any]] = None, backend: str = "auto", chunk_size: int = 65536) -> Iterator[dict]:
+        """
+        Stream the ``results`` of a paginated list endpoint, decoding each page incrementally.
+
+        Parameters:
+            endpoint (str): The list endpoint to start from.
+            params (dict, optional): Query parameters for the first page.
+            backend (str, optional): The JSON backend passed to ``StreamedPage``.
+            chunk_size (int, optional): The number of bytes read from the socket at a time.
+
+        Yields:
+            dict: Each raw result as soon as it has been decoded.
+        """
+        url: Optional[str] = self.API_BASE_URL + endpoint
+        while url:
+            response = self._send("GET", url, self.headers, params=params, stream=True)
+            try:
+                page = StreamedPage(response.iter_content(chunk_size=chunk_size), backend=backend)
+                try:
+                    yield from page
+                except ValueError as e:
+                    raise ResponseParseError(f"Failed to parse JSON response: {e}")
+            finally:
+                response.close()
+            url, params = page.next, None
 
     def create_ip(self, ip_address: str) -> IpAuthorization:
         """
@@ -65,6 +378,19 @@ class ApiClient:
         """
         return IpAuthorizationList(self._request("GET", "proxy/ipauthorization/"))
 
+    def iter_ip_authorizations(self, page_size: Optional[int] = 100) -> Iterator[IpAuthorization]:
+        """
+        Iterate over every IP authorization entry, fetching pages lazily.
+
+        Parameters:
+            page_size (int, optional): The number of entries fetched per request.
+
+        Yields:
+            IpAuthorization: One IP authorization object at a time.
+        """
+        for page in self._paginate("proxy/ipauthorization/", IpAuthorizationList, params={"page_size": page_size}):
+            yield from page.get_results()
+
     def delete_ip(self, id: str) -> int:
         """
         Delete an IP authorization entry.
@@ -73,15 +399,67 @@ class ApiClient:
             id (str): The ID of the IP authorization entry to delete.
 
         Returns:
-            int: The HTTP status code (200 if successful).
+            int: The HTTP status code (204 if successful).
+        """
+        try:
+            response = self._send("DELETE", self.API_BASE_URL + f"proxy/ipauthorization/{id}/", self.headers)
+        finally:
+            self._generation += 1
+        if self.cache is not None:
+            self.cache.invalidate_for("proxy/ipauthorization/")
+        return response.status_code
+
+    def create_ips(self, ip_addresses: Iterable[str], concurrency: int = 8, skip_existing: bool = True) -> BatchReport:
+        """
+        Authorize many IP addresses concurrently.
+
+        A failure only affects its own address; the report holds one result per unique address,
+        with the created ``IpAuthorization`` as ``value`` or the exception as ``error``.
+
+        Parameters:
+            ip_addresses (iterable of str): The IP addresses to authorize.
+            concurrency (int, optional): The maximum number of requests in flight.
+            skip_existing (bool, optional): List the current entries first and skip addresses that
+                are already authorized; their result has ``skipped`` set and the existing entry as ``value``.
+
+        Returns:
+            BatchReport: The per-address results, in input order.
+        """
+        existing = self.iter_ip_authorizations() if skip_existing else ()
+        addresses, results = plan_ip_creation(ip_addresses, existing)
+        pending = [address for address in addresses if address not in results]
+        results.update((result.item, result) for result in run_batch(self.create_ip, pending, concurrency))
+        return BatchReport([results[address] for address in addresses])
+
+    def delete_ips(self, targets: Iterable[Union[str, int, IpAuthorization]], concurrency: int = 8) -> BatchReport:
+        """
+        Remove many IP authorization entries concurrently.
+
+        Targets may be entry IDs, ``IpAuthorization`` objects or IP addresses. The current entries
+        are listed once to resolve addresses; targets that are not on the account are skipped
+        instead of sent. A failure only affects its own target.
+
+        Parameters:
+            targets (iterable): The entries to delete.
+            concurrency (int, optional): The maximum number of requests in flight.
+
+        Returns:
+            BatchReport: The per-target results, in input order; ``value`` is the HTTP status code.
         """
-        return self._request("DELETE", f"proxy/ipauthorization/{id}/").status_code
+        order, ids, results = plan_ip_deletion(targets, self.iter_ip_authorizations())
+        deleted = {result.item: result for result in run_batch(self.delete_ip, list(dict.fromkeys(ids.values())), concurrency)}
+        for target, entry_id in ids.items():
+            result = deleted[entry_id]
+            results[target] = BatchResult(target, result.ok, result.value, result.error)
+        return BatchReport([results[target] for target in order])
 
     def get_proxy_list(self,
                        mode: Optional[str] = "direct",
                        country_code_in: Optional[str] = None,
                        search: Optional[str] = None,
-                       ordering: Optional[str] = None) -> ProxiesList:
+                       ordering: Optional[str] = None,
+                       page: Optional[int] = None,
+                       page_size: Optional[int] = None) -> ProxiesList:
         """
         Get a list of proxies with optional filters.
 
@@ -90,18 +468,189 @@ class ApiClient:
             country_code_in (str, optional): The country code to filter proxies by.
             search (str, optional): The search query to filter proxies by.
             ordering (str, optional): The ordering criteria for the proxy list.
+            page (int, optional): The page number to fetch.
+            page_size (int, optional): The number of proxies per page.
 
         Returns:
             ProxiesList: A list of proxy objects.
         """
-        params: Dict[str, Union[str, None]] = {
+        params: Dict[str, Union[str, int, None]] = {
             "mode": mode,
             "country_code__in": country_code_in,
             "search": search,
             "ordering": ordering,
+            "page": page,
+            "page_size": page_size,
         }
         return ProxiesList(self._request("GET", "proxy/list/", params=params))
 
+    def iter_proxies(self,
+                     mode: Optional[str] = "direct",
+                     country_code_in: Optional[str] = None,
+                     search: Optional[str] = None,
+                     ordering: Optional[str] = None,
+                     page_size: Optional[int] = 100) -> Iterator[Proxy]:
+        """
+        Iterate over every proxy in the list, fetching pages lazily as they are consumed.
+
+        Parameters:
+            mode (str, optional): The proxy mode ('direct', 'residential', 'datacenter').
+            country_code_in (str, optional): The country code to filter proxies by.
+            search (str, optional): The search query to filter proxies by.
+            ordering (str, optional): The ordering criteria for the proxy list.
+            page_size (int, optional): The number of proxies fetched per request.
+
+        Yields:
+            Proxy: One proxy object at a time.
+        """
+        params: Dict[str, Union[str, int, None]] = {
+            "mode": mode,
+            "country_code__in": country_code_in,
+            "search": search,
+            "ordering": ordering,
+            "page_size": page_size,
+        }
+        for page in self._paginate("proxy/list/", ProxiesList, params=params):
+            yield from page.get_results()
+
+    def fetch_all_proxies(self,
+                          mode: Optional[str] = "direct",
+                          country_code_in: Optional[str] = None,
+                          search: Optional[str] = None,
+                          ordering: Optional[str] = None,
+                          page_size: int = 100,
+                          concurrency: int = 8,
+                          ordered: bool = True) -> Iterator[Proxy]:
+        """
+        Download the full proxy list, fetching pages concurrently.
+
+        The first page is fetched on its own to learn ``count``; the remaining pages are then
+        requested in parallel with at most ``concurrency`` requests in flight.
+
+        Parameters:
+            mode (str, optional): The proxy mode ('direct', 'residential', 'datacenter').
+            country_code_in (str, optional): The country code to filter proxies by.
+            search (str, optional): The search query to filter proxies by.
+            ordering (str, optional): The ordering criteria for the proxy list.
+            page_size (int, optional): The number of proxies fetched per request.
+            concurrency (int, optional): The maximum number of pages fetched at the same time.
+            ordered (bool, optional): Yield pages in page order; when False pages are yielded as soon as they arrive.
+
+        Yields:
+            Proxy: One proxy object at a time.
+        """
+        filters = {
+            "mode": mode,
+            "country_code_in": country_code_in,
+            "search": search,
+            "ordering": ordering,
+        }
+        first = self.get_proxy_list(page=1, page_size=page_size, **filters)
+        results = first.get_results()
+        yield from results
+        if not first.next or not results:
+            return
+
+        # The server may cap page_size, so derive the page count from what it actually returned.
+        pages = iter(range(2, math.ceil(first.count / len(results)) + 1))
+
+        def fetch(page: int) -> ProxiesList:
+            return self.get_proxy_list(page=page, page_size=page_size, **filters)
+
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            pending = deque(executor.submit(fetch, page) for page in islice(pages, concurrency))
+            while pending:
+                if ordered:
+                    done = [pending.popleft()]
+                else:
+                    finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    done = [future for future in pending if future in finished]
+                    for future in done:
+                        pending.remove(future)
+
+                for future in done:
+                    page_list = future.result()
+                    for page in pages:
+                        pending.append(executor.submit(fetch, page))
+                        break
+                    yield from page_list.get_results()
+
+    def stream_proxies(self,
+                       mode: Optional[str] = "direct",
+                       country_code_in: Optional[str] = None,
+                       search: Optional[str] = None,
+                       ordering: Optional[str] = None,
+                       page_size: Optional[int] = 1000,
+                       backend: str = "auto") -> Iterator[Proxy]:
+        """
+        Iterate over every proxy, decoding each page as its bytes arrive.
+
+        Unlike ``iter_proxies`` a page is never parsed into one large dict first, so the first proxy
+        is available before the page has finished downloading and large ``page_size`` values do
+        not double peak memory. Responses are not cached.
+
+        Parameters:
+            mode (str, optional): The proxy mode ('direct', 'residential', 'datacenter').
+            country_code_in (str, optional): The country code to filter proxies by.
+            search (str, optional): The search query to filter proxies by.
+            ordering (str, optional): The ordering criteria for the proxy list.
+            page_size (int, optional): The number of proxies fetched per request.
+            backend (str, optional): ``"ijson"``, ``"json"`` or ``"auto"`` to use ijson when it is installed.
+
+        Yields:
+            Proxy: One proxy object at a time.
+        """
+        params: Dict[str, Union[str, int, None]] = {
+            "mode": mode,
+            "country_code__in": country_code_in,
+            "search": search,
+            "ordering": ordering,
+            "page_size": page_size,
+        }
+        for item in self._stream("proxy/list/", params=params, backend=backend):
+            yield Proxy(item)
+
+    def download_proxy_list(self,
+                            mode: str = "direct",
+                            country_code_in: Optional[str] = None,
+                            search: Optional[str] = None,
+                            authentication: str = "username",
+                            token: Optional[str] = None,
+                            chunk_size: int = 65536) -> Iterator[Proxy]:
+        """
+        Download the proxy list as a plain-text export and stream it line by line.
+
+        The export is a single response with one ``address:port[:username:password]`` line per proxy,
+        which is much cheaper to produce and transfer than paging JSON through ``proxy/list/``.
+        The records only carry the connection fields (``proxy_address``, ``port``, ``username``,
+        ``password``) and an ID derived from ``address:port:username``; use ``get_proxy_list`` when
+        the API's IDs, validity or locations are needed.
+
+        Parameters:
+            mode (str, optional): The endpoint mode ('direct' or 'backbone').
+            country_code_in (str, optional): Comma-separated country codes to filter proxies by.
+            search (str, optional): The search query to filter proxies by.
+            authentication (str, optional): 'username' to include credentials, or 'sourceip' for IP authorization.
+            token (str, optional): The download token; fetched from ``get_proxy_config`` when omitted.
+            chunk_size (int, optional): The number of bytes read from the socket at a time.
+
+        Yields:
+            Proxy: One proxy object per line.
+        """
+        if token is None:
+            token = self.get_proxy_config().proxy_list_download_token
+        countries = "-".join(code.strip() for code in country_code_in.split(",")) if country_code_in else "-"
+        url = f"{self.API_BASE_URL}proxy/list/download/{token}/{countries}/any/{authentication}/{mode}/{quote(search, safe='') if search else '-'}/"
+
+        response = self._send("GET", url, {}, stream=True)
+        try:
+            for line in response.iter_lines(chunk_size=chunk_size):
+                proxy = parse_proxy_line(line.decode())
+                if proxy is not None:
+                    yield proxy
+        finally:
+            response.close()
+
     def change_password(self, password: str, new_password: str) -> None:
         """
         Change the user's password.
@@ -243,6 +792,19 @@ class ApiClient:
         """
         return NotificationsList(self._request("GET", "notification/"))
 
+    def iter_notifications(self, page_size: Optional[int] = 100) -> Iterator[Notification]:
+        """
+        Iterate over every notification, fetching pages lazily.
+
+        Parameters:
+            page_size (int, optional): The number of notifications fetched per request.
+
+        Yields:
+            Notification: One notification object at a time.
+        """
+        for page in self._paginate("notification/", NotificationsList, params={"page_size": page_size}):
+            yield from page.get_results()
+
     def get_notification(self, id: str) -> Notification:
         """
         Get a notification by its ID.
@@ -359,6 +921,43 @@ class ApiClient:
 
         return ProxyReplacementList(self._request("GET", "proxy/list/replaced/", params=params))
 
+    def iter_replaced_proxies(self, proxy_list_replacement: int = None, page_size: Optional[int] = 100) -> Iterator[ProxyReplacement]:
+        """
+        Iterate over every replaced proxy, fetching pages lazily.
+
+        Parameters:
+            proxy_list_replacement (int, optional): The ID of the proxy list replacement.
+            page_size (int, optional): The number of entries fetched per request.
+
+        Yields:
+            ProxyReplacement: One replaced proxy object at a time.
+        """
+        params = {"page_size": page_size}
+        if proxy_list_replacement:
+            params["proxy_list_replacement"] = proxy_list_replacement
+
+        for page in self._paginate("proxy/list/replaced/", ProxyReplacementList, params=params):
+            yield from page.get_results()
+
+    def stream_replaced_proxies(self, proxy_list_replacement: int = None, page_size: Optional[int] = 1000, backend: str = "auto") -> Iterator[ProxyReplacement]:
+        """
+        Iterate over every replaced proxy, decoding each page as its bytes arrive.
+
+        Parameters:
+            proxy_list_replacement (int, optional): The ID of the proxy list replacement.
+            page_size (int, optional): The number of entries fetched per request.
+            backend (str, optional): ``"ijson"``, ``"json"`` or ``"auto"`` to use ijson when it is installed.
+
+        Yields:
+            ProxyReplacement: One replaced proxy object at a time.
+        """
+        params = {"page_size": page_size}
+        if proxy_list_replacement:
+            params["proxy_list_replacement"] = proxy_list_replacement
+
+        for item in self._stream("proxy/list/replaced/", params=params, backend=backend):
+            yield ProxyReplacement(item)
+
     def get_proxy_config(self) -> ProxyConfig:
         """
         Get the proxy configuration.
@@ -468,3 +1067,16 @@ class ApiClient:
             ApiKeyList: A list of API key objects.
         """
         return ApiKeyList(self._request("GET", "apikey/"))
+
+    def iter_api_keys(self, page_size: Optional[int] = 100) -> Iterator[ApiKey]:
+        """
+        Iterate over every API key, fetching pages lazily.
+
+        Parameters:
+            page_size (int, optional): The number of API keys fetched per request.
+
+        Yields:
+            ApiKey: One API key object at a time.
+        """
+        for page in self._paginate("apikey/", ApiKeyList, params={"page_size": page_size}):
+            yield from page.get_results()